@@ -1,5 +1,9 @@
+import copy
+from functools import cached_property
+
 import numpy as np
 from classes.job import Jssp_job
+from classes.machine_calendar import build_calendars
 from classes.operation import Operation
 
 
@@ -21,7 +25,126 @@ class jssp:
             self.jobs.append(job)
 
         self.machine_downtimes = data.get("machine_downtimes", {})
+        self.machine_calendars = data.get("machine_calendars", {})
+        # Pools de equipamentos idênticos: id do pool -> capacidade (demais equipamentos são unitários)
+        self.equipment_pools = data.get("equipment_pools", {})
         self.timespan = data.get("timespan", None)
+        self.compile_arrays()
+
+    def compile_arrays(self):
+        """Pré-calcula vetores NumPy na mesma ordem de get_flattened_operations()."""
+        ops_per_job = [len(job.operations) for job in self.jobs]
+
+        # job_offsets[j]:job_offsets[j+1] é o segmento das operações do job j
+        self.job_offsets = np.zeros(len(self.jobs) + 1, dtype=np.int64)
+        np.cumsum(ops_per_job, out=self.job_offsets[1:])
+        self.num_operations = int(self.job_offsets[-1])
+
+        self.op_job = np.repeat(np.arange(len(self.jobs), dtype=np.int64), ops_per_job)
+        self.op_position = np.arange(self.num_operations, dtype=np.int64) - self.job_offsets[self.op_job]
+        self.durations = np.array(
+            [operation.duration for job in self.jobs for operation in job.operations],
+            dtype=np.int64,
+        )
+
+        # Elegibilidade como matrizes booleanas (operação x índice do recurso)
+        operations = [operation for job in self.jobs for operation in job.operations]
+        self.machine_ids = np.array(sorted({m for op in operations for m in op.machines}), dtype=np.int64)
+        self.equipment_ids = np.array(sorted({e for op in operations for e in op.equipments}), dtype=np.int64)
+        self.eligible_machines = np.zeros((self.num_operations, len(self.machine_ids)), dtype=bool)
+        self.eligible_equipment = np.zeros((self.num_operations, len(self.equipment_ids)), dtype=bool)
+        for idx, op in enumerate(operations):
+            self.eligible_machines[idx, np.searchsorted(self.machine_ids, op.machines)] = True
+            self.eligible_equipment[idx, np.searchsorted(self.equipment_ids, op.equipments)] = True
+
+        # Bitsets por operação (bit i = i-ésimo id em machine_ids/equipment_ids): vetores
+        # empacotados para testes vetorizados e inteiros Python para testes escalares (qualquer largura)
+        self.machine_index = {int(m): i for i, m in enumerate(self.machine_ids)}
+        self.equipment_index = {int(e): i for i, e in enumerate(self.equipment_ids)}
+        self.machine_bits = np.packbits(self.eligible_machines, axis=1, bitorder="little")
+        self.equipment_bits = np.packbits(self.eligible_equipment, axis=1, bitorder="little")
+        self.machine_masks = [int.from_bytes(row.tobytes(), "little") for row in self.machine_bits]
+        self.equipment_masks = [int.from_bytes(row.tobytes(), "little") for row in self.equipment_bits]
+
+        self.compile_downtimes()
+
+    def compile_downtimes(self):
+        """Downtimes achatados e ordenados por (máquina, instante)."""
+        pairs = sorted((m, point) for m, points in self.machine_downtimes.items() for point in points)
+        self.downtime_machine = np.array([m for m, _ in pairs], dtype=np.int64)
+        self.downtime_point = np.array([point for _, point in pairs], dtype=np.int64)
+
+        # Máquinas com calendário: consultas de disponibilidade sem enumerar pontos
+        self.calendars = build_calendars(self.machine_calendars, self.machine_downtimes)
+
+    @cached_property
+    def conflicts(self):
+        """
+        Bitset de conflitos por operação (bit j = a operação j disputa alguma máquina ou
+        equipamento elegível com ela; o próprio bit fica desligado): n_ops^2 bits em vez de uma
+        matriz densa. Calculado na primeira consulta, pela união das operações de cada recurso.
+        """
+        conflicts = [0] * self.num_operations
+        for eligible in (self.eligible_machines, self.eligible_equipment):
+            for column in eligible.T:
+                users = np.flatnonzero(column).tolist()
+                mask = sum(1 << idx for idx in users)
+                for idx in users:
+                    conflicts[idx] |= mask
+        return [mask & ~(1 << idx) for idx, mask in enumerate(conflicts)]
+
+    def is_eligible_machine(self, op_idx: int, machine) -> bool:
+        bit = self.machine_index.get(machine)
+        return bit is not None and (self.machine_masks[op_idx] >> bit) & 1 == 1
+
+    def is_eligible_equipment(self, op_idx: int, equipment) -> bool:
+        bit = self.equipment_index.get(equipment)
+        return bit is not None and (self.equipment_masks[op_idx] >> bit) & 1 == 1
+
+    def compete(self, op_a: int, op_b: int) -> bool:
+        """As operações (índices achatados) têm algum recurso elegível em comum?"""
+        return bool(self.machine_masks[op_a] & self.machine_masks[op_b]
+                    or self.equipment_masks[op_a] & self.equipment_masks[op_b])
+
+    def with_downtimes(self, machine_downtimes: dict):
+        """
+        Cópia rasa que compartilha jobs e vetores compilados e troca só os downtimes
+        (cenários "e se" sobre o mesmo conjunto de jobs).
+        """
+        scenario = copy.copy(self)
+        scenario.machine_downtimes = machine_downtimes
+        scenario.compile_downtimes()
+        return scenario
+
+    def connected_components(self):
+        """
+        Agrupa os jobs em componentes que não compartilham máquina nem equipamento.
+
+        Returns:
+            Lista de componentes, cada um com os nomes dos jobs na ordem original
+        """
+        # Máscaras de recursos de cada job (união das máscaras das operações); um job novo funde
+        # todos os componentes cujas máscaras cruzam as dele
+        components = []  # [máscara de máquinas, máscara de equipamentos, índices dos jobs]
+        for job_idx in range(len(self.jobs)):
+            lo, hi = self.job_offsets[job_idx], self.job_offsets[job_idx + 1]
+            machines = equipment = 0
+            for idx in range(lo, hi):
+                machines |= self.machine_masks[idx]
+                equipment |= self.equipment_masks[idx]
+            merged = [machines, equipment, [job_idx]]
+            remaining = []
+            for component in components:
+                if component[0] & machines or component[1] & equipment:
+                    merged[0] |= component[0]
+                    merged[1] |= component[1]
+                    merged[2].extend(component[2])
+                else:
+                    remaining.append(component)
+            components = remaining + [merged]
+
+        ordered = sorted(components, key=lambda component: min(component[2]))
+        return [[self.jobs[j].name for j in sorted(component[2])] for component in ordered]
 
     def get_flattened_operations(self):
         operations = []
@@ -0,0 +1,145 @@
+import math
+from bisect import bisect_left, bisect_right
+
+
+def _merge(ranges):
+    """Ordena e funde intervalos [início, fim) sobrepostos ou adjacentes."""
+    merged = []
+    for start, end in sorted((int(a), int(b)) for a, b in ranges if b > a):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class MachineCalendar:
+    """
+    Indisponibilidade de uma máquina descrita de forma compacta:
+
+        {
+            "periodic": [{"period": 24, "start": 16, "length": 8, "until": 720}],  # turnos/manutenções
+            "ranges": [[100, 110]],                                              # paradas avulsas [a, b)
+            "exceptions": [[40, 48]],                                            # disponível mesmo assim
+        }
+
+    Janelas periódicas começam em start + k * period (k >= 0) e duram length; "until" (opcional)
+    encerra a repetição. Pontos de downtime avulsos entram como intervalos [p, p + 1) que as
+    exceções não liberam (uma quebra continua sendo quebra).
+    """
+
+    def __init__(self, periodic=(), ranges=(), exceptions=(), points=()):
+        self.periodic = []
+        for window in periodic:
+            period, start, length = int(window["period"]), int(window.get("start", 0)), int(window["length"])
+            if not 0 < length < period:
+                raise ValueError(f"Janela periódica inválida: {window}")
+            until = window.get("until")
+            self.periodic.append((period, start, length, math.inf if until is None else int(until)))
+
+        self.ranges = _merge(ranges)
+        self.range_ends = [end for _, end in self.ranges]
+        self.forced = _merge((p, p + 1) for p in points)
+        self.forced_ends = [end for _, end in self.forced]
+        self.exceptions = _merge(exceptions)
+        self.exception_starts = [start for start, _ in self.exceptions]
+        self.exception_ends = [end for _, end in self.exceptions]
+
+        # Depois de `settle` a disponibilidade se repete a cada `hyperperiod`
+        self.hyperperiod = math.lcm(*(period for period, _, _, until in self.periodic if until == math.inf))
+        self.settle = max([0] + self.range_ends + self.exception_ends + self.forced_ends
+                          + [start for _, start, _, _ in self.periodic]
+                          + [until for _, _, _, until in self.periodic if until != math.inf])
+
+    @classmethod
+    def from_dict(cls, data: dict, points=()):
+        return cls(data.get("periodic", ()), data.get("ranges", ()), data.get("exceptions", ()), points)
+
+    def _next_raw_window(self, t):
+        """Janela (sem exceções) com fim > t que começa primeiro, ou None."""
+        best = None
+        i = bisect_right(self.range_ends, t)
+        if i < len(self.ranges):
+            best = tuple(self.ranges[i])
+        for period, start, length, until in self.periodic:
+            k = max(0, (t - start - length) // period + 1)
+            window_start = start + k * period
+            if window_start >= until or until <= t:
+                continue
+            window = (window_start, min(window_start + length, until))
+            if best is None or window[0] < best[0]:
+                best = window
+        return best
+
+    def next_blocked(self, t):
+        """
+        Primeiro trecho indisponível [a, b) com b > t (a >= t), já descontadas as exceções.
+        Trechos de janelas diferentes podem ser adjacentes ou se sobrepor.
+        """
+        blocked = self._next_calendar_piece(t)
+        i = bisect_right(self.forced_ends, t)
+        if i < len(self.forced):
+            forced = (max(self.forced[i][0], t), self.forced[i][1])
+            if blocked is None or forced[0] < blocked[0]:
+                return forced
+        return blocked
+
+    def _next_calendar_piece(self, t):
+        while True:
+            window = self._next_raw_window(t)
+            if window is None:
+                return None
+            start, end = max(window[0], t), window[1]
+            # Exceção cobrindo o início empurra o trecho para depois dela
+            i = bisect_right(self.exception_starts, start) - 1
+            if i >= 0 and self.exception_ends[i] > start:
+                start = self.exception_ends[i]
+            if start < end:
+                j = bisect_left(self.exception_starts, start)
+                if j < len(self.exceptions):
+                    end = min(end, self.exception_starts[j])
+                return start, end
+            t = end
+
+    def is_available(self, t):
+        blocked = self.next_blocked(t)
+        return blocked is None or blocked[0] > t
+
+    def next_available(self, earliest_start, duration):
+        """
+        Primeiro início >= earliest_start sem indisponibilidade em [início, início + duração),
+        ou math.inf se nenhuma folga do calendário comporta a duração.
+        """
+        give_up = max(self.settle, earliest_start) + self.hyperperiod
+        candidate_start = earliest_start
+        while True:
+            blocked = self.next_blocked(candidate_start)
+            if blocked is None or blocked[0] >= candidate_start + duration:
+                return candidate_start
+            candidate_start = blocked[1]
+            if candidate_start > give_up:
+                return math.inf
+
+    def windows(self, horizon, start=0):
+        """Trechos indisponíveis fundidos dentro de [start, horizon), para intervalos fixos no CP-SAT."""
+        windows = []
+        t = start
+        while t < horizon:
+            blocked = self.next_blocked(t)
+            if blocked is None or blocked[0] >= horizon:
+                break
+            start, end = blocked[0], min(blocked[1], horizon)
+            if windows and windows[-1][1] == start:
+                windows[-1][1] = end
+            else:
+                windows.append([start, end])
+            t = end
+        return windows
+
+
+def build_calendars(machine_calendars: dict, machine_downtimes: dict):
+    """Calendários por máquina, com os pontos de downtime da mesma máquina incorporados."""
+    return {
+        m: MachineCalendar.from_dict(data, machine_downtimes.get(m, ()))
+        for m, data in (machine_calendars or {}).items()
+    }
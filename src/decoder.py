@@ -0,0 +1,237 @@
+import math
+from bisect import bisect_right, insort
+from functools import partial
+
+import numpy as np
+
+from classes.jssp import jssp
+from instrumentation import Profiler, clock
+from priority import repair_priorities
+
+
+def find_earliest_available_time(downtime_list, earliest_start, duration):
+    """
+    Encontra primeiro momento disponível considerando downtimes.
+
+    Args:
+        downtime_list: Lista ordenada de tempos indisponíveis da máquina
+        earliest_start: Menor início possível da operação
+        duration: Duração da operação
+
+    Returns:
+        Primeiro início em que nenhum downtime cai em [início, início + duração)
+    """
+    candidate_start = earliest_start
+
+    while True:
+        candidate_end = candidate_start + duration
+        conflict = False
+
+        for downtime_point in downtime_list:
+            if candidate_start <= downtime_point < candidate_end:
+                candidate_start = downtime_point + 1
+                conflict = True
+                break
+
+        if not conflict:
+            return candidate_start
+
+
+class PoolTimeline:
+    """
+    Linha do tempo de um pool de equipamentos idênticos: instantes (ordenados) em que cada
+    unidade fica livre.
+    """
+
+    def __init__(self, capacity: int):
+        self.releases = [0] * capacity
+
+    def ready(self):
+        """Primeiro instante com alguma unidade livre."""
+        return self.releases[0]
+
+    def assign(self, start, end):
+        """Ocupa a unidade livre há menos tempo em start (best fit) até end; exige start >= ready()."""
+        free = bisect_right(self.releases, start)
+        if free == 0:
+            raise ValueError(f"Nenhuma unidade do pool livre em {start} (a primeira libera em {self.releases[0]}).")
+        self.releases.pop(free - 1)
+        insort(self.releases, end)
+
+
+def make_fitness_function(instance: jssp, profiler: Profiler = None, cutoff=None):
+    """
+    Cria função de fitness com suporte a downtimes.
+    Usa decodificação por PRIORIDADE: o vetor é ajustado por repair_priorities,
+    o que garante a precedência dentro de cada job.
+
+    Args:
+        instance: Instância do problema JSSP
+        profiler: Profiler opcional que recebe tempos e contagens por fase
+            (priority_repair, sequencing, machine_selection, equipment_selection,
+            downtime_checks) e as estatísticas early_aborts/skipped_operations
+        cutoff: Abandono antecipado. Um número fixo, "incumbent" (melhor fitness completo já
+            avaliado por esta função) ou None (desligado). A decodificação para assim que o
+            limite inferior parcial (fim de cada job ou máquina + trabalho que ainda lhe resta)
+            passa do cutoff e devolve esse limite, sempre maior que o cutoff e menor ou igual
+            ao fitness completo
+
+    Returns:
+        Função de fitness que recebe uma solução (e, opcionalmente, um cutoff próprio da
+        chamada e um dict `schedule` que recebe índice achatado -> entrada do agendamento)
+        e retorna o makespan
+    """
+    operations = instance.get_flattened_operations()
+    machine_downtimes = instance.machine_downtimes
+    sorted_downtimes = {m: sorted(points) for m, points in machine_downtimes.items()}
+    # Próximo início disponível por máquina: calendário (que já inclui os pontos) ou lista de pontos
+    next_available = {m: partial(find_earliest_available_time, points) for m, points in sorted_downtimes.items()}
+    next_available.update({m: calendar.next_available for m, calendar in instance.calendars.items()})
+    op_job = instance.op_job.tolist()
+    op_position = instance.op_position.tolist()
+    job_names = [job.name for job in instance.jobs]
+    equipment_pools = instance.equipment_pools
+    profiling = profiler is not None
+
+    # Trabalho que ainda resta no job depois de cada operação, por somas de prefixo
+    prefix = np.concatenate(([0], np.cumsum(instance.durations)))
+    tail_work = (prefix[instance.job_offsets[1:]][instance.op_job] - prefix[1:]).tolist()
+    work_bound = int(np.diff(prefix[instance.job_offsets]).max(initial=0))
+    # Operações de máquina única ainda por vir entram depois do fim atual da máquina
+    # (o decodificador só acrescenta ao fim de cada máquina, não preenche lacunas)
+    single_machine_work = {}
+    for op in operations:
+        if len(op["machines"]) == 1:
+            m = op["machines"][0]
+            single_machine_work[m] = single_machine_work.get(m, 0) + op["duration"]
+    incumbent = [math.inf]
+
+    def fitness(solution, cutoff=cutoff, schedule=None):
+        """Calcula fitness da solução considerando precedências e downtimes."""
+        limit = incumbent[0] if cutoff == "incumbent" else (math.inf if cutoff is None else cutoff)
+        bound = work_bound
+        aborted = False
+        machine_work = dict(single_machine_work)
+        if profiling:
+            t_repair = clock()
+        _, order = repair_priorities(solution, instance)
+        if profiling:
+            t_loop = clock()
+            profiler.add("priority_repair", t_loop - t_repair)
+            machine_s = equipment_s = downtime_s = 0.0
+            downtime_calls = 0
+
+        # Executa operações na ordem de prioridade
+        machine_available = {}
+        equipment_available = {}
+        pools = {eq: PoolTimeline(capacity) for eq, capacity in equipment_pools.items()}
+        job_last_end_time = {}
+        end_times = []
+
+        for idx in order.tolist():
+            op = operations[idx]
+            job = op_job[idx]
+            machines = op["machines"]
+            duration = op["duration"]
+            equipments = op["equipments"]
+
+            # repair_priorities garante que a operação anterior do job já foi agendada
+
+            # Seleciona máquina considerando downtimes
+            best_machine = None
+            best_start_time = float('inf')
+
+            job_ready_time = job_last_end_time.get(job, 0)
+            if profiling:
+                t0 = clock()
+            latest_equipment_ready_time = max(
+                (pools[eq].ready() if eq in pools else equipment_available.get(eq, 0) for eq in equipments),
+                default=0,
+            )
+            if profiling:
+                t1 = clock()
+                equipment_s += t1 - t0
+
+            for m in machines:
+                machine_ready_time = machine_available.get(m, 0)
+                earliest_possible_start = max(machine_ready_time, job_ready_time, latest_equipment_ready_time)
+                if m in next_available:
+                    if profiling:
+                        t2 = clock()
+                    actual_start_time = next_available[m](earliest_possible_start, duration)
+                    if profiling:
+                        downtime_s += clock() - t2
+                        downtime_calls += 1
+                else:
+                    actual_start_time = earliest_possible_start
+
+                if actual_start_time < best_start_time:
+                    best_start_time = actual_start_time
+                    best_machine = m
+            if profiling:
+                machine_s += clock() - t1
+
+            machine = best_machine
+            start_time = best_start_time
+            end_time = start_time + duration
+
+            # Atualiza disponibilidades
+            machine_available[machine] = end_time
+            for eq in equipments:
+                if eq in pools:
+                    pools[eq].assign(start_time, end_time)
+                else:
+                    equipment_available[eq] = end_time
+            job_last_end_time[job] = end_time
+
+            end_times.append(end_time)
+            if schedule is not None:
+                schedule[idx] = {
+                    "job": job_names[job],
+                    "operation": op_position[idx],
+                    "start": start_time,
+                    "end": end_time,
+                    "duration": duration,
+                    "machine": machine,
+                    "equipment": list(equipments),
+                }
+
+            if len(machines) == 1:
+                machine_work[machine] -= duration
+            bound = max(bound, end_time + max(tail_work[idx], machine_work.get(machine, 0)))
+            if bound > limit:
+                aborted = True
+                break
+
+        if profiling:
+            t_end = clock()
+            # Fases são disjuntas: seleção de máquina exclui as checagens de downtime
+            # e o sequenciamento é o restante do laço
+            num_ops = len(operations)
+            profiler.add("equipment_selection", equipment_s, num_ops)
+            profiler.add("machine_selection", machine_s - downtime_s, num_ops)
+            profiler.add("downtime_checks", downtime_s, downtime_calls)
+            profiler.add("sequencing", (t_end - t_loop) - machine_s - equipment_s, num_ops)
+
+        if aborted:
+            if profiling:
+                profiler.add_stat("early_aborts", 1)
+                profiler.add_stat("skipped_operations", len(operations) - len(end_times))
+            return bound,
+
+        makespan = max(end_times) if end_times else 0
+        incumbent[0] = min(incumbent[0], makespan)
+        return makespan,
+
+    return fitness
+
+
+def decode_schedule(instance: jssp, solution):
+    """
+    Agendamento de um vetor de prioridades pelo mesmo decodificador da fitness, no formato de
+    extract_schedule (ordenado por job e operação). Como na fitness, "equipment" é a lista de
+    todos os equipamentos que a operação ocupa.
+    """
+    entries = {}
+    make_fitness_function(instance)(solution, schedule=entries)
+    return [entries[idx] for idx in sorted(entries)]
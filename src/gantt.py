@@ -0,0 +1,161 @@
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch
+
+
+def schedule_to_arrays(schedule):
+    """
+    Converte um agendamento (lista de dicts, como os de decode_schedule ou extract_schedule)
+    em vetores estruturados.
+
+    Args:
+        schedule: Lista de operações com start, end, machine, job e equipment (int, None ou
+            lista) ou equipments (lista)
+
+    Returns:
+        Dict com start, end, machine, job (códigos inteiros), job_names e
+        equipment_usage = (equipamento, início, fim) para cada uso de equipamento
+    """
+    start = np.array([op["start"] for op in schedule], dtype=float)
+    end = np.array([op["end"] for op in schedule], dtype=float)
+    machine = np.array([op["machine"] if op["machine"] is not None else -1 for op in schedule], dtype=np.int64)
+    job_names = list(dict.fromkeys(str(op["job"]) for op in schedule))
+    job_code = {name: i for i, name in enumerate(job_names)}
+    job = np.array([job_code[str(op["job"])] for op in schedule], dtype=np.int64)
+
+    eq_id, eq_start, eq_end = [], [], []
+    for op in schedule:
+        used = op["equipments"] if "equipments" in op else op.get("equipment")
+        if used is None:
+            used = []
+        elif not isinstance(used, (list, tuple)):
+            used = [used]
+        for eq in used:
+            eq_id.append(eq)
+            eq_start.append(op["start"])
+            eq_end.append(op["end"])
+
+    return {
+        "start": start,
+        "end": end,
+        "machine": machine,
+        "job": job,
+        "job_names": job_names,
+        "equipment_usage": (np.array(eq_id, dtype=np.int64), np.array(eq_start, dtype=float), np.array(eq_end, dtype=float)),
+    }
+
+
+def downsample_lane(start, end, min_gap):
+    """
+    Funde barras consecutivas separadas por menos de `min_gap` (invisível na resolução da figura).
+
+    Returns:
+        Tupla (inícios, fins) das barras fundidas, ordenadas
+    """
+    order = np.argsort(start, kind="stable")
+    start, end = start[order], np.maximum.accumulate(end[order])
+    breaks = np.flatnonzero(start[1:] - end[:-1] > min_gap) + 1
+    groups = np.concatenate(([0], breaks))
+    return start[groups], np.maximum.reduceat(end, groups)
+
+
+def downtime_ranges(points):
+    """Agrupa pontos de downtime consecutivos (cada ponto ocupa [p, p+1)) em intervalos."""
+    points = np.unique(np.asarray(points, dtype=float))
+    if points.size == 0:
+        return points, points
+    breaks = np.flatnonzero(np.diff(points) > 1) + 1
+    groups = np.split(points, breaks)
+    return np.array([g[0] for g in groups]), np.array([g[-1] + 1 for g in groups])
+
+
+def render_gantt(start, end, machine, job=None, job_names=None, equipment_usage=None,
+                 machine_downtimes=None, path=None, max_bars_per_lane=2000, label_limit=150,
+                 width_px=2000, figsize=(20, 8), title="Grafico de Gantt - Escalonamento JSSP"):
+    """
+    Desenha o Gantt com uma coleção (broken_barh) por faixa de recurso, sem um artista por operação.
+
+    Args:
+        start, end, machine: Vetores por operação
+        job: Código inteiro do job por operação (define as cores)
+        job_names: Nomes dos jobs (legenda), indexados pelo código
+        equipment_usage: Tupla (equipamento, início, fim) desenhada em faixas próprias
+        machine_downtimes: Dict {machine: [tempos indisponíveis]}
+        path: Se informado, salva em PNG/SVG/PDF (pela extensão) sem precisar de display
+        max_bars_per_lane: Acima disso a faixa é reamostrada (barras vizinhas fundidas)
+        label_limit: Rótulos de texto só são desenhados até este número de operações
+        width_px: Largura útil em pixels usada para decidir o que é invisível
+
+    Returns:
+        Figure do matplotlib
+    """
+    start = np.asarray(start, dtype=float)
+    end = np.asarray(end, dtype=float)
+    machine = np.asarray(machine)
+    job = np.zeros(len(start), dtype=np.int64) if job is None else np.asarray(job)
+    machine_downtimes = machine_downtimes or {}
+
+    lanes = [("Maquina", m) for m in np.unique(machine[machine >= 0])]
+    if equipment_usage is not None and len(equipment_usage[0]):
+        eq_id, eq_start, eq_end = (np.asarray(a) for a in equipment_usage)
+        lanes += [("Equipamento", e) for e in np.unique(eq_id)]
+    lane_y = {lane: i for i, lane in enumerate(lanes)}
+
+    span = max(float(end.max()) if end.size else 1.0, 1.0)
+    min_gap = span / width_px
+    cmap = colormaps["tab20"]
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    for (kind, resource), y in lane_y.items():
+        if kind == "Maquina":
+            mask = machine == resource
+            lane_start, lane_end, lane_job = start[mask], end[mask], job[mask]
+        else:
+            mask = eq_id == resource
+            lane_start, lane_end, lane_job = eq_start[mask], eq_end[mask], None
+
+        if lane_job is not None and len(lane_start) <= max_bars_per_lane:
+            colors = cmap(lane_job % cmap.N)
+        else:
+            if len(lane_start) > max_bars_per_lane:
+                lane_start, lane_end = downsample_lane(lane_start, lane_end, min_gap)
+            colors = "lightsteelblue" if kind == "Maquina" else "silver"
+
+        ax.broken_barh(np.column_stack((lane_start, lane_end - lane_start)), (y - 0.3, 0.6),
+                       facecolors=colors, edgecolor="black", linewidth=0.5 if len(lane_start) < 500 else 0)
+
+        if kind == "Maquina" and resource in machine_downtimes:
+            dt_start, dt_end = downtime_ranges(machine_downtimes[resource])
+            ax.broken_barh(np.column_stack((dt_start, dt_end - dt_start)), (y - 0.4, 0.8),
+                           facecolors="red", alpha=0.4, edgecolor="darkred", hatch="///")
+
+    if len(start) <= label_limit:
+        for i in range(len(start)):
+            if machine[i] >= 0:
+                name = job_names[job[i]] if job_names is not None else str(job[i])
+                ax.text((start[i] + end[i]) / 2, lane_y[("Maquina", machine[i])], name,
+                        va="center", ha="center", fontsize=8)
+
+    ax.set_yticks(range(len(lanes)))
+    ax.set_yticklabels([f"{kind} {resource}" for kind, resource in lanes])
+    ax.set_xlabel("Tempo")
+    ax.set_title(title)
+    ax.grid(True, axis="x", alpha=0.5)
+
+    legend = []
+    if job_names is not None and len(job_names) <= 20:
+        legend += [Patch(facecolor=cmap(i % cmap.N), edgecolor="black", label=name) for i, name in enumerate(job_names)]
+    if machine_downtimes:
+        legend.append(Patch(facecolor="red", alpha=0.4, edgecolor="darkred", hatch="///", label="Downtime"))
+    if legend:
+        ax.legend(handles=legend, loc="upper right", bbox_to_anchor=(1.12, 1))
+
+    fig.tight_layout()
+    if path is not None:
+        fig.savefig(path, dpi=100)
+    return fig
@@ -1,108 +1,138 @@
 import json
+import math
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from ortools.sat.python import cp_model
+from classes.jssp import jssp
+from classes.machine_calendar import build_calendars
+from incumbent_trace import TraceCallback
+from instrumentation import clock
 
 
-def solve_fjsp_with_equipment(instance_json):
+def normalize_instance(instance_json):
     """
-    Solve Flexible Job Shop Scheduling Problem (FJSP) with equipment constraints and machine downtimes.
-    Each operation can be processed on alternative machines and requires specific equipment.
-    Machines can have downtime periods during which they cannot process operations.
+    JSON turns machine and equipment ids used as dict keys into strings; map them back to ints.
+    """
+    def resource_keys(by_resource):
+        return {int(r) if isinstance(r, str) and r.lstrip("-").isdigit() else r: value
+                for r, value in by_resource.items()}
+
+    return dict(instance_json,
+                machine_downtimes=resource_keys(instance_json.get("machine_downtimes", {})),
+                machine_calendars=resource_keys(instance_json.get("machine_calendars", {})),
+                equipment_pools=resource_keys(instance_json.get("equipment_pools", {})))
+
+
+def build_fjsp_model(instance_json, symmetry_breaking=True, profiler=None):
+    """
+    Build the CP-SAT model for the FJSP with equipment constraints and machine downtimes.
+    Returns the model, the per-operation variables keyed by (job_id, op_id) and the makespan variable.
+
+    The model is compacted: end is the expression start + duration, single-alternative resources
+    use fixed (non-optional) intervals, the makespan only looks at each job's last operation and
+    resources used by a single interval get no AddNoOverlap.
+    An optional Profiler receives the time spent in variable creation, no-overlap construction
+    and symmetry breaking.
+
+    An optional "earliest_start" in the instance (used by rolling-horizon windows) is a lower
+    bound on every start; calendars are then only expanded within [earliest_start, horizon).
     """
     jobs_data = instance_json["jobs"]
     machine_downtimes = instance_json.get("machine_downtimes", {})
 
     model = cp_model.CpModel()
 
-    # Collect all machines and equipment
-    all_machines = set()
-    all_equipment = set()
-    for job_ops in jobs_data.values():
-        for (machines, equipment, _) in job_ops:
-            all_machines.update(machines)
-            all_equipment.update(equipment)
-    all_machines = sorted(all_machines)
-    all_equipment = sorted(all_equipment)
+    horizon = int(math.ceil(instance_json.get("timespan", 1000)))  # fallback horizon
+    earliest_start = int(instance_json.get("earliest_start", 0))
 
-    horizon = instance_json.get("timespan", 1000)  # fallback horizon
+    if profiler is not None:
+        t_variables = clock()
 
     # Variables to store task intervals
     task_intervals = {}
-    machine_to_intervals = {m: [] for m in all_machines}
-    equipment_to_intervals = {e: [] for e in all_equipment}
+    machine_to_intervals = defaultdict(list)
+    equipment_to_intervals = defaultdict(list)
 
     # Create variables for each operation
     for job_id, job_ops in jobs_data.items():
         for op_id, (machines, equipment, duration) in enumerate(job_ops):
             suffix = f"_{job_id}_{op_id}"
-            start_var = model.NewIntVar(0, horizon, "start" + suffix)
-            end_var = model.NewIntVar(0, horizon, "end" + suffix)
+            start_var = model.NewIntVar(earliest_start, max(horizon - duration, earliest_start), "start" + suffix)
+            end_var = start_var + duration
             
             machine_interval_vars = []
             equipment_interval_vars = []
 
-            # Create optional intervals for alternative machines
+            # Create intervals for alternative machines (optional only if there is a choice)
             for m in machines:
-                is_present_machine = model.NewBoolVar(f"is_present_machine{suffix}_m{m}")
-                interval_machine = model.NewOptionalIntervalVar(
-                    start_var, duration, end_var, is_present_machine, f"interval_machine{suffix}_m{m}")
+                if len(machines) == 1:
+                    is_present_machine = True
+                    interval_machine = model.NewFixedSizeIntervalVar(start_var, duration, f"interval_machine{suffix}_m{m}")
+                else:
+                    is_present_machine = model.NewBoolVar(f"is_present_machine{suffix}_m{m}")
+                    interval_machine = model.NewOptionalFixedSizeIntervalVar(
+                        start_var, duration, is_present_machine, f"interval_machine{suffix}_m{m}")
                 machine_interval_vars.append((m, interval_machine, is_present_machine))
-                
-                # Add machine downtime constraints
-                # machine_downtimes[m] is a list of time points where the machine is unavailable
-                if m in machine_downtimes:
-                    downtime_list = machine_downtimes[m]
-                    # For each downtime point, ensure it doesn't fall within [start_var, end_var)
-                    for downtime_point in downtime_list:
-                        
-                        # Create boolean: is downtime_point before the operation?
-                        before_op = model.NewBoolVar(f"before_op{suffix}_m{m}_dt{downtime_point}")
-                        
-                        # If machine is selected and downtime is before: downtime_point < start_var
-                        model.Add(downtime_point < start_var).OnlyEnforceIf([is_present_machine, before_op])
-                        
-                        # If machine is selected and downtime is not before: downtime_point >= end_var
-                        model.Add(downtime_point >= end_var).OnlyEnforceIf([is_present_machine, before_op.Not()])
-
-            # Create optional intervals for alternative equipment
+                machine_to_intervals[m].append(interval_machine)
+
+            # Create intervals for alternative equipment (optional only if there is a choice)
             for e in equipment:
-                is_present_equipment = model.NewBoolVar(f"is_present_equipment{suffix}_e{e}")
-                interval_equipment = model.NewOptionalIntervalVar(
-                    start_var, duration, end_var, is_present_equipment, f"interval_equipment{suffix}_e{e}")
+                if len(equipment) == 1:
+                    is_present_equipment = True
+                    interval_equipment = model.NewFixedSizeIntervalVar(start_var, duration, f"interval_equipment{suffix}_e{e}")
+                else:
+                    is_present_equipment = model.NewBoolVar(f"is_present_equipment{suffix}_e{e}")
+                    interval_equipment = model.NewOptionalFixedSizeIntervalVar(
+                        start_var, duration, is_present_equipment, f"interval_equipment{suffix}_e{e}")
                 equipment_interval_vars.append((e, interval_equipment, is_present_equipment))
+                equipment_to_intervals[e].append(interval_equipment)
 
             task_intervals[(job_id, op_id)] = (
                 start_var, end_var, machine_interval_vars, equipment_interval_vars, duration
             )
 
+    add_downtime_constraints(model, task_intervals, machine_downtimes)
+
     # Constraints for alternative machines: exactly one machine chosen per operation
     for (job_id, op_id), (start_var, end_var, machine_interval_vars, equipment_interval_vars, duration) in task_intervals.items():
-        # Each operation must be assigned to exactly one machine (if machines are available)
-        if machine_interval_vars:
+        # Each operation must be assigned to exactly one machine (if there is a choice)
+        if len(machine_interval_vars) > 1:
             model.AddExactlyOne(is_present for (_, _, is_present) in machine_interval_vars)
         
-        # Each operation must be assigned to exactly one equipment (if equipment are required)
-        if equipment_interval_vars:
+        # Each operation must be assigned to exactly one equipment (if there is a choice)
+        if len(equipment_interval_vars) > 1:
             model.AddExactlyOne(is_present for (_, _, is_present) in equipment_interval_vars)
 
-    # No overlap on machines
-    for m in all_machines:
-        intervals = []
-        for (job_id, op_id), (start_var, end_var, machine_interval_vars, equipment_interval_vars, duration) in task_intervals.items():
-            for (mm, interval, is_present) in machine_interval_vars:
-                if mm == m:
-                    intervals.append(interval)
-        if intervals:
-            model.AddNoOverlap(intervals)
+    if profiler is not None:
+        t_no_overlap = clock()
+        profiler.add("variable_creation", t_no_overlap - t_variables, len(task_intervals))
+
+    # Machine calendars become fixed intervals in the machine's no-overlap, only within [earliest_start, horizon)
+    calendars = build_calendars(instance_json.get("machine_calendars", {}), {})
+    for m, calendar in calendars.items():
+        if m in machine_to_intervals:
+            for start, end in calendar.windows(horizon, earliest_start):
+                machine_to_intervals[m].append(model.NewFixedSizeIntervalVar(start, end - start, f"calendar_m{m}_{start}"))
 
-    # No overlap on equipment
-    for e in all_equipment:
-        intervals = []
-        for (job_id, op_id), (start_var, end_var, machine_interval_vars, equipment_interval_vars, duration) in task_intervals.items():
-            for (ee, interval, is_present) in equipment_interval_vars:
-                if ee == e:
-                    intervals.append(interval)
-        if intervals:
+    # No overlap on machines and equipment (a single interval cannot overlap anything);
+    # equipment pools get a cumulative with their capacity instead
+    equipment_pools = instance_json.get("equipment_pools", {})
+    no_overlaps = 0
+    for intervals in machine_to_intervals.values():
+        if len(intervals) > 1:
             model.AddNoOverlap(intervals)
+            no_overlaps += 1
+    for e, intervals in equipment_to_intervals.items():
+        capacity = equipment_pools.get(e, 1)
+        if len(intervals) > capacity:
+            if capacity > 1:
+                model.AddCumulative(intervals, [1] * len(intervals), capacity)
+            else:
+                model.AddNoOverlap(intervals)
+            no_overlaps += 1
+
+    if profiler is not None:
+        profiler.add("no_overlap", clock() - t_no_overlap, no_overlaps)
 
     # Precedence constraints inside the job (if more than one op)
     for job_id, job_ops in jobs_data.items():
@@ -114,54 +144,419 @@ def solve_fjsp_with_equipment(instance_json):
     # Define makespan variable
     makespan = model.NewIntVar(0, horizon, "makespan")
 
-    # All operations must finish before makespan
-    ends = [task_intervals[(job_id, op_id)][1]
-            for job_id, job_ops in jobs_data.items()
-            for op_id in range(len(job_ops))]
-    model.AddMaxEquality(makespan, ends)
+    # Precedence makes each job's last operation its latest one
+    last_ends = [task_intervals[(job_id, len(job_ops) - 1)][1]
+                 for job_id, job_ops in jobs_data.items()
+                 if job_ops]
+    model.AddMaxEquality(makespan, last_ends)
+
+    if symmetry_breaking:
+        if profiler is not None:
+            t_symmetry = clock()
+        add_symmetry_breaking(model, instance_json, task_intervals)
+        if profiler is not None:
+            profiler.add("symmetry_breaking", clock() - t_symmetry)
 
     # Minimize makespan
     model.Minimize(makespan)
 
-    # Solve model
-    solver = cp_model.CpSolver()
-    status = solver.Solve(model)
-
-    if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
-        # Show detailed solution
-        for job_id, job_ops in jobs_data.items():
-            print(f"\n{job_id}:")
-            for op_id in range(len(job_ops)):
-                start = solver.Value(task_intervals[(job_id, op_id)][0])
-                duration = task_intervals[(job_id, op_id)][4]
-                
-                # Find which machine was selected
-                machine_interval_vars = task_intervals[(job_id, op_id)][2]
-                selected_machine = None
-                for (m, _, is_present) in machine_interval_vars:
-                    if solver.Value(is_present):
-                        selected_machine = m
-                        break
-                
-                # Find which equipment was selected
-                equipment_interval_vars = task_intervals[(job_id, op_id)][3]
-                selected_equipment = None
-                for (e, _, is_present) in equipment_interval_vars:
-                    if solver.Value(is_present):
-                        selected_equipment = e
-                        break
-                
-                machine_str = f"Machine {selected_machine}" if selected_machine else "No machine"
-                equipment_str = f"Equipment {selected_equipment}" if selected_equipment else "No equipment"
-                
-                downtime_info = ""
-                if selected_machine and selected_machine in machine_downtimes:
-                    downtime_list = machine_downtimes[selected_machine]
-                    downtime_info = f", Machine downtimes: {downtime_list}"
-                
-                print(f"  Operation {op_id}: start={start}, duration={duration}, {machine_str}, {equipment_str}{downtime_info}")
-        
-        return solver.ObjectiveValue()
+    return model, task_intervals, makespan
+
+
+def add_downtime_constraints(model, task_intervals, machine_downtimes):
+    """
+    Keep every downtime point of a machine outside [start, end) of the operations that run on it.
+    machine_downtimes[m] is a list of time points where the machine is unavailable.
+    """
+    for (job_id, op_id), (start_var, end_var, machine_interval_vars, _, _) in task_intervals.items():
+        suffix = f"_{job_id}_{op_id}"
+        for (m, _, is_present_machine) in machine_interval_vars:
+            if m not in machine_downtimes:
+                continue
+            presence = [] if is_present_machine is True else [is_present_machine]
+            for downtime_point in machine_downtimes[m]:
+
+                # Create boolean: is downtime_point before the operation?
+                before_op = model.NewBoolVar(f"before_op{suffix}_m{m}_dt{downtime_point}")
+
+                # If machine is selected and downtime is before: downtime_point < start_var
+                model.Add(downtime_point < start_var).OnlyEnforceIf(presence + [before_op])
+
+                # If machine is selected and downtime is not before: downtime_point >= end_var
+                model.Add(downtime_point >= end_var).OnlyEnforceIf(presence + [before_op.Not()])
+
+
+def find_identical_jobs(jobs_data):
+    """
+    Group jobs whose operation lists are identical (same resources and durations, in order).
+    Only groups with more than one job are returned.
+    """
+    groups = defaultdict(list)
+    for job_id, job_ops in jobs_data.items():
+        if not job_ops:
+            continue
+        signature = tuple((tuple(sorted(machines)), tuple(sorted(equipment)), duration)
+                          for (machines, equipment, duration) in job_ops)
+        groups[signature].append(job_id)
+    return [job_ids for job_ids in groups.values() if len(job_ids) > 1]
+
+
+def find_interchangeable_resources(jobs_data, machine_downtimes, machine_calendars=None, equipment_pools=None):
+    """
+    Group machines that have the same downtimes, calendar and eligible operations, and equipment
+    with the same eligible operations and capacity. Swapping two resources of a group maps any schedule to an
+    equally good one. Only groups with more than one resource are returned.
+    """
+    machine_ops = defaultdict(set)
+    equipment_ops = defaultdict(set)
+    for job_id, job_ops in jobs_data.items():
+        for op_id, (machines, equipment, _) in enumerate(job_ops):
+            for m in machines:
+                machine_ops[m].add((job_id, op_id))
+            for e in equipment:
+                equipment_ops[e].add((job_id, op_id))
+
+    machine_groups = defaultdict(list)
+    for m in sorted(machine_ops):
+        calendar = json.dumps((machine_calendars or {}).get(m), sort_keys=True)
+        signature = (frozenset(machine_ops[m]), tuple(sorted(machine_downtimes.get(m, []))), calendar)
+        machine_groups[signature].append(m)
+
+    equipment_groups = defaultdict(list)
+    for e in sorted(equipment_ops):
+        equipment_groups[(frozenset(equipment_ops[e]), (equipment_pools or {}).get(e, 1))].append(e)
+
+    return (
+        [group for group in machine_groups.values() if len(group) > 1],
+        [group for group in equipment_groups.values() if len(group) > 1],
+    )
+
+
+def pool_interchangeable_equipment(instance_json):
+    """
+    Replace each group of interchangeable equipment (e.g. copies of a fixture expanded into separate
+    ids) by one pool, keyed by the group's first id, whose capacity is the sum of the members'.
+    The pool shrinks the model and removes the symmetry between members.
+    Returns the new instance and {pool id: [(member id, capacity), ...]} for unpool_schedule.
+    """
+    pools = dict(instance_json.get("equipment_pools", {}))
+    # Capacities are summed, so groups are formed on eligible operations alone
+    _, equipment_groups = find_interchangeable_resources(instance_json["jobs"], {})
+    members = {}
+    rename = {}
+    for group in equipment_groups:
+        members[group[0]] = [(e, pools.pop(e, 1)) for e in group]
+        pools[group[0]] = sum(capacity for _, capacity in members[group[0]])
+        rename.update({e: group[0] for e in group[1:]})
+
+    jobs = {
+        job_id: [(machines, list(dict.fromkeys(rename.get(e, e) for e in equipment)), duration)
+                 for (machines, equipment, duration) in job_ops]
+        for job_id, job_ops in instance_json["jobs"].items()
+    }
+    return dict(instance_json, jobs=jobs, equipment_pools=pools), members
+
+
+def unpool_schedule(schedule, members):
+    """
+    Give each use of a pool built by pool_interchangeable_equipment a concrete member id. Every
+    member contributes `capacity` units; in start order each operation takes a unit that is free
+    (interval partitioning), which always exists because the pool never exceeds its capacity.
+    """
+    units = {pool: [(0, e) for e, capacity in group for _ in range(capacity)] for pool, group in members.items()}
+    unpooled = list(schedule)
+    for i in sorted(range(len(schedule)), key=lambda i: (schedule[i]["start"], schedule[i]["end"])):
+        entry = schedule[i]
+        if entry["equipment"] not in units:
+            continue
+        pool_units = units[entry["equipment"]]
+        free = min((unit for unit in pool_units if unit[0] <= entry["start"]), default=None)
+        if free is None:
+            raise ValueError(f"Pool {entry['equipment']} over capacity at {entry['start']}.")
+        pool_units.remove(free)
+        pool_units.append((entry["end"], free[1]))
+        unpooled[i] = dict(entry, equipment=free[1])
+    return unpooled
+
+
+def add_value_precedence(model, literals_by_op, name):
+    """
+    Lexicographic resource use for a group of interchangeable resources: the r-th resource of the
+    group may only be used by an operation if the (r-1)-th one is used by an earlier operation.
+    literals_by_op holds, for each operation in a fixed order, its presence literal per resource.
+    """
+    group_size = len(literals_by_op[0])
+    used_before = [None] * group_size
+    for i, literals in enumerate(literals_by_op):
+        for r in range(1, group_size):
+            if used_before[r - 1] is None:
+                model.Add(literals[r] == 0)
+            else:
+                model.AddImplication(literals[r], used_before[r - 1])
+
+        if i == len(literals_by_op) - 1:
+            break
+        for r in range(group_size):
+            if used_before[r] is None:
+                used_before[r] = literals[r]
+            else:
+                used = model.NewBoolVar(f"{name}_used_{i}_{r}")
+                model.AddMaxEquality(used, [used_before[r], literals[r]])
+                used_before[r] = used
+
+
+def add_symmetry_breaking(model, instance_json, task_intervals):
+    """
+    Break symmetries between identical jobs (ordered first-operation starts) and between
+    interchangeable machines/equipment (lexicographic resource use). Job ordering only constrains
+    start times and resource relabelling never changes them, so both can be applied together.
+    """
+    jobs_data = instance_json["jobs"]
+    machine_downtimes = instance_json.get("machine_downtimes", {})
+
+    for job_ids in find_identical_jobs(jobs_data):
+        for job_a, job_b in zip(job_ids, job_ids[1:]):
+            model.Add(task_intervals[(job_a, 0)][0] <= task_intervals[(job_b, 0)][0])
+
+    machine_groups, equipment_groups = find_interchangeable_resources(
+        jobs_data, machine_downtimes, instance_json.get("machine_calendars"), instance_json.get("equipment_pools"))
+    for slot, groups in ((2, machine_groups), (3, equipment_groups)):
+        for group_idx, group in enumerate(groups):
+            literals_by_op = []
+            for key, variables in task_intervals.items():
+                presence = {r: is_present for (r, _, is_present) in variables[slot]}
+                if group[0] in presence:
+                    literals_by_op.append([presence[r] for r in group])
+            if any(is_present is True for literals in literals_by_op for is_present in literals):
+                continue
+            add_value_precedence(model, literals_by_op, f"sym{slot}_{group_idx}")
+
+
+def is_selected(solver, is_present):
+    """
+    Value of a presence literal; fixed intervals use the constant True.
+    """
+    return is_present is True or solver.BooleanValue(is_present)
+
+
+def extract_schedule(solver, jobs_data, task_intervals):
+    """
+    Read the solved values back into a list of operations with start, end and the selected resources.
+    """
+    schedule = []
+    for job_id, job_ops in jobs_data.items():
+        for op_id in range(len(job_ops)):
+            start_var, end_var, machine_interval_vars, equipment_interval_vars, duration = task_intervals[(job_id, op_id)]
+
+            # Find which machine was selected
+            selected_machine = None
+            for (m, _, is_present) in machine_interval_vars:
+                if is_selected(solver, is_present):
+                    selected_machine = m
+                    break
+
+            # Find which equipment was selected
+            selected_equipment = None
+            for (e, _, is_present) in equipment_interval_vars:
+                if is_selected(solver, is_present):
+                    selected_equipment = e
+                    break
+
+            schedule.append({
+                "job": job_id,
+                "operation": op_id,
+                "start": solver.Value(start_var),
+                "end": solver.Value(end_var),
+                "duration": duration,
+                "machine": selected_machine,
+                "equipment": selected_equipment,
+            })
+    return schedule
+
+
+def add_schedule_hints(model, task_intervals, schedule):
+    """
+    Warm start the model from a previously found schedule (e.g. a feasible cached solution).
+    """
+    for entry in schedule:
+        key = (entry["job"], entry["operation"])
+        if key not in task_intervals:
+            continue
+        start_var, end_var, machine_interval_vars, equipment_interval_vars, duration = task_intervals[key]
+        model.AddHint(start_var, entry["start"])
+        for (m, _, is_present) in machine_interval_vars:
+            if is_present is not True:
+                model.AddHint(is_present, m == entry["machine"])
+        for (e, _, is_present) in equipment_interval_vars:
+            if is_present is not True:
+                model.AddHint(is_present, e == entry["equipment"])
+
+
+def print_schedule(schedule, machine_downtimes):
+    """
+    Show detailed solution
+    """
+    current_job = None
+    for entry in schedule:
+        if entry["job"] != current_job:
+            current_job = entry["job"]
+            print(f"\n{current_job}:")
+
+        selected_machine = entry["machine"]
+        selected_equipment = entry["equipment"]
+        machine_str = f"Machine {selected_machine}" if selected_machine else "No machine"
+        equipment_str = f"Equipment {selected_equipment}" if selected_equipment else "No equipment"
+
+        downtime_info = ""
+        if selected_machine and selected_machine in machine_downtimes:
+            downtime_list = machine_downtimes[selected_machine]
+            downtime_info = f", Machine downtimes: {downtime_list}"
+
+        print(f"  Operation {entry['operation']}: start={entry['start']}, duration={entry['duration']}, {machine_str}, {equipment_str}{downtime_info}")
+
+
+def solve_instance(instance_json, time_limit=None, num_workers=None, hint_schedule=None,
+                   solver=None, solution_callback=None, profiler=None, pool_equipment=False):
+    """
+    Build and solve one model without printing.
+    Returns a dict with objective, bound, status and schedule, or None if no solution was found.
+    A caller-owned solver can be passed to stop the search from another thread (StopSearch),
+    and a CpSolverSolutionCallback to observe intermediate incumbents.
+    An optional Profiler receives build/solve timings, presolve time and CP-SAT statistics.
+    With pool_equipment=True, interchangeable equipment is merged into pools before the model is
+    built (pool_interchangeable_equipment) and the schedule is mapped back to member ids.
+    """
+    jobs_data = instance_json["jobs"]
+    members = {}
+    if pool_equipment:
+        instance_json, members = pool_interchangeable_equipment(instance_json)
+        if hint_schedule is not None:
+            rename = {e: pool for pool, group in members.items() for e, _ in group}
+            hint_schedule = [dict(entry, equipment=rename.get(entry["equipment"], entry["equipment"]))
+                             for entry in hint_schedule]
+
+    model, task_intervals, makespan = build_fjsp_model(instance_json, profiler=profiler)
+    if hint_schedule is not None:
+        add_schedule_hints(model, task_intervals, hint_schedule)
+
+    if solver is None:
+        solver = cp_model.CpSolver()
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = time_limit
+    if num_workers is not None:
+        solver.parameters.num_workers = num_workers
+    if profiler is not None:
+        profiler.attach_cp_sat(solver)
+        t_solve = clock()
+    status = solver.Solve(model, solution_callback)
+    if profiler is not None:
+        profiler.add("solve", clock() - t_solve)
+        profiler.record_solver_stats(solver)
+
+    if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+        return None
+    return {
+        "objective": solver.ObjectiveValue(),
+        "bound": solver.BestObjectiveBound(),
+        "status": solver.StatusName(status),
+        "schedule": unpool_schedule(extract_schedule(solver, jobs_data, task_intervals), members),
+    }
+
+
+def split_instance(instance_json):
+    """
+    Split an instance into independent sub-instances, one per connected component of the
+    job-resource graph. Downtimes and timespan are shared by all sub-instances.
+    """
+    components = jssp(instance_json).connected_components()
+    return [
+        dict(instance_json, jobs={job_id: instance_json["jobs"][job_id] for job_id in job_ids})
+        for job_ids in components
+    ]
+
+
+def _solve_component(args):
+    return solve_instance(*args)
+
+
+def solve_decomposed(instance_json, time_limit=None, num_workers=None, hint_schedule=None, max_processes=None):
+    """
+    Solve each connected component in its own process and combine the results:
+    the makespan and bound are the max over components, the schedules are concatenated.
+    """
+    sub_instances = split_instance(instance_json)
+    if len(sub_instances) == 1:
+        return solve_instance(instance_json, time_limit, num_workers, hint_schedule)
+
+    tasks = [(sub_instance, time_limit, num_workers, hint_schedule) for sub_instance in sub_instances]
+    with ProcessPoolExecutor(max_workers=max_processes) as executor:
+        results = list(executor.map(_solve_component, tasks))
+
+    if any(result is None for result in results):
+        return None
+
+    order = {job_id: i for i, job_id in enumerate(instance_json["jobs"])}
+    schedule = sorted(
+        (entry for result in results for entry in result["schedule"]),
+        key=lambda entry: (order[entry["job"]], entry["operation"]),
+    )
+    return {
+        "objective": max(result["objective"] for result in results),
+        "bound": max(result["bound"] for result in results),
+        "status": "OPTIMAL" if all(result["status"] == "OPTIMAL" for result in results) else "FEASIBLE",
+        "schedule": schedule,
+    }
+
+
+def solve_fjsp_with_equipment(instance_json, time_limit=None, num_workers=None, cache=None, decompose=False,
+                              trace=None):
+    """
+    Solve Flexible Job Shop Scheduling Problem (FJSP) with equipment constraints and machine downtimes.
+    Each operation can be processed on alternative machines and requires specific equipment.
+    Machines can have downtime periods during which they cannot process operations.
+
+    If a SolveCache is given, proven-optimal cached results are returned without solving and
+    feasible cached schedules are used as a warm start. Optimal results are cached under the
+    instance alone (any time_limit/num_workers reuses them); feasible ones under the parameters.
+    With decompose=True, groups of jobs sharing no machine or equipment are solved in parallel processes.
+    An IncumbentTrace records (wall time, branches, objective, bound) at every improving solution of
+    a monolithic solve and is stored with the cached result; a cache hit records a single point
+    with zero branches. Tracing is not supported with decompose=True (components solve in
+    separate processes).
+    Resource keys are normalized first (normalize_instance), so "1" and 1 name the same machine
+    both in the model and in the cache key.
+    """
+    if trace is not None and decompose:
+        raise ValueError("trace is not supported with decompose=True")
+    instance_json = normalize_instance(instance_json)
+    machine_downtimes = instance_json.get("machine_downtimes", {})
+    params = {"time_limit": time_limit, "num_workers": num_workers}
+
+    cached = None
+    if cache is not None:
+        cached = cache.get(instance_json) or cache.get(instance_json, params)
+    if cached is not None and cached["status"] == "OPTIMAL":
+        if trace is not None:
+            trace.record(0, cached["objective"], cached["bound"])
+        print_schedule(cached["schedule"], machine_downtimes)
+        return cached["objective"]
+
+    hint_schedule = cached["schedule"] if cached is not None else None
+    if decompose:
+        result = solve_decomposed(instance_json, time_limit, num_workers, hint_schedule)
+    else:
+        callback = TraceCallback(trace) if trace is not None else None
+        result = solve_instance(instance_json, time_limit, num_workers, hint_schedule, solution_callback=callback)
+        if result is not None and trace is not None:
+            result["trace"] = trace.rows
+
+    if result is not None:
+        print_schedule(result["schedule"], machine_downtimes)
+
+        if cache is not None:
+            cache.put(instance_json, None if result["status"] == "OPTIMAL" else params, result)
+
+        return result["objective"]
     else:
         print("No solution found.")
         return None
@@ -0,0 +1,97 @@
+import json
+import time
+
+from ortools.sat.python import cp_model
+
+
+class IncumbentTrace:
+    """
+    Registro compacto da evolução do incumbente: uma linha
+    [tempo_s, avaliacoes, melhor_makespan, limitante] a cada melhoria.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.rows = []
+
+    def record(self, evaluations, best, bound=None):
+        self.rows.append([round(time.perf_counter() - self.start, 6), evaluations, best, bound])
+
+    def time_to_target(self, target):
+        """Tempo até o primeiro incumbente <= target (None se nunca alcançado)."""
+        for wall_time, _, best, _ in self.rows:
+            if best <= target:
+                return wall_time
+        return None
+
+
+class TraceCallback(cp_model.CpSolverSolutionCallback):
+    """
+    Callback do CP-SAT que registra cada solução melhor no IncumbentTrace.
+    A contagem de avaliações é o número de branches do worker que achou a solução.
+    """
+
+    def __init__(self, trace: IncumbentTrace):
+        super().__init__()
+        self.trace = trace
+
+    def on_solution_callback(self):
+        self.trace.record(self.NumBranches(), self.ObjectiveValue(), self.BestObjectiveBound())
+
+
+def traced_fitness(fitness, trace: IncumbentTrace):
+    """
+    Envolve a função de fitness contando avaliações e registrando cada melhoria no trace.
+
+    Args:
+        fitness: Função de fitness (retorna valor ou tupla (valor,))
+        trace: Trace onde as melhorias são registradas
+
+    Returns:
+        Função com a mesma assinatura e retorno da original
+    """
+    evaluations = 0
+    best = float("inf")
+
+    def wrapper(solution):
+        nonlocal evaluations, best
+        result = fitness(solution)
+        evaluations += 1
+        value = result[0] if isinstance(result, tuple) else result
+        if value < best:
+            best = value
+            trace.record(evaluations, value)
+        return result
+
+    return wrapper
+
+
+def append_traces(traces, metaheuristic_type, test_name, filename="all_metaheuristics_traces.jsonl"):
+    """
+    Acrescenta os traces de uma bateria de execuções, uma linha JSON por execução,
+    ao lado do CSV consolidado de resultados.
+
+    Args:
+        traces: Lista de tuplas (solution_id, IncumbentTrace)
+        metaheuristic_type: Nome/tipo da metaheuristica usada
+        test_name: Nome do teste/caso executado
+        filename: Arquivo JSON Lines de saída
+
+    Returns:
+        Nome do arquivo atualizado
+    """
+    with open(filename, "a", encoding="utf-8") as f:
+        for solution_id, trace in traces:
+            f.write(json.dumps({
+                "id": solution_id,
+                "metaheuristic_type": metaheuristic_type,
+                "test_name": test_name,
+                "trace": trace.rows,
+            }, separators=(",", ":")) + "\n")
+    return filename
+
+
+def load_traces(filename="all_metaheuristics_traces.jsonl"):
+    """Lê os traces gravados por append_traces."""
+    with open(filename, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,95 @@
+import time
+from collections import defaultdict
+
+
+clock = time.perf_counter
+
+
+class Profiler:
+    """
+    Contadores e tempos acumulados por fase (decodificador e construção/solução do modelo).
+
+    É opcional: as funções instrumentadas recebem `profiler=None` por padrão e, nesse caso,
+    só pagam o custo de um teste `is not None` por fase.
+    """
+
+    def __init__(self):
+        self.counts = defaultdict(int)
+        self.seconds = defaultdict(float)
+        self.stats = defaultdict(float)
+
+    def add(self, phase, seconds, count=1):
+        """Acumula `count` ocorrências da fase com duração total `seconds`."""
+        self.counts[phase] += count
+        self.seconds[phase] += seconds
+
+    def add_stat(self, name, value):
+        """Acumula uma estatística numérica (ex.: branches do CP-SAT)."""
+        self.stats[name] += value
+
+    def merge(self, other):
+        """Soma os contadores de outro Profiler (ex.: de várias execuções)."""
+        for phase, count in other.counts.items():
+            self.counts[phase] += count
+        for phase, seconds in other.seconds.items():
+            self.seconds[phase] += seconds
+        for name, value in other.stats.items():
+            self.stats[name] += value
+        return self
+
+    def reset(self):
+        self.counts.clear()
+        self.seconds.clear()
+        self.stats.clear()
+
+    def summary(self):
+        """Dicionário fase -> {count, seconds, mean_us}."""
+        return {
+            phase: {
+                "count": self.counts[phase],
+                "seconds": self.seconds[phase],
+                "mean_us": 1e6 * self.seconds[phase] / self.counts[phase] if self.counts[phase] else 0.0,
+            }
+            for phase in self.counts
+        }
+
+    def as_row(self, **labels):
+        """
+        Linha plana para agregação por execução (CSV / DataFrame).
+
+        Args:
+            labels: Identificação da execução (ex.: test_name, metaheuristic_type)
+
+        Returns:
+            Dict com os labels, <fase>_count, <fase>_s e as estatísticas do solver
+        """
+        row = dict(labels)
+        for phase in self.counts:
+            row[f"{phase}_count"] = self.counts[phase]
+            row[f"{phase}_s"] = self.seconds[phase]
+        row.update(self.stats)
+        return row
+
+    def attach_cp_sat(self, solver):
+        """
+        Liga o log do CP-SAT (sem imprimir) para medir o tempo de presolve pela
+        diferença entre 'Starting presolve' e 'Presolved optimization model'.
+        """
+        started = []
+
+        def on_log(line):
+            if line.startswith("Starting presolve"):
+                started.append(clock())
+            elif line.startswith("Presolved optimization model") and started:
+                self.add("cp_sat_presolve", clock() - started.pop())
+
+        solver.parameters.log_search_progress = True
+        solver.parameters.log_to_stdout = False
+        solver.log_callback = on_log
+
+    def record_solver_stats(self, solver):
+        """Acumula as estatísticas da última solução do CP-SAT."""
+        self.add_stat("cp_sat_branches", solver.NumBranches())
+        self.add_stat("cp_sat_conflicts", solver.NumConflicts())
+        self.add_stat("cp_sat_wall_time", solver.WallTime())
+        self.add_stat("cp_sat_deterministic_time", solver.ResponseProto().deterministic_time)
@@ -0,0 +1,203 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from classes.jssp import jssp
+from decoder import make_fitness_function
+
+
+class BRKGA:
+    """
+    Algoritmo genético de chaves aleatórias enviesado (BRKGA): a cada geração a elite é
+    copiada, uma fração de mutantes é sorteada do zero e o restante vem do cruzamento de um
+    pai da elite com um de fora dela (cada gene herdado da elite com probabilidade rho).
+    """
+
+    def __init__(self, pop_size=50, elite_fraction=0.2, mutant_fraction=0.1, rho=0.7):
+        self.pop_size = pop_size
+        self.num_elite = max(1, int(elite_fraction * pop_size))
+        self.num_mutants = int(mutant_fraction * pop_size)
+        self.rho = rho
+
+    def evolve(self, fitness, population, fitnesses, epochs, rng):
+        for _ in range(epochs):
+            order = np.argsort(fitnesses, kind="stable")
+            population, fitnesses = population[order], fitnesses[order]
+            num_children = self.pop_size - self.num_elite - self.num_mutants
+
+            elite = population[rng.integers(0, self.num_elite, num_children)]
+            others = population[rng.integers(self.num_elite, self.pop_size, num_children)]
+            children = np.where(rng.random(elite.shape) < self.rho, elite, others)
+            mutants = rng.random((self.num_mutants, population.shape[1]))
+
+            offspring = np.vstack((children, mutants))
+            population = np.vstack((population[:self.num_elite], offspring))
+            fitnesses = np.concatenate((fitnesses[:self.num_elite], evaluate(fitness, offspring)))
+        return population, fitnesses
+
+
+class MealpyEngine:
+    """
+    Adapta um otimizador do mealpy (ex.: SA.OriginalSA, PSO.OriginalPSO, HS.OriginalHS) à
+    interface das ilhas. Cada trecho entre migrações é uma chamada a solve() com `epochs`
+    épocas partindo da população atual (o mealpy reavalia essa população inicial). Otimizadores
+    que terminam com menos agentes (o SA guarda só o atual e o melhor) têm a população
+    completada com os melhores vetores da anterior.
+
+    Args:
+        optimizer_class: Classe do otimizador (não a instância, para ser enviada aos processos)
+        pop_size: Tamanho da população da ilha
+        params: Demais parâmetros do construtor do otimizador
+    """
+
+    def __init__(self, optimizer_class, pop_size=50, **params):
+        self.optimizer_class = optimizer_class
+        self.pop_size = pop_size
+        self.params = params
+
+    def evolve(self, fitness, population, fitnesses, epochs, rng):
+        from mealpy.utils.space import FloatVar
+
+        problem = {
+            "obj_func": fitness,
+            "bounds": [FloatVar(lb=0.0, ub=1.0) for _ in range(population.shape[1])],
+            "minmax": "min",
+            "log_to": None,
+        }
+        model = self.optimizer_class(epoch=epochs, pop_size=self.pop_size, **self.params)
+        model.solve(problem, starting_solutions=list(population), seed=int(rng.integers(2**31)))
+        evolved = np.array([agent.solution for agent in model.pop])
+        evolved_fitnesses = np.array([agent.target.fitness for agent in model.pop], dtype=float)
+        missing = self.pop_size - len(evolved)
+        if missing > 0:
+            kept = np.argsort(fitnesses, kind="stable")[:missing]
+            evolved = np.vstack((evolved, population[kept]))
+            evolved_fitnesses = np.concatenate((evolved_fitnesses, fitnesses[kept]))
+        return evolved, evolved_fitnesses
+
+
+def evaluate(fitness, population):
+    """Fitness de cada linha da população."""
+    return np.array([fitness(solution)[0] for solution in population], dtype=float)
+
+
+class MigrationBuffer:
+    """
+    Vetores de prioridade da elite de cada ilha em memória compartilhada: um slot
+    (migrants x n_ops) com os respectivos fitness por ilha, protegido por um lock.
+    Slots ainda não escritos têm fitness +inf.
+    """
+
+    def __init__(self, islands, migrants, num_operations, name=None):
+        self.shape = (islands, migrants, num_operations)
+        size = 8 * islands * migrants * (num_operations + 1)
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.solutions = np.ndarray(self.shape, dtype=np.float64, buffer=self.shm.buf)
+        self.fitnesses = np.ndarray(self.shape[:2], dtype=np.float64, buffer=self.shm.buf,
+                                    offset=self.solutions.nbytes)
+        if self.owner:
+            self.fitnesses[:] = np.inf
+
+    def write(self, island, solutions, fitnesses):
+        # Populações menores que o slot (ex.: SA com pop_size=2) deixam o resto vazio
+        self.solutions[island, :len(solutions)] = solutions
+        self.fitnesses[island] = np.inf
+        self.fitnesses[island, :len(fitnesses)] = fitnesses
+
+    def read(self, island):
+        return self.solutions[island].copy(), self.fitnesses[island].copy()
+
+    def close(self):
+        # As views precisam sair antes de fechar o segmento
+        del self.solutions, self.fitnesses
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _run_island(index, instance_json, engine, epochs, migration_interval, buffer_args, locks, seed):
+    """Processo de uma ilha: evolui, publica a elite e recebe a elite da ilha anterior (anel)."""
+    instance = jssp(instance_json)
+    fitness = make_fitness_function(instance)
+    buffer = MigrationBuffer(*buffer_args)
+    islands, migrants = buffer.shape[:2]
+    rng = np.random.default_rng(seed)
+    try:
+        population = rng.random((engine.pop_size, instance.num_operations))
+        fitnesses = evaluate(fitness, population)
+        done = 0
+        while done < epochs:
+            step = min(migration_interval, epochs - done)
+            population, fitnesses = engine.evolve(fitness, population, fitnesses, step, rng)
+            done += step
+
+            best = np.argsort(fitnesses, kind="stable")[:migrants]
+            with locks[index]:
+                buffer.write(index, population[best], fitnesses[best])
+            if done >= epochs or islands == 1:
+                break
+
+            # Imigrantes substituem os piores; slots vazios (+inf) são ignorados
+            source = (index - 1) % islands
+            with locks[source]:
+                immigrants, immigrant_fitnesses = buffer.read(source)
+            arrived = np.flatnonzero(np.isfinite(immigrant_fitnesses))[:len(fitnesses)]
+            worst = np.argsort(fitnesses, kind="stable")[::-1][:len(arrived)]
+            population[worst] = immigrants[arrived]
+            fitnesses[worst] = immigrant_fitnesses[arrived]
+    finally:
+        buffer.close()
+
+
+def island_search(instance_json, engines, epochs=1000, migration_interval=50, migrants=2, seed=0):
+    """
+    Modelo de ilhas: uma população por processo, todas sobre a mesma instância, trocando os
+    `migrants` melhores vetores de prioridade em anel a cada `migration_interval` épocas por
+    memória compartilhada. As ilhas migram de forma assíncrona (cada uma lê o último slot
+    publicado pela anterior), então ilhas mais lentas não seguram as demais.
+
+    Args:
+        instance_json: Instância no formato dos casos de teste (dados do jssp)
+        engines: Um motor por ilha (BRKGA, MealpyEngine ou qualquer objeto com pop_size e
+            evolve(fitness, population, fitnesses, epochs, rng) -> (population, fitnesses));
+            motores diferentes podem ser misturados
+        epochs: Épocas por ilha
+        migration_interval: Épocas entre migrações
+        migrants: Vetores trocados por migração
+        seed: Semente; cada ilha recebe uma sequência independente derivada dela
+
+    Returns:
+        Dict com best_solution, best_fitness e o melhor fitness de cada ilha (island_best)
+    """
+    num_operations = jssp(instance_json).num_operations
+    islands = len(engines)
+    buffer = MigrationBuffer(islands, migrants, num_operations)
+    locks = [mp.Lock() for _ in range(islands)]
+    seeds = np.random.SeedSequence(seed).spawn(islands)
+    buffer_args = (islands, migrants, num_operations, buffer.shm.name)
+    try:
+        processes = [
+            mp.Process(target=_run_island,
+                       args=(i, instance_json, engine, epochs, migration_interval, buffer_args, locks, seeds[i]))
+            for i, engine in enumerate(engines)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        failed = [i for i, process in enumerate(processes) if process.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"Ilhas {failed} terminaram com erro.")
+
+        # Cada ilha publica sua elite ordenada ao final, então o slot guarda o melhor dela
+        island_best = buffer.fitnesses[:, 0].copy()
+        best = int(np.argmin(island_best))
+        return {
+            "best_solution": buffer.solutions[best, 0].copy(),
+            "best_fitness": float(island_best[best]),
+            "island_best": island_best.tolist(),
+        }
+    finally:
+        buffer.close()
@@ -0,0 +1,150 @@
+import random
+import time
+from collections import defaultdict
+
+from ortools.sat.python import cp_model
+
+from get_makespan import build_fjsp_model, extract_schedule, add_schedule_hints, solve_instance
+
+
+NEIGHBORHOODS = ("time_window", "jobs", "bottleneck")
+
+
+def resource_sequences(schedule):
+    """
+    Operations of a schedule grouped by machine and by equipment, in start order.
+    """
+    sequences = defaultdict(list)
+    for entry in sorted(schedule, key=lambda entry: entry["start"]):
+        key = (entry["job"], entry["operation"])
+        if entry["machine"] is not None:
+            sequences[("machine", entry["machine"])].append(key)
+        if entry["equipment"] is not None:
+            sequences[("equipment", entry["equipment"])].append(key)
+    return sequences
+
+
+def choose_neighborhood(kind, schedule, size, rng):
+    """
+    Pick the set of (job, operation) keys to re-optimize.
+    time_window: operations overlapping a random time window.
+    jobs: all operations of random jobs.
+    bottleneck: all operations on one machine/equipment, drawn with probability proportional to its load
+    (uniformly when every load is zero).
+    """
+    by_key = {(entry["job"], entry["operation"]): entry for entry in schedule}
+
+    if kind == "time_window":
+        by_start = sorted(schedule, key=lambda entry: entry["start"])
+        first = rng.randrange(max(len(by_start) - size, 0) + 1)
+        window_start = by_start[first]["start"]
+        window_end = by_start[min(first + size, len(by_start)) - 1]["end"]
+        return {key for key, entry in by_key.items()
+                if entry["start"] < window_end and entry["end"] > window_start}
+
+    if kind == "jobs":
+        job_ids = sorted({entry["job"] for entry in schedule})
+        rng.shuffle(job_ids)
+        relaxed = set()
+        for job_id in job_ids:
+            relaxed.update(key for key in by_key if key[0] == job_id)
+            if len(relaxed) >= size:
+                break
+        return relaxed
+
+    if kind == "bottleneck":
+        sequences = list(resource_sequences(schedule).values())
+        if not sequences:
+            return set()
+        loads = [sum(by_key[key]["duration"] for key in keys) for keys in sequences]
+        # random.choices rejects weights that sum to zero (only zero-duration operations)
+        return set(rng.choices(sequences, weights=loads if any(loads) else None)[0])
+
+    raise ValueError(f"Unknown neighborhood: {kind}")
+
+
+def fix_outside_neighborhood(model, task_intervals, schedule, relaxed, equipment_pools=None):
+    """
+    Keep the incumbent's resource assignment and per-resource order for every operation outside
+    the neighborhood; those operations may still shift left. Operations in the neighborhood are free.
+    Equipment pools run several operations at once, so they keep the assignment but no order.
+    """
+    by_key = {(entry["job"], entry["operation"]): entry for entry in schedule}
+
+    for key, entry in by_key.items():
+        if key in relaxed:
+            continue
+        _, _, machine_interval_vars, equipment_interval_vars, _ = task_intervals[key]
+        for (resource, _, is_present), selected in (
+            [(variables, entry["machine"]) for variables in machine_interval_vars]
+            + [(variables, entry["equipment"]) for variables in equipment_interval_vars]
+        ):
+            if is_present is not True:
+                model.Add(is_present == int(resource == selected))
+
+    for (kind, resource), keys in resource_sequences(schedule).items():
+        if kind == "equipment" and resource in (equipment_pools or {}):
+            continue
+        kept = [key for key in keys if key not in relaxed]
+        for previous, following in zip(kept, kept[1:]):
+            model.Add(task_intervals[following][0] >= task_intervals[previous][1])
+
+
+def lns_solve(instance_json, time_budget=60.0, sub_time_limit=2.0, relax_fraction=0.2,
+              initial_schedule=None, num_workers=None, seed=0):
+    """
+    Large neighborhood search around solve_fjsp_with_equipment's model.
+    The model skeleton is built once; each iteration clones it, fixes everything outside a
+    neighborhood (time window, subset of jobs or a bottleneck resource) and re-optimizes with a
+    short CP-SAT sub-solve. Returns the same dict as solve_instance, or None without a first solution.
+    """
+    deadline = time.time() + time_budget
+    rng = random.Random(seed)
+
+    if initial_schedule is None:
+        first = solve_instance(instance_json, min(sub_time_limit, time_budget), num_workers)
+        if first is None:
+            return None
+        incumbent, bound = first["schedule"], first["bound"]
+    else:
+        incumbent, bound = initial_schedule, 0
+    best = max(entry["end"] for entry in incumbent) if incumbent else 0
+
+    skeleton, task_intervals, makespan = build_fjsp_model(instance_json, symmetry_breaking=False)
+    solver = cp_model.CpSolver()
+    if num_workers is not None:
+        solver.parameters.num_workers = num_workers
+
+    iterations = 0
+    while time.time() < deadline and best > bound:
+        size = max(1, int(relax_fraction * len(incumbent)))
+        kind = NEIGHBORHOODS[iterations % len(NEIGHBORHOODS)]
+        relaxed = choose_neighborhood(kind, incumbent, size, rng)
+        iterations += 1
+
+        model = skeleton.Clone()
+        fix_outside_neighborhood(model, task_intervals, incumbent, relaxed, instance_json.get("equipment_pools"))
+        model.Add(makespan <= int(best))
+        add_schedule_hints(model, task_intervals, incumbent)
+
+        solver.parameters.max_time_in_seconds = max(min(sub_time_limit, deadline - time.time()), 0.01)
+        status = solver.Solve(model)
+
+        if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+            # Equal-makespan moves are accepted too, so the search keeps drifting
+            incumbent = extract_schedule(solver, instance_json["jobs"], task_intervals)
+            best = solver.ObjectiveValue()
+
+        # Grow neighborhoods that were exhausted, shrink the ones that timed out
+        if status == cp_model.OPTIMAL or status == cp_model.INFEASIBLE:
+            relax_fraction = min(relax_fraction * 1.1, 1.0)
+        elif status == cp_model.UNKNOWN or status == cp_model.FEASIBLE:
+            relax_fraction = max(relax_fraction * 0.9, 0.02)
+
+    return {
+        "objective": best,
+        "bound": bound,
+        "status": "OPTIMAL" if best <= bound else "FEASIBLE",
+        "schedule": incumbent,
+        "iterations": iterations,
+    }
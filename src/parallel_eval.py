@@ -0,0 +1,150 @@
+import math
+import multiprocessing as mp
+import os
+import queue
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from classes.jssp import jssp
+from decoder import make_fitness_function
+
+
+def _share(shape, name=None):
+    """Matriz float64 em memória compartilhada (cria o segmento se name for None)."""
+    size = 8 * max(1, math.prod(shape))
+    shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+    return shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+
+def _evaluation_worker(instance_json, population_name, fitness_name, shape, cutoff, tasks, done):
+    """
+    Worker persistente: compila a instância uma vez e avalia as fatias (lo, hi) que chegam
+    pela fila direto na memória compartilhada, até receber None.
+    """
+    fitness = make_fitness_function(jssp(instance_json), cutoff=cutoff)
+    population_shm, population = _share(shape, population_name)
+    fitness_shm, fitnesses = _share(shape[:1], fitness_name)
+    try:
+        while (task := tasks.get()) is not None:
+            lo, hi = task
+            try:
+                for row in range(lo, hi):
+                    fitnesses[row] = fitness(population[row])[0]
+                done.put(None)
+            except Exception as error:
+                done.put(error)
+    finally:
+        del population, fitnesses
+        population_shm.close()
+        fitness_shm.close()
+
+
+class SharedPopulationEvaluator:
+    """
+    Avaliação paralela de populações sem serialização por geração: a matriz da população
+    e o vetor de fitness ficam em memória compartilhada e workers persistentes avaliam
+    fatias no lugar. Só índices (lo, hi) trafegam pelas filas; a instância vai uma única
+    vez para cada worker, na criação.
+
+    Quem gera a população pode escrevê-la direto em `population` (sem cópia) e chamar
+    evaluate(n) para avaliar as n primeiras linhas.
+
+    Args:
+        instance_json: Instância no formato dos casos de teste
+        capacity: Máximo de linhas por avaliação
+        workers: Número de processos (padrão: os.cpu_count())
+        cutoff: Repassado a make_fitness_function; com "incumbent" cada worker mantém o seu
+        chunks_per_worker: Fatias por worker em cada avaliação (balanceia custos desiguais)
+        poll_interval: Segundos de espera por uma resposta antes de conferir se algum worker morreu
+    """
+
+    def __init__(self, instance_json, capacity, workers=None, cutoff=None, chunks_per_worker=4, poll_interval=1.0):
+        self.num_operations = jssp(instance_json).num_operations
+        self.capacity = capacity
+        self.workers = workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+        self.poll_interval = poll_interval
+        shape = (capacity, self.num_operations)
+        self._population_shm, self.population = _share(shape)
+        self._fitness_shm, self.fitnesses = _share(shape[:1])
+        self._tasks = mp.Queue()
+        self._done = mp.Queue()
+        self._processes = [
+            mp.Process(target=_evaluation_worker, daemon=True,
+                       args=(instance_json, self._population_shm.name, self._fitness_shm.name, shape,
+                             cutoff, self._tasks, self._done))
+            for _ in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+
+    def evaluate(self, population=None):
+        """
+        Fitness de cada linha da população.
+
+        Args:
+            population: Matriz (n, n_ops) copiada para o buffer compartilhado, ou o número n
+                de linhas já escritas em `population`; None avalia o buffer inteiro
+
+        Returns:
+            Vetor (n,) com os fitness (cópia)
+        """
+        if population is None:
+            n = self.capacity
+        elif isinstance(population, (int, np.integer)):
+            n = int(population)
+        else:
+            population = np.asarray(population, dtype=np.float64)
+            n = len(population)
+            if n > self.capacity or population.shape[1:] != (self.num_operations,):
+                raise ValueError(
+                    f"População {population.shape} não cabe no buffer ({self.capacity}, {self.num_operations})."
+                )
+            self.population[:n] = population
+
+        chunk = max(1, math.ceil(n / (self.workers * self.chunks_per_worker)))
+        slices = [(lo, min(lo + chunk, n)) for lo in range(0, n, chunk)]
+        for task in slices:
+            self._tasks.put(task)
+
+        # Cada fatia responde uma vez (None ou a exceção), então as filas ficam vazias para a próxima
+        # chamada. Um worker morto (OOM, sinal) nunca responde a fatia que pegou: sem resposta dentro
+        # de poll_interval, confere se algum saiu em vez de esperar para sempre
+        errors = []
+        pending = len(slices)
+        while pending:
+            try:
+                error = self._done.get(timeout=self.poll_interval)
+            except queue.Empty:
+                dead = [process for process in self._processes if not process.is_alive()]
+                if dead:
+                    raise RuntimeError(
+                        f"Worker {dead[0].pid} terminou durante a avaliação (exitcode {dead[0].exitcode})."
+                    ) from None
+                continue
+            pending -= 1
+            if error is not None:
+                errors.append(error)
+        if errors:
+            raise errors[0]
+        return self.fitnesses[:n].copy()
+
+    def __call__(self, population):
+        return self.evaluate(population)
+
+    def close(self):
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join()
+        del self.population, self.fitnesses
+        for shm in (self._population_shm, self._fitness_shm):
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,39 @@
+import numpy as np
+from classes.jssp import jssp
+
+
+def repair_priorities(keys, instance: jssp):
+    """
+    Ajusta vetores de prioridade para respeitar a ordem das operações de cada job.
+
+    A prioridade de cada operação passa a ser o máximo acumulado das prioridades
+    das operações anteriores do mesmo job (máximo acumulado segmentado pelos
+    offsets de job_offsets). Funciona sobre um vetor ou sobre uma população inteira.
+
+    Args:
+        keys: Vetor (n_ops,) ou matriz (pop_size, n_ops) de prioridades
+        instance: Instância do problema JSSP
+
+    Returns:
+        Tupla (prioridades ajustadas, ordem global das operações)
+    """
+    keys = np.asarray(keys, dtype=float)
+    population = np.atleast_2d(keys)
+    if population.shape[1] != instance.num_operations:
+        raise ValueError(
+            f"Tamanho do vetor ({population.shape[1]}) diferente do numero de operacoes ({instance.num_operations})."
+        )
+
+    # Desloca cada segmento para uma faixa própria, de modo que o máximo
+    # acumulado da linha inteira nunca "vaze" de um job para o seguinte
+    low = population.min(axis=1, keepdims=True)
+    span = population.max(axis=1, keepdims=True) - low + 1.0
+    shift = instance.op_job * span
+    repaired = np.maximum.accumulate(population - low + shift, axis=1) - shift + low
+
+    # Empates dentro do job são resolvidos pelo índice (argsort estável)
+    order = np.argsort(repaired, axis=1, kind="stable")
+
+    if keys.ndim == 1:
+        return repaired[0], order[0]
+    return repaired, order
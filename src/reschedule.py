@@ -0,0 +1,148 @@
+import math
+
+from ortools.sat.python import cp_model
+
+from classes.machine_calendar import MachineCalendar, build_calendars
+from decoder import PoolTimeline
+from get_makespan import build_fjsp_model, extract_schedule, add_schedule_hints
+from lns import fix_outside_neighborhood
+
+
+def merge_downtimes(machine_downtimes, new_downtimes):
+    """
+    Add new downtime points ({machine: [points]}) to a machine_downtimes dict, returning a new dict.
+    """
+    merged = {m: list(points) for m, points in machine_downtimes.items()}
+    for m, points in new_downtimes.items():
+        merged[m] = sorted(set(merged.get(m, [])) | set(points))
+    return merged
+
+
+def machine_availability(machine_downtimes, machine_calendars=None):
+    """
+    One MachineCalendar per machine with downtime points or a calendar (points are merged in).
+    """
+    availability = {m: MachineCalendar(points=points) for m, points in machine_downtimes.items()}
+    availability.update(build_calendars(machine_calendars, machine_downtimes))
+    return availability
+
+
+def is_frozen(entry, availability, current_time):
+    """
+    An operation is frozen once it has started, unless a downtime now interrupts it; interrupted
+    operations are not resumed but restarted from scratch (no preemption, as in the CP-SAT model).
+    Finished operations are always frozen: a downtime reported inside their past interval changes nothing.
+    """
+    if entry["start"] >= current_time:
+        return False
+    if entry["end"] <= current_time:
+        return True
+    if entry["machine"] not in availability or entry["end"] <= entry["start"]:
+        return True
+    blocked = availability[entry["machine"]].next_blocked(entry["start"])
+    return blocked is None or blocked[0] >= entry["end"]
+
+
+def right_shift_repair(schedule, machine_downtimes, current_time, machine_calendars=None, equipment_pools=None):
+    """
+    Repair a schedule after a downtime change without re-solving. Started operations are frozen
+    (see is_frozen). The others keep their machine, equipment and relative order and are shifted
+    right just enough to respect precedence, resource availability (pool capacities included),
+    current_time, the downtimes and the machine calendars.
+    Times are integers, so a fractional current_time is rounded up.
+    """
+    current_time = math.ceil(current_time)
+    availability = machine_availability(machine_downtimes, machine_calendars)
+    job_ready, machine_ready, equipment_ready = {}, {}, {}
+    pools = {e: PoolTimeline(capacity) for e, capacity in (equipment_pools or {}).items()}
+    repaired = []
+
+    # Frozen operations are replayed first so the resource timelines start from what already ran
+    frozen = {id(entry) for entry in schedule if is_frozen(entry, availability, current_time)}
+    for entry in sorted(schedule, key=lambda entry: (id(entry) not in frozen, entry["start"], entry["end"])):
+        job, machine, equipment = entry["job"], entry["machine"], entry["equipment"]
+        if equipment in pools:
+            ready = pools[equipment].ready()
+        else:
+            ready = equipment_ready.get(equipment, 0)
+
+        if id(entry) in frozen:
+            new_entry = dict(entry)
+        else:
+            earliest = max(entry["start"], current_time, job_ready.get(job, 0), machine_ready.get(machine, 0), ready)
+            if machine in availability:
+                earliest = availability[machine].next_available(earliest, entry["duration"])
+            new_entry = dict(entry, start=earliest, end=earliest + entry["duration"])
+
+        job_ready[job] = new_entry["end"]
+        if machine is not None:
+            machine_ready[machine] = max(machine_ready.get(machine, 0), new_entry["end"])
+        if equipment in pools:
+            pools[equipment].assign(new_entry["start"], new_entry["end"])
+        elif equipment is not None:
+            equipment_ready[equipment] = max(equipment_ready.get(equipment, 0), new_entry["end"])
+        repaired.append(new_entry)
+
+    repaired.sort(key=lambda entry: (entry["job"], entry["operation"]))
+    return repaired
+
+
+def improve_schedule(instance_json, schedule, current_time, time_limit=2.0, num_workers=None):
+    """
+    Time-limited partial re-solve: frozen operations keep their start, machine and equipment,
+    the rest may be re-sequenced and re-assigned from current_time on, warm-started from `schedule`.
+    Returns (objective, schedule) or None if nothing was found within the limit.
+    """
+    current_time = math.ceil(current_time)  # CP-SAT only takes integer bounds
+    makespan_bound = max(entry["end"] for entry in schedule)
+    # Past downtime points only matter to operations running at current_time, and those are
+    # restarted after it; keeping them would make finished operations that overlap them infeasible
+    machine_downtimes = {m: [point for point in points if point >= current_time]
+                         for m, points in instance_json.get("machine_downtimes", {}).items()}
+    instance = dict(instance_json, machine_downtimes=machine_downtimes,
+                    timespan=max(instance_json.get("timespan", 0), makespan_bound))
+
+    # Frozen operations break the symmetry between identical jobs/resources
+    model, task_intervals, makespan = build_fjsp_model(instance, symmetry_breaking=False)
+    availability = machine_availability(instance_json.get("machine_downtimes", {}), instance.get("machine_calendars"))
+    frozen = {(entry["job"], entry["operation"]): entry for entry in schedule
+              if is_frozen(entry, availability, current_time)}
+    relaxed = {(entry["job"], entry["operation"]) for entry in schedule} - frozen.keys()
+
+    fix_outside_neighborhood(model, task_intervals, schedule, relaxed, instance.get("equipment_pools"))
+    for key, (start_var, _, _, _, _) in task_intervals.items():
+        if key in frozen:
+            model.Add(start_var == frozen[key]["start"])
+        else:
+            model.Add(start_var >= current_time)
+    model.Add(makespan <= makespan_bound)
+    add_schedule_hints(model, task_intervals, schedule)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    if num_workers is not None:
+        solver.parameters.num_workers = num_workers
+    status = solver.Solve(model)
+    if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+        return None
+    return solver.ObjectiveValue(), extract_schedule(solver, instance["jobs"], task_intervals)
+
+
+def reschedule(instance_json, schedule, current_time, new_downtimes, improve_time_limit=None, num_workers=None):
+    """
+    React to new machine downtimes while a schedule is executing.
+    Returns (updated instance, repaired schedule) immediately from the right-shift repair, or the
+    improved schedule when improve_time_limit (seconds) is given and the re-solve finds a better one.
+    """
+    machine_downtimes = merge_downtimes(instance_json.get("machine_downtimes", {}), new_downtimes)
+    instance = dict(instance_json, machine_downtimes=machine_downtimes)
+
+    repaired = right_shift_repair(schedule, machine_downtimes, current_time,
+                                  instance.get("machine_calendars"), instance.get("equipment_pools"))
+    if improve_time_limit is None:
+        return instance, repaired
+
+    improved = improve_schedule(instance, repaired, current_time, improve_time_limit, num_workers)
+    if improved is not None and improved[0] < max(entry["end"] for entry in repaired):
+        return instance, improved[1]
+    return instance, repaired
@@ -0,0 +1,260 @@
+import csv
+import json
+import math
+import os
+from collections import defaultdict
+
+
+class QuantileSketch:
+    """
+    Histograma com baldes logarítmicos (precisão relativa `alpha`), pequeno e combinável.
+    Valores <= 0 ficam num balde próprio.
+    """
+
+    def __init__(self, alpha=0.01):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.buckets = defaultdict(int)
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+        else:
+            self.buckets[math.ceil(math.log(value, self.gamma))] += 1
+
+    def _value_at(self, k):
+        """Representante do k-ésimo menor valor: 0 ou o centro (erro relativo <= alpha) do seu balde."""
+        seen = self.zero_count
+        if k < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if k < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def quantile(self, q):
+        """
+        Valor aproximado do quantil q em [0, 1] (None se vazio), interpolado linearmente entre
+        as duas estatísticas de ordem vizinhas como np.quantile. Cada uma tem erro relativo
+        <= alpha, logo o resultado também fica a no máximo alpha do np.quantile para valores > 0.
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        low = math.floor(rank)
+        value = self._value_at(low)
+        if rank > low:
+            value += (rank - low) * (self._value_at(low + 1) - value)
+        return value
+
+    def merge(self, other):
+        for key, count in other.buckets.items():
+            self.buckets[key] += count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def to_dict(self):
+        return {"alpha": self.alpha, "zero": self.zero_count, "buckets": {str(k): v for k, v in self.buckets.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["alpha"])
+        sketch.zero_count = data["zero"]
+        for key, count in data["buckets"].items():
+            sketch.buckets[int(key)] = count
+        sketch.count = sketch.zero_count + sum(sketch.buckets.values())
+        return sketch
+
+
+class RunningStats:
+    """Contagem, média e variância de Welford, mínimo, máximo e sketch de quantis."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch()
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.sketch.add(value)
+
+    @property
+    def std(self):
+        """Desvio padrão amostral (ddof=1, como o pandas)."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+
+    def merge(self, other):
+        """Combina duas estatísticas (fórmula de Chan et al.)."""
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def to_dict(self):
+        return {"count": self.count, "mean": self.mean, "m2": self.m2, "min": self.min, "max": self.max,
+                "sketch": self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count, stats.mean, stats.m2 = data["count"], data["mean"], data["m2"]
+        stats.min, stats.max = data["min"], data["max"]
+        stats.sketch = QuantileSketch.from_dict(data["sketch"])
+        return stats
+
+
+class GroupStats:
+    """Estatísticas de um grupo (teste, metaheurística): fitness, tempo e taxa de acerto."""
+
+    def __init__(self):
+        self.fitness = RunningStats()
+        self.execution_time = RunningStats()
+        self.hits = 0
+        self.valid_timespan = 0
+        self.timespan_ref = None
+
+    def add(self, fitness, execution_time, timespan):
+        self.fitness.add(fitness)
+        self.execution_time.add(execution_time)
+        if timespan is not None and timespan > 0:
+            self.timespan_ref = timespan
+            self.valid_timespan += 1
+            self.hits += int(fitness <= timespan)
+
+    def merge(self, other):
+        self.fitness.merge(other.fitness)
+        self.execution_time.merge(other.execution_time)
+        self.hits += other.hits
+        self.valid_timespan += other.valid_timespan
+        self.timespan_ref = self.timespan_ref if self.timespan_ref is not None else other.timespan_ref
+        return self
+
+    def to_row(self):
+        """Mesmas métricas das tabelas de threatData.ipynb."""
+        return {
+            "execucoes": self.fitness.count,
+            "tempo_medio": self.execution_time.mean,
+            "tempo_mediano": self.execution_time.sketch.quantile(0.5),
+            "tempo_desvio": self.execution_time.std,
+            "fitness_medio": self.fitness.mean,
+            "fitness_desvio": self.fitness.std,
+            "fitness_min": self.fitness.min,
+            "fitness_p95": self.fitness.sketch.quantile(0.95),
+            "taxa_acerto_makespan_pct": 100 * self.hits / self.valid_timespan if self.valid_timespan else math.nan,
+            "timespan_ref": self.timespan_ref,
+        }
+
+    def to_dict(self):
+        return {"fitness": self.fitness.to_dict(), "execution_time": self.execution_time.to_dict(),
+                "hits": self.hits, "valid_timespan": self.valid_timespan, "timespan_ref": self.timespan_ref}
+
+    @classmethod
+    def from_dict(cls, data):
+        group = cls()
+        group.fitness = RunningStats.from_dict(data["fitness"])
+        group.execution_time = RunningStats.from_dict(data["execution_time"])
+        group.hits, group.valid_timespan, group.timespan_ref = data["hits"], data["valid_timespan"], data["timespan_ref"]
+        return group
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ResultsSummary:
+    """
+    Resumo incremental de all_metaheuristics_results.csv por (teste, metaheurística),
+    atualizado a cada execução e persistido em JSON ao lado do CSV.
+    """
+
+    def __init__(self):
+        self.groups = defaultdict(GroupStats)
+
+    def update(self, test_name, metaheuristic_type, fitness, execution_time, timespan):
+        fitness, execution_time = _to_float(fitness), _to_float(execution_time)
+        if fitness is None or execution_time is None:
+            return
+        self.groups[(test_name, metaheuristic_type)].add(fitness, execution_time, _to_float(timespan))
+
+    def update_rows(self, rows):
+        """Atualiza a partir de linhas no formato do CSV consolidado."""
+        for row in rows:
+            self.update(row["test_name"], row["metaheuristic_type"], row["fitness"], row["execution_time"], row["timespan"])
+        return self
+
+    def _rows(self, key_names, key_fn):
+        merged = defaultdict(GroupStats)
+        for key, group in self.groups.items():
+            merged[key_fn(key)].merge(group)
+        return [dict(zip(key_names, key), **group.to_row()) for key, group in sorted(merged.items())]
+
+    def by_test_and_algorithm(self):
+        return self._rows(("test_name", "metaheuristic_type"), lambda key: key)
+
+    def by_algorithm(self):
+        return self._rows(("metaheuristic_type",), lambda key: (key[1],))
+
+    def by_test(self):
+        return self._rows(("test_name",), lambda key: (key[0],))
+
+    def save(self, filename):
+        data = [{"test_name": t, "metaheuristic_type": m, **group.to_dict()} for (t, m), group in self.groups.items()]
+        tmp_filename = filename + ".tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_filename, filename)
+        return filename
+
+    @classmethod
+    def load(cls, filename):
+        summary = cls()
+        if os.path.exists(filename):
+            with open(filename, encoding="utf-8") as f:
+                for item in json.load(f):
+                    summary.groups[(item["test_name"], item["metaheuristic_type"])] = GroupStats.from_dict(item)
+        return summary
+
+    @classmethod
+    def from_csv(cls, csv_filename):
+        """Reconstrói o resumo a partir do CSV completo (uma única vez)."""
+        with open(csv_filename, newline="", encoding="utf-8") as f:
+            return cls().update_rows(csv.DictReader(f))
+
+
+def update_summary_file(rows, filename="all_metaheuristics_summary.json"):
+    """
+    Carrega o resumo persistido, acrescenta as novas execuções e salva.
+
+    Args:
+        rows: Linhas recém-gravadas no CSV consolidado
+        filename: Arquivo JSON do resumo
+
+    Returns:
+        ResultsSummary atualizado
+    """
+    summary = ResultsSummary.load(filename).update_rows(rows)
+    summary.save(filename)
+    return summary
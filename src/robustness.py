@@ -0,0 +1,128 @@
+import numpy as np
+
+
+def sample_breakdowns(rng, scenarios, num_machines, horizon, breakdowns_per_machine, breakdown_prob, mean_repair_time):
+    """
+    Random breakdown windows per (scenario, machine): `breakdowns_per_machine` candidate events,
+    each happening with probability breakdown_prob at a uniform time in [0, horizon) and lasting
+    an exponential repair time (at least 1). Events that do not happen start at +inf.
+
+    Returns:
+        Tuple (starts, ends) of shape scenarios x machines x breakdowns_per_machine
+    """
+    shape = (scenarios, num_machines, breakdowns_per_machine)
+    starts = rng.integers(0, max(int(horizon), 1), size=shape).astype(float)
+    ends = starts + np.maximum(1, np.ceil(rng.exponential(mean_repair_time, size=shape)))
+    happens = rng.random(shape) < breakdown_prob
+    return np.where(happens, starts, np.inf), np.where(happens, ends, np.inf)
+
+
+def entry_equipment(entry):
+    """Equipment ids used by a schedule entry: "equipment" may be None, one id or a list of ids."""
+    equipment = entry.get("equipment")
+    if equipment is None:
+        return []
+    return list(equipment) if isinstance(equipment, (list, tuple)) else [equipment]
+
+
+def simulate_robustness(schedule, machine_downtimes=None, scenarios=1000, breakdowns_per_machine=2,
+                        breakdown_prob=0.5, mean_repair_time=5.0, duration_noise=0.1, horizon=None, seed=0,
+                        equipment_pools=None):
+    """
+    Makespan distribution of a fixed schedule (per-resource sequence and assignments) under random
+    machine breakdowns and duration perturbations. Every operation starts as soon as its job
+    predecessor and the previous operations on its machine and equipment are done and no downtime
+    (planned or sampled) falls inside it. The simulation walks the operations once, in planned
+    start order, with every step vectorized across the scenario axis.
+
+    Args:
+        schedule: List of operations as returned by extract_schedule or decode_schedule
+        machine_downtimes: Planned downtimes {machine: [points]}, present in every scenario
+        scenarios: Number of sampled scenarios
+        breakdowns_per_machine, breakdown_prob, mean_repair_time: See sample_breakdowns
+        duration_noise: Durations are scaled by a uniform factor in [1 - noise, 1 + noise]
+        horizon: Window where breakdowns happen (default: the planned makespan)
+        equipment_pools: {pool: capacity}; each use takes one unit of the pool (best fit)
+
+    Returns:
+        Dict with nominal, mean, std, p95 and worst makespan plus the makespans per scenario
+    """
+    rng = np.random.default_rng(seed)
+    machine_downtimes = machine_downtimes or {}
+    ops = sorted(schedule, key=lambda entry: (entry["start"], entry["end"]))
+    nominal = max((entry["end"] for entry in ops), default=0)
+    horizon = nominal if horizon is None else horizon
+
+    job_code = {job: i for i, job in enumerate(dict.fromkeys(entry["job"] for entry in ops))}
+    machines = sorted({entry["machine"] for entry in ops if entry["machine"] is not None})
+    machine_code = {m: i for i, m in enumerate(machines)}
+    equipment_pools = equipment_pools or {}
+    # extract_schedule gives one equipment id (or None), decode_schedule the list of all of them
+    used = [entry_equipment(entry) for entry in ops]
+    equipment_code = {e: i for i, e in enumerate(sorted({e for ids in used for e in ids if e not in equipment_pools}))}
+    pool_units = {e: np.zeros((scenarios, capacity)) for e, capacity in equipment_pools.items()}
+    rows = np.arange(scenarios)
+
+    dt_start, dt_end = sample_breakdowns(rng, scenarios, len(machines), horizon,
+                                         breakdowns_per_machine, breakdown_prob, mean_repair_time)
+    # Planned downtime points become unit windows shared by all scenarios
+    planned = max((len(machine_downtimes.get(m, [])) for m in machines), default=0)
+    if planned:
+        fixed = np.full((len(machines), planned), np.inf)
+        for m, i in machine_code.items():
+            points = sorted(machine_downtimes.get(m, []))
+            fixed[i, :len(points)] = points
+        fixed = np.broadcast_to(fixed, (scenarios,) + fixed.shape)
+        dt_start = np.concatenate((dt_start, fixed), axis=2)
+        dt_end = np.concatenate((dt_end, fixed + 1), axis=2)
+    # Sorted by start, one pass over the windows pushes an operation past every conflict
+    order = np.argsort(dt_start, axis=2)
+    dt_start = np.take_along_axis(dt_start, order, axis=2)
+    dt_end = np.take_along_axis(dt_end, order, axis=2)
+
+    durations = np.array([entry["duration"] for entry in ops], dtype=float)
+    factors = rng.uniform(1 - duration_noise, 1 + duration_noise, size=(scenarios, len(ops)))
+    durations = np.maximum(1, np.rint(durations * factors)) * (durations > 0)
+
+    job_ready = np.zeros((scenarios, len(job_code)))
+    machine_ready = np.zeros((scenarios, len(machines)))
+    equipment_ready = np.zeros((scenarios, len(equipment_code)))
+
+    for k, entry in enumerate(ops):
+        j = job_code[entry["job"]]
+        m = machine_code.get(entry["machine"])
+        unary = [equipment_code[e] for e in used[k] if e in equipment_code]
+        pools = [pool_units[e] for e in used[k] if e in pool_units]
+        duration = durations[:, k]
+
+        start = job_ready[:, j]
+        if m is not None:
+            start = np.maximum(start, machine_ready[:, m])
+        for e in unary:
+            start = np.maximum(start, equipment_ready[:, e])
+        for units in pools:
+            start = np.maximum(start, units.min(axis=1))
+        if m is not None:
+            for w in range(dt_start.shape[2]):
+                conflict = (start < dt_end[:, m, w]) & (start + duration > dt_start[:, m, w])
+                start = np.where(conflict, dt_end[:, m, w], start)
+
+        end = start + duration
+        job_ready[:, j] = end
+        if m is not None:
+            machine_ready[:, m] = end
+        for e in unary:
+            equipment_ready[:, e] = end
+        for units in pools:
+            free = np.where(units <= start[:, None], units, -np.inf)
+            units[rows, free.argmax(axis=1)] = end
+
+    makespans = job_ready.max(axis=1) if len(job_code) else np.zeros(scenarios)
+    return {
+        "nominal": nominal,
+        "mean": float(makespans.mean()),
+        "std": float(makespans.std()),
+        "p95": float(np.percentile(makespans, 95)),
+        "worst": float(makespans.max()),
+        "makespans": makespans,
+    }
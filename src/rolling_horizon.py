@@ -0,0 +1,157 @@
+from ortools.sat.python import cp_model
+
+from classes.machine_calendar import build_calendars
+from decoder import find_earliest_available_time
+from get_makespan import build_fjsp_model, extract_schedule, add_schedule_hints
+
+
+def next_window(jobs_data, next_op, job_ready, window_size):
+    """
+    Pick the next window of unscheduled operations by estimated earliest start
+    (job ready time plus the durations of the job's earlier unscheduled operations).
+    The selection is precedence-closed: it is a prefix of every job's remaining operations.
+    """
+    candidates = []
+    for job_id, job_ops in jobs_data.items():
+        estimate = job_ready[job_id]
+        for op_id in range(next_op[job_id], len(job_ops)):
+            candidates.append((estimate, op_id, job_id))
+            estimate += job_ops[op_id][2]
+    candidates.sort()
+
+    window = {}
+    for (_, op_id, job_id) in candidates[:window_size]:
+        window[job_id] = window.get(job_id, 0) + 1
+    return window
+
+
+def build_window_instance(instance_json, window, next_op, job_ready, resource_ready):
+    """
+    Sub-instance for one window: the window operations of each job plus one resource-free tail
+    operation whose duration is the job's remaining work (relaxed future). Downtimes are clipped
+    to the window's time range [earliest, horizon), and "earliest_start" makes build_fjsp_model
+    expand the calendars only within it.
+    """
+    jobs_data = instance_json["jobs"]
+    jobs = {}
+    for job_id, count in window.items():
+        first = next_op[job_id]
+        job_ops = jobs_data[job_id]
+        remaining = sum(duration for (_, _, duration) in job_ops[first + count:])
+        jobs[job_id] = list(job_ops[first:first + count])
+        if remaining:
+            jobs[job_id].append(([], [], remaining))
+
+    earliest = min(job_ready[job_id] for job_id in window)
+    latest = max([earliest] + list(job_ready.values()) + list(resource_ready.values()))
+
+    # Running the window sequentially after `latest` is feasible; simulating that sequence around
+    # the downtimes and calendars gives a horizon that always admits a solution
+    all_downtimes = instance_json.get("machine_downtimes", {})
+    calendars = build_calendars(instance_json.get("machine_calendars", {}), all_downtimes)
+    sorted_downtimes = {m: sorted(points) for m, points in all_downtimes.items()}
+
+    def next_start(m, earliest_start, duration):
+        if m in calendars:
+            return calendars[m].next_available(earliest_start, duration)
+        if m in sorted_downtimes:
+            return find_earliest_available_time(sorted_downtimes[m], earliest_start, duration)
+        return earliest_start
+
+    horizon = latest
+    for job_ops in jobs.values():
+        for (machines, _, duration) in job_ops:
+            horizon = min((next_start(m, horizon, duration) for m in machines), default=horizon) + duration
+
+    machine_downtimes = {
+        m: [point for point in points if earliest <= point < horizon]
+        for m, points in all_downtimes.items()
+    }
+    return {
+        "jobs": jobs,
+        "machine_downtimes": machine_downtimes,
+        "machine_calendars": instance_json.get("machine_calendars", {}),
+        "equipment_pools": instance_json.get("equipment_pools", {}),
+        "earliest_start": earliest,
+        "timespan": horizon,
+    }
+
+
+def rolling_horizon_solve(instance_json, window_size=200, step=None, window_time_limit=5.0, num_workers=None):
+    """
+    Rolling-horizon mode for very long schedules. Each window is built with build_fjsp_model and
+    solved with CP-SAT. Already scheduled operations are frozen and only enter the window model as
+    machine/equipment/job ready times; the first `step` operations of each window (in start order)
+    are frozen, the rest go back to the pool and are re-optimized in the next window.
+    Returns the same dict as solve_instance (bound is None: windows prove nothing globally).
+    """
+    jobs_data = instance_json["jobs"]
+    step = step or window_size
+    next_op = {job_id: 0 for job_id in jobs_data}
+    job_ready = {job_id: 0 for job_id in jobs_data}
+    resource_ready = {}
+    pending = {}
+    schedule = []
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = window_time_limit
+    if num_workers is not None:
+        solver.parameters.num_workers = num_workers
+
+    total_ops = sum(len(job_ops) for job_ops in jobs_data.values())
+    while len(schedule) < total_ops:
+        window = next_window(jobs_data, next_op, job_ready, window_size)
+        sub_instance = build_window_instance(instance_json, window, next_op, job_ready, resource_ready)
+
+        # Ready times make jobs and resources distinguishable, so no symmetry breaking here
+        model, task_intervals, _ = build_fjsp_model(sub_instance, symmetry_breaking=False)
+        for job_id in window:
+            model.Add(task_intervals[(job_id, 0)][0] >= job_ready[job_id])
+        for (job_id, op_id), (start_var, _, machine_interval_vars, equipment_interval_vars, _) in task_intervals.items():
+            for kind, interval_vars in (("machine", machine_interval_vars), ("equipment", equipment_interval_vars)):
+                for (resource, _, is_present) in interval_vars:
+                    ready = resource_ready.get((kind, resource), 0)
+                    if ready:
+                        constraint = model.Add(start_var >= ready)
+                        if is_present is not True:
+                            constraint.OnlyEnforceIf(is_present)
+
+        add_schedule_hints(model, task_intervals, [
+            dict(entry, operation=entry["operation"] - next_op[entry["job"]])
+            for entry in pending.values()
+            if entry["operation"] - next_op[entry["job"]] < window.get(entry["job"], 0)
+        ])
+
+        status = solver.Solve(model)
+        if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+            return None
+
+        solved = [
+            dict(entry, operation=entry["operation"] + next_op[entry["job"]])
+            for entry in extract_schedule(solver, sub_instance["jobs"], task_intervals)
+            if entry["operation"] < window[entry["job"]]
+        ]
+        solved.sort(key=lambda entry: entry["start"])
+
+        # Freeze a start-ordered prefix (precedence-closed), hand the rest to the next window
+        frozen = solved if len(solved) <= step else solved[:step]
+        pending = {(entry["job"], entry["operation"]): entry for entry in solved[len(frozen):]}
+        for entry in frozen:
+            next_op[entry["job"]] += 1
+            job_ready[entry["job"]] = entry["end"]
+            if entry["machine"] is not None:
+                key = ("machine", entry["machine"])
+                resource_ready[key] = max(resource_ready.get(key, 0), entry["end"])
+            if entry["equipment"] is not None:
+                key = ("equipment", entry["equipment"])
+                resource_ready[key] = max(resource_ready.get(key, 0), entry["end"])
+        schedule.extend(frozen)
+
+    order = {job_id: i for i, job_id in enumerate(jobs_data)}
+    schedule.sort(key=lambda entry: (order[entry["job"]], entry["operation"]))
+    return {
+        "objective": max((entry["end"] for entry in schedule), default=0),
+        "bound": None,
+        "status": "FEASIBLE",
+        "schedule": schedule,
+    }
@@ -0,0 +1,98 @@
+import numpy as np
+from ortools.sat.python import cp_model
+
+from classes.jssp import jssp
+from decoder import make_fitness_function
+from get_makespan import build_fjsp_model, add_downtime_constraints, add_symmetry_breaking, extract_schedule
+
+
+class ScenarioModel:
+    """
+    CP-SAT skeleton of an instance without downtimes (variables, assignment, no-overlap, precedence
+    and makespan), built once and cloned per downtime scenario. `horizon` overrides the instance
+    timespan, since downtimes may push the makespan past it.
+    """
+
+    def __init__(self, instance_json, symmetry_breaking=True, horizon=None):
+        self.instance_json = instance_json
+        self.symmetry_breaking = symmetry_breaking
+        base = dict(instance_json, machine_downtimes={})
+        if horizon is not None:
+            base["timespan"] = horizon
+        # Machine symmetry depends on the downtimes, so it is added per scenario
+        self.skeleton, self.task_intervals, self.makespan = build_fjsp_model(base, symmetry_breaking=False)
+
+    def build(self, machine_downtimes):
+        model = self.skeleton.Clone()
+        add_downtime_constraints(model, self.task_intervals, machine_downtimes)
+        if self.symmetry_breaking:
+            add_symmetry_breaking(model, dict(self.instance_json, machine_downtimes=machine_downtimes), self.task_intervals)
+        return model
+
+    def solve(self, machine_downtimes, time_limit=None, num_workers=None):
+        """Same result dict as solve_instance, or None if no solution was found."""
+        model = self.build(machine_downtimes)
+        solver = cp_model.CpSolver()
+        if time_limit is not None:
+            solver.parameters.max_time_in_seconds = time_limit
+        if num_workers is not None:
+            solver.parameters.num_workers = num_workers
+        status = solver.Solve(model)
+        if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+            return None
+        return {
+            "objective": solver.ObjectiveValue(),
+            "bound": solver.BestObjectiveBound(),
+            "status": solver.StatusName(status),
+            "schedule": extract_schedule(solver, self.instance_json["jobs"], self.task_intervals),
+        }
+
+
+def heuristic_scenario_makespans(instance: jssp, scenarios, samples=100, seed=0):
+    """
+    Best decoder fitness per scenario over the same random priority vectors (common random numbers,
+    so differences between scenarios are not sampling noise). The compiled instance is shared and
+    only its downtimes are swapped.
+
+    Returns:
+        Dict scenario name -> best fitness found
+    """
+    keys = np.random.default_rng(seed).random((samples, instance.num_operations))
+    results = {}
+    for name, machine_downtimes in scenarios.items():
+        # Only the minimum matters, so candidates worse than the best so far are cut short
+        fitness = make_fitness_function(instance.with_downtimes(machine_downtimes), cutoff="incumbent")
+        results[name] = min(fitness(solution)[0] for solution in keys)
+    return results
+
+
+def evaluate_scenarios(instance_json, scenarios, shortlist=3, samples=100, time_limit=10.0,
+                       num_workers=None, seed=0):
+    """
+    Compare downtime scenarios for the same job set: every scenario is ranked with the heuristic
+    decoder and the `shortlist` best ones are solved with CP-SAT on a shared model skeleton.
+
+    Args:
+        instance_json: Instance in the solve_fjsp_with_equipment format (its downtimes are ignored)
+        scenarios: Dict scenario name -> machine_downtimes
+        shortlist: Number of scenarios solved exactly
+        samples: Random priority vectors decoded per scenario
+        time_limit: CP-SAT time limit per shortlisted scenario
+
+    Returns:
+        List of dicts (scenario, heuristic, and objective/bound/status/schedule for the shortlisted
+        ones), ordered by heuristic makespan
+    """
+    heuristic = heuristic_scenario_makespans(jssp(instance_json), scenarios, samples, seed)
+    ranked = sorted(scenarios, key=lambda name: heuristic[name])
+
+    results = [{"scenario": name, "heuristic": heuristic[name]} for name in ranked]
+    if shortlist:
+        # Decoder makespans are feasible upper bounds, so they size the shared horizon
+        horizon = max(instance_json.get("timespan", 0), max(row["heuristic"] for row in results[:shortlist]))
+        scenario_model = ScenarioModel(instance_json, horizon=horizon)
+        for row in results[:shortlist]:
+            solved = scenario_model.solve(scenarios[row["scenario"]], time_limit, num_workers)
+            if solved is not None:
+                row.update(solved)
+    return results
@@ -0,0 +1,272 @@
+import csv
+import math
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from classes.jssp import jssp
+from decoder import make_fitness_function
+from get_makespan import solve_instance
+from islands import BRKGA, evaluate
+from lns import lns_solve
+
+
+SOLVERS = ("cp_sat", "lns", "metaheuristic")
+FEATURES = ("num_operations", "flexibility", "equipment_density", "downtime_density", "load_imbalance",
+            "lower_bound_tightness")
+
+
+def lower_bound(instance: jssp):
+    """
+    Makespan lower bound: the longest job, the total work spread over all machines and the work
+    of the operations that can only use one machine or one equipment (equipment work divided by
+    the pool capacity). Equipment lists are alternatives in the CP-SAT model, like machines.
+    """
+    durations = instance.durations
+    job_work = np.add.reduceat(durations, instance.job_offsets[:-1]) if len(instance.jobs) else np.zeros(1)
+    bound = max(int(job_work.max(initial=0)), math.ceil(durations.sum() / max(1, len(instance.machine_ids))))
+
+    single = instance.eligible_machines.sum(axis=1) == 1
+    single_load = durations[single] @ instance.eligible_machines[single]
+    single = instance.eligible_equipment.sum(axis=1) == 1
+    capacities = np.array([instance.equipment_pools.get(int(e), 1) for e in instance.equipment_ids])
+    equipment_load = np.ceil(durations[single] @ instance.eligible_equipment[single] / np.maximum(capacities, 1))
+    return max(bound, int(single_load.max(initial=0)), int(equipment_load.max(initial=0)))
+
+
+def instance_features(instance: jssp):
+    """
+    Size and structure features of an instance:
+        num_operations
+        flexibility: mean fraction of the machines each operation may use
+        equipment_density: mean number of equipment options per operation
+        downtime_density: fraction of machine time blocked within the lower bound horizon
+        load_imbalance: max / mean machine load, with each operation spread evenly over its
+            eligible machines
+        lower_bound_tightness: lower bound / reference timespan (1 = the reference is optimal)
+    """
+    n, num_machines = instance.eligible_machines.shape
+    bound = lower_bound(instance)
+
+    blocked = 0
+    for m in instance.machine_ids.tolist():
+        if m in instance.calendars:
+            blocked += sum(end - start for start, end in instance.calendars[m].windows(bound))
+        else:
+            blocked += sum(1 for point in instance.machine_downtimes.get(m, ()) if 0 <= point < bound)
+
+    counts = instance.eligible_machines.sum(axis=1)
+    load = (instance.durations / np.maximum(counts, 1)) @ instance.eligible_machines
+    return {
+        "num_operations": n,
+        "flexibility": float(counts.mean() / num_machines) if n and num_machines else 0.0,
+        "equipment_density": float(instance.eligible_equipment.sum() / n) if n else 0.0,
+        "downtime_density": blocked / (num_machines * bound) if num_machines and bound else 0.0,
+        "load_imbalance": float(load.max() / load.mean()) if num_machines and load.mean() > 0 else 1.0,
+        "lower_bound_tightness": bound / instance.timespan if instance.timespan else 1.0,
+    }
+
+
+def solve_metaheuristic(instance_json, time_budget, pop_size=50, seed=0):
+    """BRKGA over the priority decoder until the time budget runs out."""
+    deadline = time.time() + time_budget
+    instance = jssp(instance_json)
+    fitness = make_fitness_function(instance)
+    engine = BRKGA(pop_size)
+    rng = np.random.default_rng(seed)
+    population = rng.random((pop_size, instance.num_operations))
+    fitnesses = evaluate(fitness, population)
+    while time.time() < deadline:
+        population, fitnesses = engine.evolve(fitness, population, fitnesses, 1, rng)
+    best = int(np.argmin(fitnesses))
+    return {"objective": float(fitnesses[best]), "solution": population[best], "status": "FEASIBLE"}
+
+
+def run_solver(solver, instance_json, time_budget=None, num_workers=None):
+    """
+    Run one of SOLVERS with a time budget (seconds; None only makes sense for cp_sat).
+    Returns the solver's result dict (objective, status, schedule or solution) or None.
+    """
+    if solver == "cp_sat":
+        return solve_instance(instance_json, time_budget, num_workers)
+    if solver == "lns":
+        return lns_solve(instance_json, time_budget, min(2.0, time_budget / 5), num_workers=num_workers)
+    if solver == "metaheuristic":
+        return solve_metaheuristic(instance_json, time_budget)
+    raise ValueError(f"Unknown solver: {solver}")
+
+
+def _run_row(features, name, solver, instance_json, time_budget, num_workers):
+    started = time.time()
+    result = run_solver(solver, instance_json, time_budget, num_workers)
+    return dict(features, instance=name, solver=solver, time_budget=time_budget,
+                objective=None if result is None else result["objective"], runtime=time.time() - started)
+
+
+def benchmark_history(instances, time_budgets, solvers=SOLVERS, num_workers=None):
+    """
+    Run every solver on every instance for every time budget and record the outcome.
+
+    Args:
+        instances: Dict name -> instance_json
+        time_budgets: Budgets in seconds
+        solvers: Subset of SOLVERS
+
+    Returns:
+        List of history rows (instance, solver, time_budget, objective, runtime and the features)
+    """
+    history = []
+    for name, instance_json in instances.items():
+        features = instance_features(jssp(instance_json))
+        for time_budget in time_budgets:
+            for solver in solvers:
+                history.append(_run_row(features, name, solver, instance_json, time_budget, num_workers))
+    return history
+
+
+def history_from_results(instances, filename="all_metaheuristics_results.csv", compare_with=(), num_workers=None):
+    """
+    History rows from the notebook's consolidated results CSV (solver "metaheuristic", with
+    each run's execution time as its budget), for the test names present in `instances`.
+
+    SolverSelector.fit only learns from instances where at least two solvers ran, so these rows
+    alone train nothing. `compare_with` (e.g. ("cp_sat", "lns")) runs those solvers once per test,
+    with the median execution time of its metaheuristic runs as the budget; otherwise combine the
+    rows with benchmark_history on the same instances.
+    """
+    features = {}
+    budgets = defaultdict(list)
+    history = []
+    with open(filename, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            name = row["test_name"]
+            if name not in instances:
+                continue
+            if name not in features:
+                features[name] = instance_features(jssp(instances[name]))
+            budgets[name].append(float(row["execution_time"]))
+            history.append(dict(features[name], instance=name, solver="metaheuristic",
+                                time_budget=float(row["execution_time"]), objective=float(row["fitness"]),
+                                runtime=float(row["execution_time"])))
+
+    for name, times in budgets.items():
+        for solver in compare_with:
+            history.append(_run_row(features[name], name, solver, instances[name], float(np.median(times)),
+                                    num_workers))
+    return history
+
+
+class SolverSelector:
+    """
+    Picks a solver for an instance from its features and the time budget.
+
+    Instances with at most `exact_operations` operations always go to CP-SAT (they are proven
+    optimal in milliseconds). Otherwise, the `k` most similar benchmarked instances (standardized
+    features) vote: each solver scores its relative gap to the best objective known for each of
+    them, averaged over its runs with a budget no larger than the one available and then over
+    the instances. Only instances where at least two solvers ran within that budget take part,
+    and failed runs count as a gap of `failure_gap`. Without usable history, LNS is chosen when
+    the budget reaches `lns_min_budget` and the metaheuristic otherwise. Above
+    `exact_operations`, CP-SAT and LNS are never run without a time limit.
+    """
+
+    def __init__(self, history=(), k=3, exact_operations=50, lns_min_budget=10.0, failure_gap=1.0):
+        self.k = k
+        self.exact_operations = exact_operations
+        self.lns_min_budget = lns_min_budget
+        self.failure_gap = failure_gap
+        self.fit(history)
+
+    def fit(self, history):
+        self.history = list(history)
+        best = defaultdict(lambda: math.inf)
+        for row in self.history:
+            if row["objective"] is not None:
+                best[row["instance"]] = min(best[row["instance"]], row["objective"])
+
+        self.runs = defaultdict(list)
+        self.instance_features = {}
+        for row in self.history:
+            name = row["instance"]
+            if row["objective"] is None or not math.isfinite(best[name]):
+                gap = self.failure_gap
+            else:
+                gap = row["objective"] / best[name] - 1 if best[name] > 0 else 0.0
+            self.runs[name].append((row["solver"], row["time_budget"], gap))
+            self.instance_features[name] = self._vector(row)
+        # Gaps are relative to the best run on the same instance, so only instances where
+        # solvers were compared with each other say anything about which one to pick
+        self.instance_features = {name: vector for name, vector in self.instance_features.items()
+                                  if len({solver for solver, _, _ in self.runs[name]}) > 1}
+
+        if self.instance_features:
+            matrix = np.array(list(self.instance_features.values()))
+            self.mean, self.scale = matrix.mean(axis=0), matrix.std(axis=0)
+            self.scale[self.scale == 0] = 1.0
+        return self
+
+    @staticmethod
+    def _vector(features):
+        # Sizes vary by orders of magnitude, so the operation count is compared in log scale
+        return np.array([math.log1p(features["num_operations"])] + [features[name] for name in FEATURES[1:]])
+
+    def select(self, features, time_budget=None):
+        if features["num_operations"] <= self.exact_operations:
+            return "cp_sat"
+        if time_budget is None:
+            raise ValueError(
+                f"A time budget is required above {self.exact_operations} operations "
+                f"(instance has {features['num_operations']})."
+            )
+
+        scores = {}
+        if self.instance_features:
+            names = list(self.instance_features)
+            matrix = (np.array([self.instance_features[name] for name in names]) - self.mean) / self.scale
+            target = (self._vector(features) - self.mean) / self.scale
+            gaps = defaultdict(list)
+            voters = 0
+            for i in np.argsort(np.linalg.norm(matrix - target, axis=1), kind="stable").tolist():
+                runs = [(solver, gap) for solver, budget, gap in self.runs[names[i]] if budget <= time_budget]
+                if len({solver for solver, _ in runs}) < 2:
+                    continue
+                # Each instance weighs the same, however many runs it has per solver
+                per_solver = defaultdict(list)
+                for solver, gap in runs:
+                    per_solver[solver].append(gap)
+                for solver, values in per_solver.items():
+                    gaps[solver].append(np.mean(values))
+                voters += 1
+                if voters == self.k:
+                    break
+            scores = {solver: float(np.mean(values)) for solver, values in gaps.items()}
+
+        if not scores:
+            return "lns" if time_budget >= self.lns_min_budget else "metaheuristic"
+        return min(SOLVERS, key=lambda solver: scores.get(solver, math.inf))
+
+
+def solve_auto(instance_json, time_budget=None, selector=None, num_workers=None, fallback_fraction=0.1):
+    """
+    Solve an instance with the solver chosen by `selector` (an untrained SolverSelector by default).
+    When CP-SAT or LNS gets a budget, `fallback_fraction` of it is kept for the metaheuristic in
+    case they find no first solution, so a bounded call always returns a result.
+    Returns the solver's result dict with the "solver" that produced it and the "features", or None.
+    """
+    selector = selector or SolverSelector()
+    features = instance_features(jssp(instance_json))
+    solver = selector.select(features, time_budget)
+
+    if time_budget is None or solver == "metaheuristic":
+        result = run_solver(solver, instance_json, time_budget, num_workers)
+    else:
+        started = time.time()
+        result = run_solver(solver, instance_json, time_budget * (1 - fallback_fraction), num_workers)
+        if result is None:
+            solver = "metaheuristic"
+            result = solve_metaheuristic(instance_json, max(time_budget - (time.time() - started), 0.0))
+
+    if result is not None:
+        result.update(solver=solver, features=features)
+    return result
@@ -0,0 +1,180 @@
+"""
+Codificação em dois vetores (sequência + atribuição), alternativa às chaves aleatórias:
+
+    sequence:           int16 (n_ops,) com o índice de cada job repetido uma vez por operação;
+                        a k-ésima ocorrência do job j é a sua k-ésima operação, então qualquer
+                        permutação respeita a precedência
+    machine_choice:     int8 (n_ops,) índice na lista de máquinas de cada operação
+    equipment_choice:   int8 (n_ops,) índice na lista de equipamentos de cada operação
+                        (ignorado em operações sem equipamento)
+
+Os vetores de atribuição seguem a ordem de get_flattened_operations(). Como no modelo CP-SAT
+e no validador, cada operação usa uma máquina e um equipamento da sua lista.
+"""
+
+from functools import partial
+
+import numpy as np
+
+from classes.jssp import jssp
+from decoder import PoolTimeline, find_earliest_available_time
+
+
+def option_counts(instance: jssp):
+    """Tamanho das listas de máquinas e de equipamentos de cada operação (int8)."""
+    operations = instance.get_flattened_operations()
+    machine_counts = np.array([len(op["machines"]) for op in operations], dtype=np.int64)
+    equipment_counts = np.array([len(op["equipments"]) for op in operations], dtype=np.int64)
+    if len(instance.jobs) > np.iinfo(np.int16).max + 1:
+        raise ValueError(f"Jobs demais para a sequência int16: {len(instance.jobs)}.")
+    if max(machine_counts.max(initial=0), equipment_counts.max(initial=0)) > np.iinfo(np.int8).max:
+        raise ValueError("Mais de 127 opções de recurso em uma operação não cabem em int8.")
+    return machine_counts.astype(np.int8), equipment_counts.astype(np.int8)
+
+
+def random_population(instance: jssp, size, rng):
+    """
+    População aleatória: sequências embaralhadas e atribuições uniformes.
+
+    Returns:
+        Tupla (sequences int16, machine_choices int8, equipment_choices int8), cada uma (size, n_ops)
+    """
+    machine_counts, equipment_counts = option_counts(instance)
+    base = instance.op_job.astype(np.int16)
+    sequences = rng.permuted(np.broadcast_to(base, (size, len(base))), axis=1)
+    machine_choices = rng.integers(0, machine_counts.astype(np.int64), size=(size, len(base))).astype(np.int8)
+    equipment_choices = rng.integers(0, np.maximum(equipment_counts, 1).astype(np.int64),
+                                     size=(size, len(base))).astype(np.int8)
+    return sequences, machine_choices, equipment_choices
+
+
+def sequence_operations(sequence, instance: jssp):
+    """
+    Índices achatados das operações na ordem da sequência. Ordenando a sequência de forma
+    estável, as ocorrências do job j ocupam exatamente job_offsets[j]:job_offsets[j+1].
+    """
+    sequence = np.asarray(sequence)
+    counts = np.bincount(sequence, minlength=len(instance.jobs))
+    if len(counts) != len(instance.jobs) or not np.array_equal(counts, np.diff(instance.job_offsets)):
+        raise ValueError("Sequência não tem cada job repetido uma vez por operação.")
+    operations = np.empty(len(sequence), dtype=np.int64)
+    operations[np.argsort(sequence, kind="stable")] = np.arange(len(sequence))
+    return operations
+
+
+def make_two_vector_decoder(instance: jssp):
+    """
+    Cria o decodificador da codificação em dois vetores: percorre as operações na ordem da
+    sequência e inicia cada uma no primeiro instante em que o job, a máquina e o equipamento
+    escolhidos estão livres e nenhum downtime da máquina cai na execução (como o decodificador
+    por prioridade, sem preencher lacunas).
+
+    Returns:
+        Função decode(sequence, machine_choice, equipment_choice, schedule=False) que retorna o
+        makespan ou, com schedule=True, o agendamento no formato de decode_schedule ("equipment"
+        é a lista dos equipamentos ocupados: vazia ou com o equipamento escolhido)
+    """
+    operations = instance.get_flattened_operations()
+    op_job = instance.op_job.tolist()
+    op_position = instance.op_position.tolist()
+    job_names = [job.name for job in instance.jobs]
+    next_available = {m: partial(find_earliest_available_time, sorted(points))
+                      for m, points in instance.machine_downtimes.items()}
+    next_available.update({m: calendar.next_available for m, calendar in instance.calendars.items()})
+    equipment_pools = instance.equipment_pools
+
+    def decode(sequence, machine_choice, equipment_choice, schedule=False):
+        machine_choice = machine_choice.tolist()
+        equipment_choice = equipment_choice.tolist()
+        job_ready = [0] * len(job_names)
+        machine_ready = {}
+        equipment_ready = {}
+        pools = {eq: PoolTimeline(capacity) for eq, capacity in equipment_pools.items()}
+        makespan = 0
+        entries = []
+
+        for idx in sequence_operations(sequence, instance).tolist():
+            op = operations[idx]
+            job = op_job[idx]
+            duration = op["duration"]
+            machine = op["machines"][machine_choice[idx]]
+            equipment = op["equipments"][equipment_choice[idx]] if op["equipments"] else None
+
+            start = max(job_ready[job], machine_ready.get(machine, 0))
+            if equipment in pools:
+                start = max(start, pools[equipment].ready())
+            elif equipment is not None:
+                start = max(start, equipment_ready.get(equipment, 0))
+            if machine in next_available:
+                start = next_available[machine](start, duration)
+            end = start + duration
+
+            job_ready[job] = end
+            machine_ready[machine] = end
+            if equipment in pools:
+                pools[equipment].assign(start, end)
+            elif equipment is not None:
+                equipment_ready[equipment] = end
+            makespan = max(makespan, end)
+            if schedule:
+                entries.append((idx, {
+                    "job": job_names[job],
+                    "operation": op_position[idx],
+                    "start": start,
+                    "end": end,
+                    "duration": duration,
+                    "machine": machine,
+                    "equipment": [] if equipment is None else [equipment],
+                }))
+
+        if schedule:
+            # Mesma ordem de extract_schedule: por job e operação (índice achatado)
+            return [entry for _, entry in sorted(entries, key=lambda item: item[0])]
+        return makespan
+
+    return decode
+
+
+def make_two_vector_fitness(instance: jssp):
+    """Fitness (tupla (makespan,), como make_fitness_function) de uma solução (sequence, machines, equipment)."""
+    decode = make_two_vector_decoder(instance)
+
+    def fitness(solution):
+        sequence, machine_choice, equipment_choice = solution
+        return decode(sequence, machine_choice, equipment_choice),
+
+    return fitness
+
+
+def pox_crossover(parent_a, parent_b, rng):
+    """
+    Cruzamento por precedência (POX): os jobs sorteados mantêm as posições do primeiro pai e as
+    demais posições recebem os outros jobs na ordem em que aparecem no segundo pai.
+    """
+    num_jobs = int(max(parent_a.max(initial=-1), parent_b.max(initial=-1))) + 1
+    kept = rng.random(num_jobs) < 0.5
+    child = parent_a.copy()
+    child[~kept[parent_a]] = parent_b[~kept[parent_b]]
+    return child
+
+
+def uniform_crossover(parent_a, parent_b, rng):
+    """Cruzamento uniforme de vetores de atribuição (cada gene vem de um dos pais)."""
+    return np.where(rng.random(parent_a.shape) < 0.5, parent_a, parent_b)
+
+
+def swap_mutation(sequence, rng):
+    """Troca duas posições da sequência (continua válida)."""
+    mutated = sequence.copy()
+    if len(mutated) > 1:
+        i, j = rng.choice(len(mutated), 2, replace=False)
+        mutated[i], mutated[j] = mutated[j], mutated[i]
+    return mutated
+
+
+def assignment_mutation(choice, counts, rng, rate=0.05):
+    """Sorteia de novo a opção de cada operação com mais de uma, com probabilidade `rate`."""
+    mutated = choice.copy()
+    flip = (rng.random(choice.shape) < rate) & (counts > 1)
+    mutated[flip] = rng.integers(0, counts[flip].astype(np.int64)).astype(choice.dtype)
+    return mutated
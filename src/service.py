@@ -0,0 +1,226 @@
+import argparse
+import asyncio
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ortools.sat.python import cp_model
+
+from get_makespan import normalize_instance, solve_instance
+
+
+def parse_request(message, default_deadline):
+    """
+    Validate one decoded request line.
+    Returns (id, normalized instance, deadline in seconds); raises ValueError if it is malformed.
+    """
+    if not isinstance(message, dict):
+        raise ValueError("the request must be a JSON object")
+    instance_json = message.get("instance")
+    if not isinstance(instance_json, dict) or not isinstance(instance_json.get("jobs"), dict):
+        raise ValueError('"instance" must be an object with a "jobs" object')
+    for field in ("machine_downtimes", "machine_calendars", "equipment_pools"):
+        if not isinstance(instance_json.get(field, {}), dict):
+            raise ValueError(f'"{field}" must be an object')
+
+    deadline = message.get("deadline")
+    if deadline is None:
+        deadline = default_deadline
+    elif isinstance(deadline, bool) or not isinstance(deadline, (int, float)) or not math.isfinite(deadline):
+        raise ValueError(f'"deadline" must be a finite number of seconds, got {deadline!r}')
+    return message.get("id"), normalize_instance(instance_json), float(deadline)
+
+
+class IncumbentCallback(cp_model.CpSolverSolutionCallback):
+    """
+    Forwards every improving CP-SAT solution (objective, bound, wall time) to `emit`.
+    """
+
+    def __init__(self, emit):
+        super().__init__()
+        self.emit = emit
+
+    def on_solution_callback(self):
+        self.emit({
+            "event": "incumbent",
+            "objective": self.ObjectiveValue(),
+            "bound": self.BestObjectiveBound(),
+            "wall_time": self.WallTime(),
+        })
+
+
+class SolveRequest:
+    def __init__(self, request_id, instance_json, deadline, events):
+        self.id = request_id
+        self.instance_json = instance_json
+        self.deadline = deadline
+        self.events = events
+        self.solver = None
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Stop the request; a running solve returns its best incumbent.
+        """
+        self.cancelled = True
+        if self.solver is not None:
+            self.solver.StopSearch()
+
+
+class SchedulingService:
+    """
+    Long-running local scheduling service.
+
+    Clients send one JSON request per line: {"id": ..., "instance": {...}, "deadline": seconds}
+    (a missing or null deadline means default_deadline). Malformed lines get an "error" event.
+    The service answers with JSON lines: "queued", one "incumbent" per improving solution and a
+    final "result" (or "error"). Requests wait in a FIFO queue and are solved by a pool of
+    threads (CP-SAT releases the GIL). When the deadline, counted from arrival, expires or the
+    client disconnects, StopSearch is called and the best incumbent is returned.
+    """
+
+    def __init__(self, max_concurrent_solves=1, num_workers=None, default_deadline=60.0):
+        self.max_concurrent_solves = max_concurrent_solves
+        self.num_workers = num_workers
+        self.default_deadline = default_deadline
+        self.queue = asyncio.Queue()
+        self.executor = ThreadPoolExecutor(max_concurrent_solves)
+        self.workers = []
+
+    async def start(self, host="127.0.0.1", port=8765, path=None):
+        """
+        Listen on a Unix socket if `path` is given, otherwise on TCP host:port.
+        """
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrent_solves)]
+        if path is not None:
+            return await asyncio.start_unix_server(self._handle_client, path=path)
+        return await asyncio.start_server(self._handle_client, host=host, port=port)
+
+    async def _handle_client(self, reader, writer):
+        try:
+            line = await reader.readline()
+            while line:
+                try:
+                    request_id, instance_json, deadline = parse_request(json.loads(line), self.default_deadline)
+                except ValueError as error:  # JSONDecodeError included
+                    await self._send(writer, {"event": "error", "message": f"Invalid request: {error}"})
+                    line = await reader.readline()
+                    continue
+
+                request = SolveRequest(request_id, instance_json, time.monotonic() + deadline, asyncio.Queue())
+                await self.queue.put(request)
+                await self._send(writer, {"event": "queued", "id": request.id, "position": self.queue.qsize()})
+                line = await self._forward_events(reader, writer, request)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _forward_events(self, reader, writer, request):
+        """
+        Send the request's events until the final one while reading the client's next line, so a
+        disconnect (EOF) cancels the request even when no event is due. A line that arrives first
+        is kept for after this request. Returns that line (b"" at EOF).
+        """
+        next_line = asyncio.ensure_future(reader.readline())
+        try:
+            while True:
+                event = asyncio.ensure_future(request.events.get())
+                await asyncio.wait({event, next_line}, return_when=asyncio.FIRST_COMPLETED)
+                if not event.done() and next_line.result() == b"":
+                    event.cancel()
+                    request.cancel()
+                    return b""
+                event = await event
+                await self._send(writer, dict(event, id=request.id))
+                if event["event"] in ("result", "error"):
+                    return await next_line
+        except (ConnectionError, asyncio.CancelledError):
+            request.cancel()
+            next_line.cancel()
+            raise
+
+    @staticmethod
+    async def _send(writer, event):
+        writer.write(json.dumps(event).encode("utf-8") + b"\n")
+        await writer.drain()
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            request = await self.queue.get()
+            try:
+                await self._run(loop, request)
+            except Exception as error:
+                request.events.put_nowait({"event": "error", "message": str(error)})
+            finally:
+                self.queue.task_done()
+
+    async def _run(self, loop, request):
+        remaining = request.deadline - time.monotonic()
+        if request.cancelled or remaining <= 0:
+            request.events.put_nowait({"event": "error", "message": "Deadline expired before the solve started"})
+            return
+
+        def emit(event):
+            loop.call_soon_threadsafe(request.events.put_nowait, event)
+
+        request.solver = cp_model.CpSolver()
+        future = loop.run_in_executor(
+            self.executor, solve_instance, request.instance_json, remaining, self.num_workers,
+            None, request.solver, IncumbentCallback(emit),
+        )
+        done, _ = await asyncio.wait({future}, timeout=remaining)
+        if not done:
+            request.solver.StopSearch()
+        result = await future
+
+        if result is None:
+            request.events.put_nowait({"event": "error", "message": "No solution found."})
+        else:
+            # CP-SAT also gets the deadline as its time limit and may reach it first, so any
+            # unproven result was stopped by the deadline or a cancel
+            stopped = not done or request.cancelled or result["status"] != "OPTIMAL"
+            request.events.put_nowait(dict(result, event="result", stopped=stopped))
+
+
+async def request_schedule(instance_json, deadline=None, request_id=None, host="127.0.0.1", port=8765, path=None):
+    """
+    Client helper: send one instance and yield the service's events until the final one.
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    message = {"id": request_id, "instance": instance_json}
+    if deadline is not None:
+        message["deadline"] = deadline
+    writer.write(json.dumps(message).encode("utf-8") + b"\n")
+    await writer.drain()
+    try:
+        while line := await reader.readline():
+            event = json.loads(line)
+            yield event
+            if event["event"] in ("result", "error"):
+                break
+    finally:
+        writer.close()
+
+
+async def main(args):
+    service = SchedulingService(args.concurrent, args.num_workers, args.deadline)
+    server = await service.start(args.host, args.port, args.socket)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local FJSP scheduling service (JSON lines).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="Unix socket path (overrides host/port)")
+    parser.add_argument("--concurrent", type=int, default=1, help="Solves running at the same time")
+    parser.add_argument("--num-workers", type=int, default=None, help="CP-SAT workers per solve")
+    parser.add_argument("--deadline", type=float, default=60.0, help="Default per-request deadline (s)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+
+
+def canonical_calendar(calendar):
+    """
+    Canonical form of a machine calendar: periodic windows with their defaults filled in, and
+    every list of windows sorted.
+    """
+    periodic = sorted(
+        [int(window["period"]), int(window.get("start", 0)), int(window["length"]), window.get("until")]
+        for window in calendar.get("periodic", ())
+    )
+    return {
+        "periodic": periodic,
+        "ranges": sorted([int(a), int(b)] for a, b in calendar.get("ranges", ())),
+        "exceptions": sorted([int(a), int(b)] for a, b in calendar.get("exceptions", ())),
+    }
+
+
+def canonical_instance(instance_json):
+    """
+    Canonical form of an instance: job names sorted, resource lists and downtime points sorted,
+    machine and equipment ids stringified for JSON. The model reads raw ids, so int and str keys
+    only hash the same for instances passed through normalize_instance (solve_fjsp_with_equipment
+    does this before looking up the cache).
+    Calendars and equipment pools only appear when present, so keys of instances without them
+    stay the same.
+    """
+    jobs = {
+        str(job_id): [[sorted(machines), sorted(equipment), duration] for (machines, equipment, duration) in job_ops]
+        for job_id, job_ops in instance_json["jobs"].items()
+    }
+    machine_downtimes = {
+        str(m): sorted(points)
+        for m, points in instance_json.get("machine_downtimes", {}).items()
+    }
+    canonical = {
+        "jobs": jobs,
+        "machine_downtimes": machine_downtimes,
+        "timespan": instance_json.get("timespan", 1000),
+    }
+    machine_calendars = instance_json.get("machine_calendars") or {}
+    if machine_calendars:
+        canonical["machine_calendars"] = {str(m): canonical_calendar(calendar)
+                                          for m, calendar in machine_calendars.items()}
+    equipment_pools = instance_json.get("equipment_pools") or {}
+    if equipment_pools:
+        canonical["equipment_pools"] = {str(e): int(capacity) for e, capacity in equipment_pools.items()}
+    if instance_json.get("earliest_start"):
+        canonical["earliest_start"] = int(instance_json["earliest_start"])
+    return canonical
+
+
+def instance_key(instance_json, params=None):
+    """
+    SHA-256 of the canonical instance plus the solver parameters.
+    """
+    payload = {"instance": canonical_instance(instance_json), "params": params or {}}
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SolveCache:
+    """
+    Persistent on-disk cache of CP-SAT results, one JSON file per (instance, params) key.
+    Proven-optimal results do not depend on the parameters and are stored with params=None.
+    Least recently used entries are evicted once the directory exceeds max_entries or max_bytes.
+    """
+
+    def __init__(self, directory, max_entries=512, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, instance_json, params=None):
+        """
+        Return the cached entry (objective, bound, status, schedule) or None.
+        """
+        path = self._path(instance_key(instance_json, params))
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        os.utime(path)  # mark as recently used
+        return entry
+
+    def put(self, instance_json, params, entry):
+        """
+        Store an entry, keeping an existing one if it is proven optimal or has a better objective.
+        """
+        previous = self.get(instance_json, params)
+        if previous is not None and (
+            previous["status"] == "OPTIMAL" or previous["objective"] < entry["objective"]
+        ):
+            return
+
+        path = self._path(instance_key(instance_json, params))
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        entries.sort()  # oldest first
+        total_bytes = sum(size for (_, size, _) in entries)
+        while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            _, size, name = entries.pop(0)
+            os.remove(os.path.join(self.directory, name))
+            total_bytes -= size
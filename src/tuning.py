@@ -0,0 +1,209 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import stats
+
+from classes.jssp import jssp
+from decoder import make_fitness_function
+from islands import evaluate
+
+
+def engine_cost(make_engine, epochs, config, instance_json, seed):
+    """
+    Custo de uma configuração em um bloco (instância, semente): melhor makespan de uma
+    execução do motor, relativo ao timespan de referência da instância.
+
+    Args:
+        make_engine: Construtor do motor que recebe a configuração como kwargs (ex.: BRKGA ou
+            functools.partial(MealpyEngine, SA.OriginalSA)); precisa ser serializável
+        epochs: Épocas da execução
+        config: Parâmetros do motor
+        instance_json: Instância no formato dos casos de teste
+        seed: Semente da execução
+    """
+    instance = jssp(instance_json)
+    fitness = make_fitness_function(instance)
+    rng = np.random.default_rng(seed)
+    engine = make_engine(**config)
+    population = rng.random((engine.pop_size, instance.num_operations))
+    _, fitnesses = engine.evolve(fitness, population, evaluate(fitness, population), epochs, rng)
+    return float(fitnesses.min()) / (instance.timespan or 1)
+
+
+def sample_configuration(space, rng, elite=None, spread=1.0):
+    """
+    Sorteia uma configuração do espaço {parâmetro: (mín, máx) ou [opções]}. Faixas de inteiros
+    geram inteiros. Com `elite`, valores numéricos vêm de uma normal centrada nela (desvio
+    spread * largura da faixa) e categóricos mantêm o valor da elite com probabilidade 1 - spread.
+    """
+    config = {}
+    for name, domain in space.items():
+        if isinstance(domain, list):
+            keep = elite is not None and rng.random() >= spread
+            config[name] = elite[name] if keep else domain[rng.integers(len(domain))]
+            continue
+        low, high = domain
+        if elite is None:
+            value = rng.uniform(low, high)
+        else:
+            value = float(np.clip(rng.normal(elite[name], spread * (high - low)), low, high))
+        config[name] = int(round(value)) if isinstance(low, int) and isinstance(high, int) else value
+    return config
+
+
+def friedman(costs):
+    """
+    Teste de Friedman sobre a matriz blocos x candidatos (menor custo = posto 1), com a correção
+    de empates de Conover:
+
+        T = (k - 1) * (soma R_j^2 - b * C) / (A - C),   C = b * k * (k + 1)^2 / 4
+
+    onde R_j é a soma dos postos do candidato j e A a soma dos postos ao quadrado.
+
+    Returns:
+        Tupla (T, p-valor, somas de postos R_j, A); T = 0 e p = 1 quando todos empatam
+    """
+    blocks, k = costs.shape
+    ranks = np.apply_along_axis(stats.rankdata, 1, costs)
+    rank_sums = ranks.sum(axis=0)
+    a = float((ranks ** 2).sum())
+    c = blocks * k * (k + 1) ** 2 / 4
+    if a == c:
+        return 0.0, 1.0, rank_sums, a
+    statistic = (k - 1) * ((rank_sums ** 2).sum() - blocks * c) / (a - c)
+    return float(statistic), float(stats.chi2.sf(statistic, k - 1)), rank_sums, a
+
+
+def _eliminate(costs, alpha):
+    """
+    Teste da F-race sobre a matriz blocos x candidatos vivos: Friedman seguido das comparações
+    com o melhor posto (Conover), ou Wilcoxon pareado quando restam dois.
+
+    Returns:
+        Máscara dos candidatos que continuam
+    """
+    blocks, k = costs.shape
+    keep = np.ones(k, dtype=bool)
+    if k == 2:
+        differences = costs[:, 0] - costs[:, 1]
+        if np.any(differences != 0) and stats.wilcoxon(differences, zero_method="zsplit").pvalue < alpha:
+            keep[int(differences.sum() < 0)] = False
+        return keep
+
+    _, p_value, rank_sums, a = friedman(costs)
+    if p_value >= alpha:
+        return keep
+
+    # Diferença mínima de somas de postos (b * A >= soma R_j^2 por Cauchy-Schwarz)
+    dof = (blocks - 1) * (k - 1)
+    spread = math.sqrt(2 * (blocks * a - (rank_sums ** 2).sum()) / dof)
+    critical = stats.t.ppf(1 - alpha / 2, dof) * spread
+    return rank_sums - rank_sums.min() <= critical
+
+
+def race(candidates, blocks, cost, budget, alpha=0.05, first_test=5, executor=None):
+    """
+    Corrida (F-race) de configurações: todos os candidatos vivos rodam em cada bloco
+    (instância, semente), em paralelo, e a partir de `first_test` blocos os significativamente
+    piores são descartados a cada novo bloco.
+
+    Args:
+        candidates: Lista de configurações
+        blocks: Lista de (instance_json, semente), na ordem em que são usados
+        cost: Função cost(config, instance_json, seed) -> custo (serializável se executor for um pool)
+        budget: Máximo de execuções de `cost`
+        alpha: Nível de significância dos testes
+        first_test: Blocos avaliados antes do primeiro teste
+        executor: Executor para as execuções (None roda em série)
+
+    Returns:
+        Tupla (índices dos sobreviventes ordenados pelo custo médio, custo médio de cada
+        sobrevivente, execuções gastas)
+    """
+    alive = np.arange(len(candidates))
+    results = []
+    spent = 0
+    mapper = executor.map if executor is not None else map
+    position = 0
+    while position < len(blocks) and len(alive) > 1:
+        # Os primeiros first_test blocos vão juntos (nenhum teste antes deles)
+        batch = blocks[position:position + (first_test if position == 0 else 1)]
+        if spent + len(batch) * len(alive) > budget:
+            break
+        position += len(batch)
+
+        jobs = [(candidates[i], instance_json, seed) for instance_json, seed in batch for i in alive]
+        values = np.fromiter(mapper(cost, *zip(*jobs)), dtype=float, count=len(jobs)).reshape(len(batch), len(alive))
+        spent += len(jobs)
+        # Resultados guardados por candidato original, para filtrar as colunas dos eliminados
+        results.extend({i: v for i, v in zip(alive, row)} for row in values)
+
+        if len(results) >= first_test:
+            costs = np.array([[row[i] for i in alive] for row in results])
+            alive = alive[_eliminate(costs, alpha)]
+
+    means = np.array([np.mean([row[i] for row in results]) if results else math.nan for i in alive])
+    order = np.argsort(means, kind="stable")
+    return alive[order].tolist(), means[order].tolist(), spent
+
+
+def iterated_race(space, instances, cost, budget=1000, iterations=None, elites=3, alpha=0.05,
+                  first_test=5, workers=None, seed=0):
+    """
+    Ajuste de parâmetros por corridas iteradas (estilo irace): cada iteração corre as elites
+    da anterior contra configurações novas amostradas em torno delas, com dispersão que
+    encolhe a cada iteração. O orçamento é dividido igualmente entre as iterações restantes.
+
+    Args:
+        space: Espaço de parâmetros {nome: (mín, máx) ou [opções]}
+        instances: Dict nome -> instance_json (ex.: os TC_MK*)
+        cost: Função cost(config, instance_json, seed) -> custo, como
+            functools.partial(engine_cost, BRKGA, 100)
+        budget: Total de execuções de `cost`
+        iterations: Número de corridas (padrão: 2 + log2 do número de parâmetros)
+        elites: Configurações mantidas entre iterações
+        workers: Processos para rodar as configurações em paralelo (None roda em série)
+
+    Returns:
+        Dict com best (configuração), elites (configuração e custo médio) e evaluations
+    """
+    rng = np.random.default_rng(seed)
+    iterations = iterations or 2 + int(math.log2(len(space)))
+    names = list(instances)
+    elite_configs, elite_costs = [], []
+    spent = 0
+
+    executor = ProcessPoolExecutor(workers) if workers else None
+    try:
+        for iteration in range(iterations):
+            race_budget = (budget - spent) // (iterations - iteration)
+            # Quantos candidatos cabem em first_test blocos + alguns blocos extras com metade deles
+            num_candidates = max(len(elite_configs) + 1, race_budget // (first_test + 5))
+            spread = 0.5 ** (iteration + 1)
+            candidates = list(elite_configs)
+            while len(candidates) < num_candidates:
+                parent = elite_configs[rng.integers(len(elite_configs))] if elite_configs else None
+                candidates.append(sample_configuration(space, rng, parent, spread if parent else 1.0))
+
+            # Blocos novos a cada corrida: instâncias embaralhadas, cada uma com semente própria
+            num_blocks = max(first_test, race_budget // max(1, len(candidates) // 2))
+            order = [names[i % len(names)] for i in range(num_blocks)]
+            rng.shuffle(order)
+            blocks = [(instances[name], int(rng.integers(2**31))) for name in order]
+
+            survivors, means, used = race(candidates, blocks, cost, race_budget, alpha, first_test, executor)
+            spent += used
+            elite_configs = [candidates[i] for i in survivors[:elites]]
+            elite_costs = means[:elites]
+            if used == 0:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return {
+        "best": elite_configs[0] if elite_configs else None,
+        "elites": list(zip(elite_configs, elite_costs)),
+        "evaluations": spent,
+    }
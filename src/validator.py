@@ -0,0 +1,213 @@
+import numpy as np
+from classes.jssp import jssp
+from decoder import decode_schedule
+
+
+CONSTRAINTS = (
+    "duration",
+    "precedence",
+    "machine_eligibility",
+    "equipment_eligibility",
+    "machine_overlap",
+    "equipment_overlap",
+    "downtime",
+)
+
+
+def schedule_arrays(schedule, instance: jssp):
+    """
+    Converte um agendamento no formato de extract_schedule (job, operation 0-based, start, end,
+    machine, equipment) em vetores na ordem de get_flattened_operations(). "equipment" pode ser
+    um id ou uma lista de ids (operação que ocupa vários equipamentos, como no decodificador).
+
+    Returns:
+        Tupla (start, end, machine, equipment) com -1 para recurso ausente; equipment é (n_ops,)
+        ou, se alguma entrada traz lista, (n_ops, k) com -1 nos slots vazios
+    """
+    job_index = {job.name: j for j, job in enumerate(instance.jobs)}
+    n = instance.num_operations
+    equipments = [entry.get("equipment") for entry in schedule]
+    slots = max((len(e) for e in equipments if isinstance(e, (list, tuple))), default=None)
+    start, end = np.zeros(n, dtype=np.int64), np.zeros(n, dtype=np.int64)
+    machine = np.full(n, -1, dtype=np.int64)
+    equipment = np.full(n if slots is None else (n, max(slots, 1)), -1, dtype=np.int64)
+    for entry, used in zip(schedule, equipments):
+        idx = instance.job_offsets[job_index[entry["job"]]] + entry["operation"]
+        start[idx], end[idx] = entry["start"], entry["end"]
+        if entry["machine"] is not None:
+            machine[idx] = entry["machine"]
+        if isinstance(used, (list, tuple)):
+            equipment[idx, :len(used)] = used
+        elif used is not None:
+            equipment[idx] = used
+    return start, end, machine, equipment
+
+
+def _eligible(resource, resource_ids, bits):
+    """
+    Recurso escolhido é elegível? Testa o bit do recurso no bitset empacotado da operação
+    (machine_bits/equipment_bits); -1 só é válido se a operação não exige o recurso.
+    """
+    ops = np.broadcast_to(np.arange(resource.shape[1]), resource.shape)
+    required = bits.any(axis=1)[ops]
+    if len(resource_ids) == 0:
+        return resource < 0
+    position = np.clip(np.searchsorted(resource_ids, resource), 0, len(resource_ids) - 1)
+    bit = (bits[ops, position >> 3] >> (position & 7).astype(np.uint8)) & 1
+    ok = (resource_ids[position] == resource) & (bit == 1)
+    return np.where(required, ok, resource < 0)
+
+
+def _eligible_equipment(equipment, equipment_ids, bits):
+    """
+    Elegibilidade com k slots de equipamento por operação (batch x n_ops x k, -1 nos vazios):
+    todo slot usado precisa ser elegível e operação que exige equipamento precisa de algum.
+    """
+    batch_size, n, slots = equipment.shape
+    used = np.moveaxis(equipment >= 0, 2, 1)
+    per_slot = _eligible(np.moveaxis(equipment, 2, 1).reshape(-1, n), equipment_ids, bits)
+    per_slot = per_slot.reshape(batch_size, slots, n)
+    return (per_slot | ~used).all(axis=1) & (used.any(axis=1) | ~bits.any(axis=1))
+
+
+def _overlaps(batch_size, batch, resource, start, end):
+    """
+    Conta operações que começam antes do fim de uma anterior no mesmo (candidato, recurso):
+    ordena por (candidato, recurso, início) e compara com o máximo acumulado dos fins do grupo.
+    """
+    used = resource >= 0
+    batch, resource, start, end = batch[used], resource[used], start[used], end[used]
+    if start.size < 2:
+        return np.zeros(batch_size, dtype=np.int64)
+
+    order = np.lexsort((start, resource, batch))
+    batch, resource, start, end = batch[order], resource[order], start[order], end[order]
+    new_group = np.concatenate(([True], (batch[1:] != batch[:-1]) | (resource[1:] != resource[:-1])))
+    group = np.cumsum(new_group) - 1
+
+    # Máximo acumulado segmentado: desloca cada grupo para uma faixa própria
+    low = min(start.min(), end.min())
+    shift = group * (end.max() - low + 1)
+    running_end = np.maximum.accumulate(end - low + shift) - shift + low
+    violated = ~new_group
+    violated[1:] &= start[1:] < running_end[:-1]
+    return np.bincount(batch[violated], minlength=batch_size)
+
+
+def _capacity_excess(batch_size, batch, resource, start, end, capacities):
+    """
+    Conta, por candidato, as operações de pools que começam com o pool já cheio: em cada início,
+    usos ativos = inícios até esta operação menos fins <= t no mesmo (candidato, pool).
+    """
+    excess = np.zeros(batch_size, dtype=np.int64)
+    for pool, capacity in capacities.items():
+        used = (resource == pool) & (end > start)
+        if used.sum() <= capacity:
+            continue
+        b, s, e = batch[used], start[used], end[used]
+        low = s.min()
+        s, e = s - low, e - low
+        span = int(e.max()) + 1
+        keys, end_keys = b * span + s, np.sort(b * span + e)
+        # Posição na ordem de início (empates desfeitos pela ordem) = inícios até esta operação
+        rank = np.empty(len(keys), dtype=np.int64)
+        rank[np.argsort(keys, kind="stable")] = np.arange(1, len(keys) + 1)
+        active = rank - np.searchsorted(end_keys, keys, side="right")
+        excess += np.bincount(b[active > capacity], minlength=batch_size)
+    return excess
+
+
+def validate_schedules(instance: jssp, start, end, machine, equipment=None):
+    """
+    Verifica agendamentos contra duração, precedência, elegibilidade, sobreposição em máquinas e
+    equipamentos e downtimes (pontos e calendários), com varreduras por ordenação (O(n log n)).
+    Aceita um agendamento (vetores de n_ops) ou um lote (matrizes batch x n_ops). Cada operação
+    usa uma máquina e, se exigir equipamento, um ou mais da sua lista (o modelo CP-SAT escolhe
+    um, o decodificador por prioridade ocupa todos); pools de equipamentos admitem até
+    `capacidade` usos simultâneos.
+
+    Args:
+        instance: Instância compilada do problema JSSP
+        start, end, machine, equipment: Vetores/matrizes na ordem de get_flattened_operations(),
+            com -1 para recurso ausente. equipment pode ter um eixo final a mais com k slots
+            (vários equipamentos por operação, -1 nos vazios)
+
+    Returns:
+        Dict restrição -> número de violações (int ou vetor por candidato), mais makespan
+    """
+    start = np.asarray(start, dtype=np.int64)
+    single = start.ndim == 1
+    start = np.atleast_2d(start)
+    end = np.atleast_2d(np.asarray(end, dtype=np.int64))
+    machine = np.atleast_2d(np.asarray(machine, dtype=np.int64))
+    batch_size, n = start.shape
+    # Equipamentos como batch x n_ops x k (k = 1 para um equipamento por operação)
+    if equipment is None:
+        equipment = np.full((batch_size, n, 1), -1, dtype=np.int64)
+    else:
+        equipment = np.asarray(equipment, dtype=np.int64)
+        if equipment.ndim == (1 if single else 2):
+            equipment = equipment[..., None]
+        if single:
+            equipment = equipment[None]
+
+    same_job = instance.op_job[1:] == instance.op_job[:-1]
+    batch = np.broadcast_to(np.arange(batch_size)[:, None], start.shape)
+    # Cada slot de equipamento vira uma ocupação com o início e o fim da sua operação
+    slot_batch, slot_start, slot_end = (np.broadcast_to(values[..., None], equipment.shape).ravel()
+                                        for values in (batch, start, end))
+    # Pools (capacidade > 1) são verificados por contagem, não por sobreposição par a par
+    unary_equipment = np.where(np.isin(equipment, list(instance.equipment_pools)), -1, equipment)
+
+    result = {
+        "duration": (end - start != instance.durations).sum(axis=1),
+        "precedence": ((start[:, 1:] < end[:, :-1]) & same_job).sum(axis=1),
+        "machine_eligibility": (~_eligible(machine, instance.machine_ids, instance.machine_bits)).sum(axis=1),
+        "equipment_eligibility": (~_eligible_equipment(equipment, instance.equipment_ids, instance.equipment_bits)).sum(axis=1),
+        "machine_overlap": _overlaps(batch_size, batch.ravel(), machine.ravel(), start.ravel(), end.ravel()),
+        "equipment_overlap": _overlaps(batch_size, slot_batch, unary_equipment.ravel(), slot_start, slot_end)
+        + _capacity_excess(batch_size, slot_batch, equipment.ravel(), slot_start, slot_end, instance.equipment_pools),
+    }
+
+    # Downtime: existe ponto da máquina em [start, end)? Chave combinada (máquina, instante).
+    # Máquinas com calendário (que já inclui os pontos) são verificadas abaixo
+    with_calendar = np.isin(machine, list(instance.calendars))
+    if instance.downtime_point.size:
+        span = int(max(instance.downtime_point.max(), end.max())) + 1
+        keys = instance.downtime_machine * span + instance.downtime_point
+        low = np.searchsorted(keys, machine * span + np.maximum(start, 0))
+        high = np.searchsorted(keys, machine * span + np.clip(end, 0, span))
+        result["downtime"] = ((high > low) & (machine >= 0) & ~with_calendar).sum(axis=1)
+    else:
+        result["downtime"] = np.zeros(batch_size, dtype=np.int64)
+
+    # Calendário: a primeira janela que termina após o início começa antes do fim?
+    horizon = int(end.max()) if n else 0
+    for m, calendar in instance.calendars.items():
+        windows = np.array(calendar.windows(horizon), dtype=np.int64).reshape(-1, 2)
+        if not len(windows):
+            continue
+        i = np.searchsorted(windows[:, 1], start, side="right")
+        blocked = (i < len(windows)) & (windows[np.minimum(i, len(windows) - 1), 0] < end)
+        result["downtime"] += (blocked & (machine == m) & (end > start)).sum(axis=1)
+
+    result["makespan"] = end.max(axis=1) if n else np.zeros(batch_size, dtype=np.int64)
+    if single:
+        return {key: int(value[0]) for key, value in result.items()}
+    return result
+
+
+def is_feasible(violations):
+    """True (ou vetor booleano) quando não há nenhuma violação."""
+    return sum(violations[key] for key in CONSTRAINTS) == 0
+
+
+def validate_priority_vector(instance: jssp, keys):
+    """
+    Decodifica um vetor de prioridades com o decodificador da fitness (decode_schedule) e
+    valida o agendamento resultante, com todos os equipamentos que cada operação ocupa.
+
+    Returns:
+        Dict restrição -> número de violações, mais makespan (igual ao fitness do vetor)
+    """
+    return validate_schedules(instance, *schedule_arrays(decode_schedule(instance, keys), instance))
@@ -0,0 +1,50 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(TESTS_DIR), "src"))
+
+from classes.jssp import jssp  # noqa: E402
+from get_makespan import solve_instance  # noqa: E402
+from validator import is_feasible, schedule_arrays, validate_schedules  # noqa: E402
+
+
+def load_cases(filename):
+    """Carrega um módulo de casos de teste (test.py / test1.py) como o notebook faz."""
+    spec = importlib.util.spec_from_file_location(f"cases_{filename[:-3]}", os.path.join(TESTS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def assert_feasible(instance_json, schedule):
+    """Valida um agendamento no formato de extract_schedule contra todas as restrições."""
+    instance = jssp(instance_json)
+    arrays = schedule_arrays(schedule, instance)
+    violations = validate_schedules(instance, *(array[None] for array in arrays))
+    assert is_feasible(violations).all(), violations
+
+
+@pytest.fixture(scope="session")
+def cases():
+    return load_cases("test.py")
+
+
+@pytest.fixture(scope="session")
+def small_cases():
+    return load_cases("test1.py")
+
+
+@pytest.fixture(scope="session")
+def mk01(cases):
+    return cases.TC_MK01_ADAPTADO
+
+
+@pytest.fixture(scope="session")
+def mk01_solution(mk01):
+    """Resultado do CP-SAT para TC_MK01_ADAPTADO, compartilhado pelos testes que partem de um agendamento."""
+    return solve_instance(mk01, time_limit=3.0)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from classes.jssp import jssp
+from decoder import PoolTimeline, make_fitness_function
+from instrumentation import Profiler
+
+
+def test_pool_timeline_best_fit():
+    pool = PoolTimeline(2)
+    pool.assign(0, 5)
+    pool.assign(0, 3)
+    assert pool.ready() == 3
+    pool.assign(4, 6)  # em 4 só a unidade liberada em 3 está livre
+    assert pool.releases == [5, 6]
+
+
+def test_pool_timeline_rejects_start_before_ready():
+    pool = PoolTimeline(1)
+    pool.assign(0, 5)
+    with pytest.raises(ValueError, match="Nenhuma unidade"):
+        pool.assign(2, 4)
+    assert pool.releases == [5]
+
+
+def test_fixed_cutoff_aborts_between_cutoff_and_full_fitness(mk01):
+    instance = jssp(mk01)
+    full_fitness = make_fitness_function(instance)
+    profiler = Profiler()
+    fitness = make_fitness_function(instance, profiler=profiler)
+    rng = np.random.default_rng(0)
+    for solution in rng.random((20, instance.num_operations)):
+        full = full_fitness(solution)[0]
+        for cutoff in (full * 0.5, full * 0.9, full - 1):
+            value = fitness(solution, cutoff=cutoff)[0]
+            assert cutoff < value <= full
+        # Cutoff no próprio valor (ou acima) não aborta: devolve o fitness completo
+        assert fitness(solution, cutoff=full)[0] == full
+        assert fitness(solution, cutoff=None)[0] == full
+    # Todo cutoff abaixo do fitness completo aborta; com metade do valor sobram operações
+    assert profiler.stats["early_aborts"] == 60
+    assert 0 < profiler.stats["skipped_operations"] < 60 * instance.num_operations
+
+
+def test_incumbent_cutoff_tracks_best_complete_value(mk01):
+    instance = jssp(mk01)
+    full_fitness = make_fitness_function(instance)
+    fitness = make_fitness_function(instance, cutoff="incumbent")
+    rng = np.random.default_rng(1)
+    best = np.inf
+    for solution in rng.random((60, instance.num_operations)):
+        full = full_fitness(solution)[0]
+        value = fitness(solution)[0]
+        if full <= best:
+            # Melhora (ou empate) é sempre avaliada por completo
+            assert value == full
+        else:
+            assert best < value <= full
+        best = min(best, full)
+    # O cutoff da chamada substitui o incumbente
+    worse = rng.random(instance.num_operations)
+    assert fitness(worse, cutoff=None)[0] == full_fitness(worse)[0]
@@ -0,0 +1,43 @@
+from conftest import assert_feasible
+from get_makespan import solve_decomposed, solve_instance, split_instance
+
+
+# Two components: jobs a_* use machines 1-2 and fixture 7, jobs b_* machines 3-4 and fixture 8;
+# machine 1 has a downtime that only the first component sees
+DISJOINT = {
+    "jobs": {
+        "a_1": [([1, 2], [7], 3), ([2], [], 2)],
+        "b_1": [([3], [8], 4), ([3, 4], [], 3)],
+        "a_2": [([1], [7], 2), ([1, 2], [7], 4)],
+        "b_2": [([4], [8], 5)],
+        "b_3": [([3, 4], [8], 2), ([4], [], 1)],
+    },
+    "machine_downtimes": {1: [1, 6]},
+    "timespan": 50,
+}
+
+
+def test_split_instance_disjoint():
+    sub_instances = split_instance(DISJOINT)
+    assert [list(sub["jobs"]) for sub in sub_instances] == [["a_1", "a_2"], ["b_1", "b_2", "b_3"]]
+
+
+def test_solve_decomposed_merges_components():
+    parts = [solve_instance(sub, time_limit=5.0) for sub in split_instance(DISJOINT)]
+    result = solve_decomposed(DISJOINT, time_limit=5.0, max_processes=2)
+
+    assert result["status"] == "OPTIMAL"
+    assert result["objective"] == max(part["objective"] for part in parts)
+    assert result["objective"] == max(entry["end"] for entry in result["schedule"])
+    assert [(entry["job"], entry["operation"]) for entry in result["schedule"]] == [
+        (job_id, op_id) for job_id, job_ops in DISJOINT["jobs"].items() for op_id in range(len(job_ops))
+    ]
+    assert_feasible(DISJOINT, result["schedule"])
+
+
+def test_solve_decomposed_single_component(mk01):
+    # mk01 is one component: no process pool, same result as solve_instance
+    assert len(split_instance(mk01)) == 1
+    result = solve_decomposed(mk01, time_limit=3.0)
+    assert result["objective"] == max(entry["end"] for entry in result["schedule"])
+    assert_feasible(mk01, result["schedule"])
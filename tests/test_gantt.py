@@ -0,0 +1,59 @@
+import numpy as np
+
+from classes.jssp import jssp
+from decoder import decode_schedule, make_fitness_function
+from gantt import downsample_lane, downtime_ranges, render_gantt, schedule_to_arrays
+
+
+def test_decoded_schedule_arrays(mk01):
+    instance = jssp(mk01)
+    keys = np.random.default_rng(1).random(instance.num_operations)
+    schedule = decode_schedule(instance, keys)
+    arrays = schedule_to_arrays(schedule)
+    assert arrays["end"].max() == make_fitness_function(instance)(keys)[0]
+    uses = sum(len(entry["equipment"]) for entry in schedule)
+    assert len(arrays["equipment_usage"][0]) == uses
+
+
+def test_downsample_lane_merges_invisible_gaps():
+    start = np.array([10.0, 0.0, 4.2, 4.0, 20.0])
+    end = np.array([12.0, 4.0, 6.0, 5.0, 21.0])
+    merged_start, merged_end = downsample_lane(start, end, min_gap=0.5)
+    # [0, 4) e [4, 5) e [4.2, 6) se tocam; [10, 12) e [20, 21) ficam separados
+    assert merged_start.tolist() == [0.0, 10.0, 20.0]
+    assert merged_end.tolist() == [6.0, 12.0, 21.0]
+    # Com folga maior que todas as lacunas, tudo vira uma barra cobrindo o total
+    assert [a.tolist() for a in downsample_lane(start, end, min_gap=10.0)] == [[0.0], [21.0]]
+
+
+def test_downtime_ranges_groups_consecutive_points():
+    starts, ends = downtime_ranges([7, 2, 3, 4, 9, 3])
+    assert starts.tolist() == [2.0, 7.0, 9.0] and ends.tolist() == [5.0, 8.0, 10.0]
+    assert downtime_ranges([])[0].size == 0
+
+
+def test_render_gantt_one_collection_per_lane(mk01, tmp_path):
+    instance = jssp(mk01)
+    schedule = decode_schedule(instance, np.random.default_rng(2).random(instance.num_operations))
+    arrays = schedule_to_arrays(schedule)
+    path = tmp_path / "gantt.png"
+    fig = render_gantt(**arrays, machine_downtimes=mk01["machine_downtimes"], path=str(path))
+
+    ax = fig.axes[0]
+    machines = np.unique(arrays["machine"])
+    equipment = np.unique(arrays["equipment_usage"][0])
+    with_downtimes = [m for m in machines.tolist() if m in mk01["machine_downtimes"]]
+    assert len(ax.collections) == len(machines) + len(equipment) + len(with_downtimes)
+    assert len(ax.get_yticklabels()) == len(machines) + len(equipment)
+    assert len(ax.texts) == len(schedule)  # rótulos abaixo de label_limit
+    assert path.read_bytes().startswith(b"\x89PNG")
+
+
+def test_render_gantt_downsamples_large_lanes():
+    # 5000 operações coladas numa só máquina: a faixa é reamostrada e fica sem rótulos
+    start = np.arange(5000, dtype=float)
+    fig = render_gantt(start, start + 1, np.ones(5000, dtype=np.int64), max_bars_per_lane=100)
+    ax = fig.axes[0]
+    assert len(ax.collections) == 1
+    assert len(ax.collections[0].get_paths()) == 1
+    assert not ax.texts
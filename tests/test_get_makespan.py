@@ -0,0 +1,98 @@
+from collections import Counter
+
+import pytest
+
+from conftest import assert_feasible
+from get_makespan import build_fjsp_model, pool_interchangeable_equipment, solve_fjsp_with_equipment, solve_instance
+from incumbent_trace import IncumbentTrace
+from instrumentation import Profiler
+from solve_cache import SolveCache
+
+
+SMALL = {"jobs": {"job_1": [([1, 2], [7], 3)], "job_2": [([1], [7], 2)]}, "machine_downtimes": {1: [2]}, "timespan": 10}
+
+
+def test_solve_instance_mk01(mk01, mk01_solution):
+    result = mk01_solution
+    assert result["status"] in ("OPTIMAL", "FEASIBLE")
+    assert result["objective"] == max(entry["end"] for entry in result["schedule"])
+    assert result["bound"] <= result["objective"] <= mk01["timespan"]
+    assert_feasible(mk01, result["schedule"])
+
+
+# Three copies of fixture 10 expanded into ids 10, 11 and 12, plus a single fixture 20
+FIXTURES = {
+    "jobs": {
+        f"job_{j}": [([1, 2, 3], [10, 11, 12], 2 + j % 3), ([2, 3, 4], [20], 1), ([1, 4], [10, 11, 12], 3)]
+        for j in range(5)
+    },
+    "machine_downtimes": {},
+    "timespan": 60,
+}
+
+
+def count_equipment_intervals(instance_json):
+    _, task_intervals, _ = build_fjsp_model(instance_json)
+    return sum(len(intervals[3]) for intervals in task_intervals.values())
+
+
+def test_pool_equipment_keeps_objective():
+    pooled, members = pool_interchangeable_equipment(FIXTURES)
+    assert members == {10: [(10, 1), (11, 1), (12, 1)]}
+    assert pooled["equipment_pools"] == {10: 3}
+    assert count_equipment_intervals(pooled) < count_equipment_intervals(FIXTURES)
+
+    plain = solve_instance(FIXTURES, time_limit=10.0, num_workers=4)
+    result = solve_instance(FIXTURES, time_limit=10.0, num_workers=4, pool_equipment=True,
+                            hint_schedule=plain["schedule"])
+    assert plain["status"] == result["status"] == "OPTIMAL"
+    assert result["objective"] == plain["objective"]
+    assert {entry["equipment"] for entry in result["schedule"]} <= {10, 11, 12, 20}
+    assert_feasible(FIXTURES, result["schedule"])
+
+
+def test_small_cases_reach_reference_makespan(small_cases):
+    for name in (name for name in dir(small_cases) if name.startswith("TC_")):
+        instance_json = getattr(small_cases, name)
+        result = solve_instance(instance_json, time_limit=5.0)
+        assert result["status"] == "OPTIMAL", name
+        assert result["objective"] == instance_json["timespan"], name
+        assert_feasible(instance_json, result["schedule"])
+
+
+def test_compact_model_structure(mk01):
+    profiler = Profiler()
+    _, task_intervals, _ = build_fjsp_model(mk01, profiler=profiler)
+    machine_uses, equipment_uses = Counter(), Counter()
+    for job_id, job_ops in mk01["jobs"].items():
+        for op_id, (machines, equipment, _) in enumerate(job_ops):
+            _, _, machine_vars, equipment_vars, _ = task_intervals[(job_id, op_id)]
+            # Escolha única: intervalo fixo, sem literal de presença
+            assert all((is_present is True) == (len(machines) == 1) for _, _, is_present in machine_vars)
+            assert all((is_present is True) == (len(equipment) == 1) for _, _, is_present in equipment_vars)
+            machine_uses.update(machines)
+            equipment_uses.update(equipment)
+    # No-overlap só para recursos com mais de um intervalo
+    expected = sum(count > 1 for count in machine_uses.values()) + sum(count > 1 for count in equipment_uses.values())
+    assert profiler.counts["no_overlap"] == expected
+
+
+def test_float_timespan():
+    result = solve_instance(dict(SMALL, timespan=10.0), time_limit=5.0)
+    assert result["objective"] == 5
+
+
+def test_trace_records_solves_and_cache_hits(tmp_path):
+    cache = SolveCache(str(tmp_path))
+    trace = IncumbentTrace()
+    objective = solve_fjsp_with_equipment(SMALL, cache=cache, trace=trace)
+    assert trace.rows and trace.rows[-1][2] == objective
+
+    hit = IncumbentTrace()
+    assert solve_fjsp_with_equipment(SMALL, cache=cache, trace=hit) == objective
+    assert len(hit.rows) == 1 and hit.rows[0][1:] == [0, objective, objective]
+
+
+def test_trace_rejects_decompose():
+    with pytest.raises(ValueError, match="decompose"):
+        solve_fjsp_with_equipment(SMALL, decompose=True, trace=IncumbentTrace())
@@ -0,0 +1,61 @@
+import numpy as np
+
+from classes.jssp import jssp
+from decoder import make_fitness_function
+from get_makespan import solve_instance
+from incumbent_trace import IncumbentTrace, TraceCallback, append_traces, load_traces, traced_fitness
+
+
+def test_traced_fitness_records_improvements_in_order(mk01):
+    fitness = make_fitness_function(jssp(mk01))
+    trace = IncumbentTrace()
+    traced = traced_fitness(fitness, trace)
+    rng = np.random.default_rng(0)
+    values = []
+    for solution in rng.random((40, jssp(mk01).num_operations)):
+        result = traced(solution)
+        assert result == fitness(solution)
+        values.append(result[0])
+
+    # Uma linha por melhoria estrita: avaliação em que ocorreu e melhor valor até ali
+    running_best = np.minimum.accumulate(values)
+    improvements = [i for i in range(len(values)) if i == 0 or running_best[i] < running_best[i - 1]]
+    assert [row[1] for row in trace.rows] == [i + 1 for i in improvements]
+    assert [row[2] for row in trace.rows] == [values[i] for i in improvements]
+    assert all(row[3] is None for row in trace.rows)
+    times = [row[0] for row in trace.rows]
+    assert times == sorted(times)
+    assert trace.time_to_target(running_best[-1]) == times[-1]
+    assert trace.time_to_target(running_best[-1] - 1) is None
+
+
+def test_traced_fitness_accepts_scalar_results():
+    trace = IncumbentTrace()
+    traced = traced_fitness(lambda solution: solution, trace)
+    assert [traced(value) for value in (5, 7, 3, 3, 1)] == [5, 7, 3, 3, 1]
+    assert [row[1:3] for row in trace.rows] == [[1, 5], [3, 3], [5, 1]]
+
+
+def test_trace_callback_orders_cp_sat_incumbents(mk01):
+    trace = IncumbentTrace()
+    result = solve_instance(mk01, time_limit=2.0, num_workers=2, solution_callback=TraceCallback(trace))
+    assert trace.rows
+    objectives = [row[2] for row in trace.rows]
+    assert all(a > b for a, b in zip(objectives, objectives[1:]))
+    assert objectives[-1] == result["objective"]
+    assert all(bound <= objective for _, _, objective, bound in trace.rows)
+    times = [row[0] for row in trace.rows]
+    assert times == sorted(times)
+
+
+def test_append_and_load_traces(tmp_path):
+    filename = str(tmp_path / "traces.jsonl")
+    first, second = IncumbentTrace(), IncumbentTrace()
+    first.record(1, 10)
+    first.record(4, 8, 7)
+    append_traces([(11, first)], "Genetic", "TC_001", filename)
+    append_traces([(12, second)], "Genetic", "TC_002", filename)
+    loaded = load_traces(filename)
+    assert [item["id"] for item in loaded] == [11, 12]
+    assert loaded[0]["trace"] == first.rows and loaded[1]["trace"] == []
+    assert loaded[0]["metaheuristic_type"] == "Genetic" and loaded[1]["test_name"] == "TC_002"
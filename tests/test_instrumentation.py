@@ -0,0 +1,60 @@
+import numpy as np
+
+from classes.jssp import jssp
+from decoder import make_fitness_function
+from get_makespan import solve_instance
+from instrumentation import Profiler
+
+
+def test_profiler_counters_merge_and_rows():
+    profiler = Profiler()
+    profiler.add("decode", 0.5)
+    profiler.add("decode", 1.5, count=3)
+    profiler.add_stat("branches", 10)
+    other = Profiler()
+    other.add("decode", 1.0)
+    other.add("solve", 2.0)
+    other.add_stat("branches", 5)
+
+    profiler.merge(other)
+    assert profiler.counts == {"decode": 5, "solve": 1}
+    assert profiler.seconds["decode"] == 3.0
+    assert profiler.summary()["decode"] == {"count": 5, "seconds": 3.0, "mean_us": 600000.0}
+    assert profiler.as_row(test_name="TC_001") == {
+        "test_name": "TC_001", "decode_count": 5, "decode_s": 3.0, "solve_count": 1, "solve_s": 2.0, "branches": 15,
+    }
+    profiler.reset()
+    assert profiler.summary() == {} and profiler.as_row() == {}
+
+
+def test_decoder_phase_counters(mk01):
+    instance = jssp(mk01)
+    profiler = Profiler()
+    fitness = make_fitness_function(instance, profiler=profiler)
+    evaluations = 5
+    for solution in np.random.default_rng(0).random((evaluations, instance.num_operations)):
+        fitness(solution)
+
+    n = instance.num_operations
+    counts = profiler.counts
+    assert counts["priority_repair"] == evaluations
+    for phase in ("sequencing", "machine_selection", "equipment_selection"):
+        assert counts[phase] == evaluations * n
+    # Uma checagem de downtime por máquina elegível com paradas ou calendário, em cada operação
+    blocked = set(instance.machine_downtimes) | set(instance.calendars)
+    per_evaluation = sum(len(set(op["machines"]) & blocked) for op in instance.get_flattened_operations())
+    assert counts["downtime_checks"] == evaluations * per_evaluation
+    assert all(seconds >= 0 for seconds in profiler.seconds.values())
+    assert "early_aborts" not in profiler.stats
+
+
+def test_model_phase_counters(mk01):
+    profiler = Profiler()
+    result = solve_instance(mk01, time_limit=1.0, num_workers=2, profiler=profiler)
+    counts = profiler.counts
+    assert counts["variable_creation"] == sum(len(job_ops) for job_ops in mk01["jobs"].values())
+    assert counts["no_overlap"] >= 1
+    assert counts["solve"] == 1 and counts["cp_sat_presolve"] >= 1
+    assert profiler.stats["cp_sat_branches"] > 0
+    assert 0 < profiler.stats["cp_sat_wall_time"] <= profiler.seconds["solve"] + 0.1
+    assert result["objective"] <= mk01["timespan"]
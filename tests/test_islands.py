@@ -0,0 +1,15 @@
+from mealpy import SA
+
+from classes.jssp import jssp
+from decoder import make_fitness_function
+from islands import BRKGA, MealpyEngine, island_search
+from validator import is_feasible, validate_priority_vector
+
+
+def test_island_search_mk01(mk01):
+    engines = [BRKGA(pop_size=20), BRKGA(pop_size=20), MealpyEngine(SA.OriginalSA, pop_size=10)]
+    result = island_search(mk01, engines, epochs=6, migration_interval=3, seed=0)
+    instance = jssp(mk01)
+    assert result["best_fitness"] == min(result["island_best"])
+    assert result["best_fitness"] == make_fitness_function(instance)(result["best_solution"])[0]
+    assert is_feasible(validate_priority_vector(instance, result["best_solution"]))
@@ -0,0 +1,69 @@
+import numpy as np
+
+from classes.jssp import jssp
+from validator import validate_schedules
+
+
+def random_instance(rng, num_jobs=12, num_machines=20, num_equipment=11):
+    """Instância com recursos esparsos (mais de 8 ids, para cruzar bytes dos bitsets)."""
+    jobs = {}
+    for j in range(num_jobs):
+        jobs[f"job_{j}"] = [
+            (sorted(rng.choice(num_machines, rng.integers(1, 3), replace=False).tolist()),
+             sorted(rng.choice(num_equipment, rng.integers(0, 2), replace=False).tolist()),
+             int(rng.integers(1, 5)))
+            for _ in range(rng.integers(1, 4))
+        ]
+    return {"jobs": jobs, "machine_downtimes": {}, "timespan": 100}
+
+
+def test_masks_match_dense_eligibility():
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        instance = jssp(random_instance(rng))
+        for idx in range(instance.num_operations):
+            for i, m in enumerate(instance.machine_ids.tolist()):
+                assert instance.is_eligible_machine(idx, m) == instance.eligible_machines[idx, i]
+            for i, e in enumerate(instance.equipment_ids.tolist()):
+                assert instance.is_eligible_equipment(idx, e) == instance.eligible_equipment[idx, i]
+            assert not instance.is_eligible_machine(idx, -7)
+
+        machines = instance.eligible_machines.astype(np.int64)
+        equipment = instance.eligible_equipment.astype(np.int64)
+        dense = (machines @ machines.T > 0) | (equipment @ equipment.T > 0)
+        np.fill_diagonal(dense, False)
+        for a in range(instance.num_operations):
+            row = [(instance.conflicts[a] >> b) & 1 == 1 for b in range(instance.num_operations)]
+            assert row == dense[a].tolist()
+            for b in range(instance.num_operations):
+                if a != b:
+                    assert instance.compete(a, b) == dense[a, b]
+
+
+def test_connected_components_match_dense_reference():
+    rng = np.random.default_rng(1)
+    for _ in range(10):
+        instance = jssp(random_instance(rng, num_jobs=8, num_machines=30, num_equipment=20))
+        # Referência: fecho transitivo sobre a matriz densa job x job
+        usage = np.add.reduceat(np.hstack((instance.eligible_machines, instance.eligible_equipment)).astype(np.int64),
+                                instance.job_offsets[:-1])
+        reach = (usage @ usage.T) > 0
+        for _ in range(len(instance.jobs)):
+            reach = (reach.astype(np.int64) @ reach.astype(np.int64)) > 0
+        expected = []
+        for j in range(len(instance.jobs)):
+            members = [instance.jobs[k].name for k in np.flatnonzero(reach[j])]
+            if members not in expected:
+                expected.append(members)
+        assert instance.connected_components() == expected
+
+
+def test_validator_eligibility_uses_the_bitsets():
+    instance = jssp(random_instance(np.random.default_rng(2)))
+    n = instance.num_operations
+    machine = np.array([instance.machine_ids[np.flatnonzero(row)[0]] for row in instance.eligible_machines])
+    start, end = np.zeros(n, dtype=np.int64), instance.durations.copy()
+    assert validate_schedules(instance, start, end, machine)["machine_eligibility"] == 0
+    # Máquina existente mas não elegível para a operação 0
+    machine[0] = next(m for i, m in enumerate(instance.machine_ids) if not instance.eligible_machines[0, i])
+    assert validate_schedules(instance, start, end, machine)["machine_eligibility"] == 1
@@ -0,0 +1,23 @@
+import random
+
+from conftest import assert_feasible
+from lns import choose_neighborhood, lns_solve
+
+
+def test_lns_solve_mk01(mk01):
+    result = lns_solve(mk01, time_budget=4.0, sub_time_limit=1.0, seed=0)
+    assert result is not None
+    assert result["iterations"] > 0
+    assert result["objective"] == max(entry["end"] for entry in result["schedule"])
+    assert result["objective"] <= mk01["timespan"]
+    assert_feasible(mk01, result["schedule"])
+
+
+def test_bottleneck_with_zero_loads():
+    schedule = [
+        {"job": "job_1", "operation": 0, "start": 0, "end": 0, "duration": 0, "machine": 1, "equipment": None},
+        {"job": "job_2", "operation": 0, "start": 0, "end": 0, "duration": 0, "machine": 2, "equipment": None},
+    ]
+    relaxed = choose_neighborhood("bottleneck", schedule, 1, random.Random(0))
+    assert relaxed in ({("job_1", 0)}, {("job_2", 0)})
+    assert choose_neighborhood("bottleneck", [], 1, random.Random(0)) == set()
@@ -0,0 +1,94 @@
+import math
+
+import numpy as np
+import pytest
+
+from classes.machine_calendar import MachineCalendar, build_calendars
+
+
+HORIZON = 400
+
+
+def random_calendar(rng):
+    periodic = []
+    for _ in range(rng.integers(0, 3)):
+        period = int(rng.integers(5, 30))
+        window = {"period": period, "start": int(rng.integers(0, 50)), "length": int(rng.integers(1, period))}
+        if rng.random() < 0.3:
+            window["until"] = int(rng.integers(50, 200))
+        periodic.append(window)
+    ranges = [[a, a + int(rng.integers(1, 15))] for a in rng.integers(0, 300, rng.integers(0, 4)).tolist()]
+    exceptions = [[a, a + int(rng.integers(1, 20))] for a in rng.integers(0, 300, rng.integers(0, 3)).tolist()]
+    points = rng.integers(0, 300, rng.integers(0, 4)).tolist()
+    return {"periodic": periodic, "ranges": ranges, "exceptions": exceptions}, points
+
+
+def brute_force_blocked(data, points):
+    """Indisponibilidade instante a instante, direto da definição."""
+    blocked = np.zeros(HORIZON, dtype=bool)
+    for window in data["periodic"]:
+        until = window.get("until", HORIZON)
+        for start in range(window.get("start", 0), min(until, HORIZON), window["period"]):
+            blocked[start:min(start + window["length"], until)] = True
+    for a, b in data["ranges"]:
+        blocked[a:b] = True
+    for a, b in data["exceptions"]:
+        blocked[a:b] = False
+    blocked[points] = True
+    return blocked
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_calendar_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    data, points = random_calendar(rng)
+    calendar = MachineCalendar.from_dict(data, points)
+    blocked = brute_force_blocked(data, points)
+    limit = HORIZON - 60  # longe do fim da expansão por força bruta
+
+    assert [calendar.is_available(t) for t in range(limit)] == (~blocked[:limit]).tolist()
+
+    expected = []
+    for t in np.flatnonzero(blocked[:limit]).tolist():
+        if expected and expected[-1][1] == t:
+            expected[-1][1] = t + 1
+        else:
+            expected.append([t, t + 1])
+    windows = calendar.windows(limit)
+    assert windows == expected
+    assert calendar.windows(limit, start=100) == [[max(a, 100), b] for a, b in expected if b > 100]
+
+    for earliest in rng.integers(0, limit - 60, 10).tolist():
+        for duration in (1, 3, 7):
+            start = calendar.next_available(earliest, duration)
+            assert start >= earliest
+            if start + duration <= limit:
+                assert not blocked[start:start + duration].any()
+                # Nenhum início anterior comporta a duração
+                assert all(blocked[s:s + duration].any() for s in range(earliest, start))
+
+
+def test_next_available_gives_up_when_no_gap_fits():
+    calendar = MachineCalendar(periodic=[{"period": 10, "length": 9}])
+    assert calendar.next_available(0, 1) == 9
+    assert calendar.next_available(0, 2) == math.inf
+    # Sem janelas a partir de "until", a folga em 49 já comporta a duração
+    ending = MachineCalendar(periodic=[{"period": 10, "length": 9, "until": 50}])
+    assert ending.next_available(0, 2) == 49
+
+
+def test_points_are_not_freed_by_exceptions():
+    calendar = MachineCalendar(ranges=[[10, 20]], exceptions=[[12, 18]], points=[15])
+    assert calendar.windows(30) == [[10, 12], [15, 16], [18, 20]]
+
+
+def test_invalid_periodic_window():
+    with pytest.raises(ValueError):
+        MachineCalendar(periodic=[{"period": 5, "length": 5}])
+
+
+def test_build_calendars_merges_downtime_points():
+    calendars = build_calendars({1: {"ranges": [[0, 2]]}}, {1: [5], 2: [3]})
+    assert list(calendars) == [1]
+    assert calendars[1].windows(10) == [[0, 2], [5, 6]]
+    assert build_calendars(None, {1: [5]}) == {}
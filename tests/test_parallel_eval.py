@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from classes.jssp import jssp
+from decoder import make_fitness_function
+from parallel_eval import SharedPopulationEvaluator
+
+
+def test_evaluate_matches_serial_fitness(mk01):
+    fitness = make_fitness_function(jssp(mk01))
+    population = np.random.default_rng(0).random((12, jssp(mk01).num_operations))
+    with SharedPopulationEvaluator(mk01, capacity=16, workers=2) as evaluator:
+        fitnesses = evaluator.evaluate(population)
+    assert fitnesses.tolist() == [fitness(row)[0] for row in population]
+
+
+def test_dead_worker_raises(mk01):
+    evaluator = SharedPopulationEvaluator(mk01, capacity=4, workers=1, poll_interval=0.1)
+    try:
+        evaluator._processes[0].kill()
+        evaluator._processes[0].join()
+        with pytest.raises(RuntimeError, match="terminou"):
+            evaluator.evaluate(np.zeros((4, evaluator.num_operations)))
+    finally:
+        evaluator.close()
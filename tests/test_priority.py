@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from classes.jssp import jssp
+from priority import repair_priorities
+
+
+def random_instance(rng, num_jobs=8):
+    jobs = {
+        f"job_{j}": [([int(rng.integers(1, 4))], [], int(rng.integers(1, 5))) for _ in range(rng.integers(1, 6))]
+        for j in range(num_jobs)
+    }
+    return jssp({"jobs": jobs, "machine_downtimes": {}, "timespan": 100})
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_repair_orders_jobs_and_keeps_unaffected_keys(seed):
+    rng = np.random.default_rng(seed)
+    instance = random_instance(rng)
+    # Inteiros pequenos forçam empates, floats negativos testam o deslocamento por job
+    keys = rng.integers(-3, 4, instance.num_operations) if seed % 2 else rng.normal(size=instance.num_operations)
+    repaired, order = repair_priorities(keys, instance)
+
+    # Máximo acumulado dentro de cada job
+    for start, end in zip(instance.job_offsets[:-1], instance.job_offsets[1:]):
+        assert np.allclose(repaired[start:end], np.maximum.accumulate(keys[start:end]))
+
+    # Dentro de cada job, a ordem global segue a posição das operações
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    for start, end in zip(instance.job_offsets[:-1], instance.job_offsets[1:]):
+        assert np.all(np.diff(rank[start:end]) > 0)
+
+    # Chaves não alteradas mantêm a ordem relativa original
+    unaffected = np.flatnonzero(np.isclose(repaired, keys))
+    stable = unaffected[np.argsort(keys[unaffected], kind="stable")]
+    assert rank[stable].tolist() == sorted(rank[stable].tolist())
+
+
+def test_repair_population_matches_rows():
+    rng = np.random.default_rng(1)
+    instance = random_instance(rng)
+    population = rng.normal(size=(6, instance.num_operations))
+    repaired, order = repair_priorities(population, instance)
+    for row, keys in enumerate(population):
+        row_repaired, row_order = repair_priorities(keys, instance)
+        assert np.allclose(repaired[row], row_repaired)
+        assert order[row].tolist() == row_order.tolist()
+
+
+def test_repair_rejects_wrong_length():
+    instance = random_instance(np.random.default_rng(2))
+    with pytest.raises(ValueError):
+        repair_priorities(np.zeros(instance.num_operations + 1), instance)
@@ -0,0 +1,35 @@
+from conftest import assert_feasible
+from reschedule import reschedule
+
+
+def test_reschedule_mk01(mk01, mk01_solution):
+    schedule = mk01_solution["schedule"]
+    current_time = mk01_solution["objective"] // 3
+    busy = next(entry for entry in schedule if entry["start"] >= current_time)
+    new_downtimes = {busy["machine"]: [busy["start"]]}
+
+    for improve_time_limit in (None, 2.0):
+        instance, updated = reschedule(mk01, schedule, current_time, new_downtimes, improve_time_limit)
+        assert busy["start"] in instance["machine_downtimes"][busy["machine"]]
+        assert_feasible(instance, updated)
+        # O que já terminou não muda
+        done = {(e["job"], e["operation"]): e for e in schedule if e["end"] <= current_time}
+        assert all(done[(e["job"], e["operation"])] == e for e in updated if (e["job"], e["operation"]) in done)
+
+
+def test_past_downtime_keeps_finished_operations():
+    instance = {"jobs": {"job_1": [([1], [], 4), ([1, 2], [], 3)], "job_2": [([2], [], 2)]},
+                "machine_downtimes": {}, "timespan": 20}
+    schedule = [
+        {"job": "job_1", "operation": 0, "start": 0, "end": 4, "duration": 4, "machine": 1, "equipment": None},
+        {"job": "job_1", "operation": 1, "start": 4, "end": 7, "duration": 3, "machine": 1, "equipment": None},
+        {"job": "job_2", "operation": 0, "start": 0, "end": 2, "duration": 2, "machine": 2, "equipment": None},
+    ]
+    # A paragem em 2 cai dentro da operação já terminada [0, 4) da máquina 1
+    for improve_time_limit in (None, 2.0):
+        updated_instance, updated = reschedule(instance, schedule, 5, {1: [2]}, improve_time_limit)
+        by_key = {(entry["job"], entry["operation"]): entry for entry in updated}
+        assert by_key[("job_1", 0)] == schedule[0]
+        assert by_key[("job_2", 0)] == schedule[2]
+        assert by_key[("job_1", 1)]["start"] >= by_key[("job_1", 0)]["end"]
+        assert by_key[("job_1", 1)]["start"] >= 4
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from results_stats import QuantileSketch, ResultsSummary, RunningStats
+
+
+def lognormal_samples(seed, size):
+    return np.random.default_rng(seed).lognormal(mean=2.0, sigma=1.0, size=size)
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 30, 1000])
+def test_welford_matches_numpy(size):
+    values = lognormal_samples(size, size)
+    stats = RunningStats()
+    for value in values:
+        stats.add(float(value))
+    assert stats.count == size
+    assert stats.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert stats.min == values.min() and stats.max == values.max()
+    if size > 1:
+        assert stats.std == pytest.approx(values.std(ddof=1), rel=1e-9)
+    else:
+        assert np.isnan(stats.std)
+
+
+def test_welford_merge_matches_numpy():
+    values = lognormal_samples(3, 501)
+    parts = [RunningStats() for _ in range(3)]
+    for i, value in enumerate(values):
+        parts[i % 3].add(float(value))
+    merged = RunningStats.from_dict(parts[0].to_dict()).merge(parts[1]).merge(parts[2]).merge(RunningStats())
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert merged.std == pytest.approx(values.std(ddof=1), rel=1e-9)
+
+
+@pytest.mark.parametrize("size", [2, 30, 31, 1000])
+def test_sketch_matches_np_quantile(size):
+    values = lognormal_samples(size + 10, size)
+    sketch = QuantileSketch(alpha=0.01)
+    for value in values:
+        sketch.add(float(value))
+    for q in (0.0, 0.1, 0.25, 0.5, 0.9, 0.95, 1.0):
+        assert sketch.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.01)
+
+
+def test_sketch_interpolates_between_order_statistics():
+    # Mediana de um número par de valores: média dos dois centrais, como np.median
+    sketch = QuantileSketch()
+    for value in (16.0, 17.0, 20.0, 21.0):
+        sketch.add(value)
+    assert sketch.quantile(0.5) == pytest.approx(18.5, rel=0.01)
+
+
+def test_sketch_zeros_merge_and_round_trip():
+    values = np.concatenate([np.zeros(5), lognormal_samples(4, 95)])
+    left, right = QuantileSketch(), QuantileSketch()
+    for i, value in enumerate(values):
+        (left if i % 2 else right).add(float(value))
+    sketch = QuantileSketch.from_dict(left.merge(right).to_dict())
+    assert sketch.count == len(values)
+    assert sketch.quantile(0.02) == 0.0
+    assert sketch.quantile(0.5) == pytest.approx(np.quantile(values, 0.5), rel=0.01)
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_summary_rows_match_numpy(tmp_path):
+    rng = np.random.default_rng(5)
+    rows = [
+        {"test_name": f"TC_{i % 2}", "metaheuristic_type": "ABC", "fitness": str(float(rng.integers(10, 20))),
+         "execution_time": str(rng.uniform(1, 2)), "timespan": "15"}
+        for i in range(40)
+    ]
+    summary = ResultsSummary.load(ResultsSummary().update_rows(rows).save(str(tmp_path / "summary.json")))
+    for row in summary.by_test_and_algorithm():
+        fitness = np.array([float(r["fitness"]) for r in rows if r["test_name"] == row["test_name"]])
+        times = np.array([float(r["execution_time"]) for r in rows if r["test_name"] == row["test_name"]])
+        assert row["execucoes"] == len(fitness)
+        assert row["fitness_medio"] == pytest.approx(fitness.mean())
+        assert row["fitness_desvio"] == pytest.approx(fitness.std(ddof=1))
+        assert row["tempo_mediano"] == pytest.approx(np.median(times), rel=0.01)
+        assert row["taxa_acerto_makespan_pct"] == pytest.approx(100 * np.mean(fitness <= 15))
@@ -0,0 +1,44 @@
+import numpy as np
+
+from classes.jssp import jssp
+from decoder import decode_schedule, make_fitness_function
+from robustness import simulate_robustness
+
+
+def test_simulate_robustness_mk01(mk01, mk01_solution):
+    schedule = mk01_solution["schedule"]
+    nominal = max(entry["end"] for entry in schedule)
+
+    # Sem quebras nem ruído, a simulação só adianta operações
+    calm = simulate_robustness(schedule, mk01["machine_downtimes"], scenarios=20, breakdown_prob=0.0,
+                               duration_noise=0.0)
+    assert calm["nominal"] == nominal
+    assert calm["worst"] <= nominal
+
+    stressed = simulate_robustness(schedule, mk01["machine_downtimes"], scenarios=200, seed=1)
+    assert len(stressed["makespans"]) == 200
+    assert stressed["mean"] <= stressed["p95"] <= stressed["worst"] == np.max(stressed["makespans"])
+
+
+def test_simulate_robustness_decoder_schedules(small_cases, mk01):
+    for instance_json in (small_cases.TC_001, mk01):
+        instance = jssp(instance_json)
+        keys = np.random.default_rng(0).random(instance.num_operations)
+        schedule = decode_schedule(instance, keys)
+        calm = simulate_robustness(schedule, instance_json["machine_downtimes"], scenarios=10,
+                                   breakdown_prob=0.0, duration_noise=0.0)
+        assert calm["nominal"] == make_fitness_function(instance)(keys)[0]
+        assert calm["worst"] <= calm["nominal"]
+
+
+def test_simulate_robustness_pools_and_equipment_lists():
+    # Dois usos simultâneos do pool 7 cabem; o terceiro espera a primeira unidade liberar
+    schedule = [
+        {"job": "a", "operation": 0, "start": 0, "end": 4, "duration": 4, "machine": 1, "equipment": [7, 8]},
+        {"job": "b", "operation": 0, "start": 0, "end": 4, "duration": 4, "machine": 2, "equipment": [7]},
+        {"job": "c", "operation": 0, "start": 4, "end": 6, "duration": 2, "machine": 3, "equipment": 7},
+        {"job": "d", "operation": 0, "start": 4, "end": 5, "duration": 1, "machine": 4, "equipment": [8]},
+    ]
+    result = simulate_robustness(schedule, scenarios=5, breakdown_prob=0.0, duration_noise=0.0,
+                                 equipment_pools={7: 2})
+    assert result["makespans"].tolist() == [6.0] * 5
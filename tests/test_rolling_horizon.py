@@ -0,0 +1,106 @@
+from conftest import assert_feasible
+from get_makespan import build_fjsp_model, solve_instance
+from rolling_horizon import build_window_instance, next_window, rolling_horizon_solve
+
+
+POOLED = {
+    "jobs": {"job_1": [([1], [7], 4)], "job_2": [([2], [7], 4)]},
+    "machine_downtimes": {},
+    "equipment_pools": {7: 2},
+    "timespan": 20,
+}
+
+
+def test_window_keeps_equipment_pools():
+    next_op = {"job_1": 0, "job_2": 0}
+    window = build_window_instance(POOLED, {"job_1": 1, "job_2": 1}, next_op, dict.fromkeys(next_op, 0), {})
+    assert window["equipment_pools"] == {7: 2}
+
+
+def test_rolling_horizon_uses_pool_capacity():
+    result = rolling_horizon_solve(POOLED, window_size=2)
+    assert result["objective"] == 4
+    assert_feasible(POOLED, result["schedule"])
+
+
+def test_rolling_horizon_mk01(mk01):
+    result = rolling_horizon_solve(mk01, window_size=20, step=10, window_time_limit=1.0)
+    assert result is not None
+    assert result["objective"] == max(entry["end"] for entry in result["schedule"])
+    assert len(result["schedule"]) == sum(len(job_ops) for job_ops in mk01["jobs"].values())
+    assert_feasible(mk01, result["schedule"])
+
+
+SHIFTS = {
+    "jobs": {f"job_{j}": [([1, 2], [], 3), ([1], [], 2)] for j in range(1, 7)},
+    "machine_downtimes": {},
+    "machine_calendars": {1: {"periodic": [{"period": 10, "start": 8, "length": 2}]}},
+    "timespan": 1000,
+}
+
+
+def test_window_calendars_start_at_the_window():
+    next_op = {job_id: 1 for job_id in SHIFTS["jobs"]}
+    job_ready = {job_id: 40 + i for i, job_id in enumerate(SHIFTS["jobs"])}
+    window = build_window_instance(SHIFTS, {"job_1": 1, "job_2": 1}, next_op, job_ready, {})
+    assert window["earliest_start"] == 40
+
+    model, _, _ = build_fjsp_model(window, symmetry_breaking=False)
+    calendar_starts = [int(constraint.name.rsplit("_", 1)[1]) for constraint in model.Proto().constraints
+                       if constraint.name.startswith("calendar_")]
+    # The [38, 40) calendar window ends before the time window starts
+    assert calendar_starts and min(calendar_starts) == 48
+
+
+def test_rolling_horizon_with_calendars():
+    result = rolling_horizon_solve(SHIFTS, window_size=4, step=2, window_time_limit=1.0)
+    assert result is not None
+    assert_feasible(SHIFTS, result["schedule"])
+
+
+def test_next_window_is_a_precedence_closed_prefix(mk01):
+    jobs_data = mk01["jobs"]
+    next_op = {job_id: i % 3 for i, job_id in enumerate(jobs_data)}
+    job_ready = {job_id: 5 * i for i, job_id in enumerate(jobs_data)}
+    window = next_window(jobs_data, next_op, job_ready, 15)
+    assert sum(window.values()) == 15
+    for job_id, count in window.items():
+        assert 0 < count <= len(jobs_data[job_id]) - next_op[job_id]
+    # Nenhuma operação fora da janela tem estimativa de início menor que uma de dentro
+    estimates = {}
+    for job_id, job_ops in jobs_data.items():
+        estimate = job_ready[job_id]
+        for op_id in range(next_op[job_id], len(job_ops)):
+            estimates[(job_id, op_id)] = estimate
+            estimate += job_ops[op_id][2]
+    inside = {(job_id, next_op[job_id] + k) for job_id, count in window.items() for k in range(count)}
+    assert max(estimates[key] for key in inside) <= min(estimates[key] for key in estimates.keys() - inside)
+
+
+def test_window_instance_tail_and_horizon(mk01):
+    jobs_data = mk01["jobs"]
+    next_op = dict.fromkeys(jobs_data, 1)
+    job_ready = dict.fromkeys(jobs_data, 10)
+    resource_ready = {("machine", 1): 30}
+    window = {"job_1": 2, "job_2": 1}
+    sub_instance = build_window_instance(mk01, window, next_op, job_ready, resource_ready)
+
+    for job_id, count in window.items():
+        job_ops = sub_instance["jobs"][job_id]
+        assert job_ops[:count] == list(jobs_data[job_id][1:1 + count])
+        # A operação extra sem recursos carrega o trabalho restante do job
+        assert job_ops[count] == ([], [], sum(duration for (_, _, duration) in jobs_data[job_id][1 + count:]))
+    assert all(sub_instance["earliest_start"] <= point < sub_instance["timespan"]
+               for points in sub_instance["machine_downtimes"].values() for point in points)
+    # O horizonte sempre admite uma solução
+    assert solve_instance(sub_instance, time_limit=5.0) is not None
+
+
+def test_rolling_horizon_reoptimizes_unfrozen_operations(mk01):
+    # Janela maior que o passo: parte de cada janela volta para a próxima
+    result = rolling_horizon_solve(mk01, window_size=24, step=6, window_time_limit=0.5, num_workers=2)
+    assert [(entry["job"], entry["operation"]) for entry in result["schedule"]] == [
+        (job_id, op_id) for job_id, job_ops in mk01["jobs"].items() for op_id in range(len(job_ops))
+    ]
+    assert result["bound"] is None and result["status"] == "FEASIBLE"
+    assert_feasible(mk01, result["schedule"])
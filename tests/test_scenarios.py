@@ -0,0 +1,53 @@
+import numpy as np
+
+from classes.jssp import jssp
+from conftest import assert_feasible
+from decoder import make_fitness_function
+from get_makespan import solve_instance
+from scenarios import ScenarioModel, evaluate_scenarios, heuristic_scenario_makespans
+
+
+SHOP = {
+    "jobs": {
+        "job_1": [([1, 2], [7], 3), ([3], [], 2), ([1, 3], [], 2)],
+        "job_2": [([2], [7], 2), ([1, 3], [], 4)],
+        "job_3": [([1, 2, 3], [], 3), ([2], [8], 2), ([3], [8], 1)],
+        "job_4": [([3], [], 2), ([1, 2], [7, 8], 3)],
+    },
+    "machine_downtimes": {},
+    "timespan": 40,
+}
+SHOP_SCENARIOS = {"none": {}, "m1_early": {1: [0, 1, 2]}, "m3_mid": {3: [4, 5]}, "both": {1: [3], 3: [0, 6]}}
+
+
+def test_evaluate_scenarios_mk01(mk01):
+    scenarios = {"none": {}, "planned": mk01["machine_downtimes"], "long_stop": {1: list(range(10, 30))}}
+    results = evaluate_scenarios(mk01, scenarios, shortlist=2, samples=20, time_limit=2.0)
+    assert sorted(row["scenario"] for row in results) == sorted(scenarios)
+    assert [row["heuristic"] for row in results] == sorted(row["heuristic"] for row in results)
+    for row in results[:2]:
+        assert row["objective"] == max(entry["end"] for entry in row["schedule"])
+        assert_feasible(dict(mk01, machine_downtimes=scenarios[row["scenario"]]), row["schedule"])
+    assert "schedule" not in results[2]
+
+
+def test_scenario_model_matches_fresh_solves():
+    scenario_model = ScenarioModel(SHOP)
+    # Os cenários reutilizam o mesmo esqueleto; a ordem de resolução não muda nada
+    for name in list(SHOP_SCENARIOS) + ["none"]:
+        instance = dict(SHOP, machine_downtimes=SHOP_SCENARIOS[name])
+        shared = scenario_model.solve(SHOP_SCENARIOS[name], time_limit=10.0)
+        fresh = solve_instance(instance, time_limit=10.0)
+        assert shared["status"] == fresh["status"] == "OPTIMAL"
+        assert shared["objective"] == fresh["objective"]
+        assert_feasible(instance, shared["schedule"])
+
+
+def test_heuristic_makespans_use_common_samples():
+    instance = jssp(SHOP)
+    results = heuristic_scenario_makespans(instance, SHOP_SCENARIOS, samples=30, seed=4)
+    keys = np.random.default_rng(4).random((30, instance.num_operations))
+    for name, machine_downtimes in SHOP_SCENARIOS.items():
+        # O cutoff pelo incumbente não muda o mínimo
+        fitness = make_fitness_function(instance.with_downtimes(machine_downtimes))
+        assert results[name] == min(fitness(solution)[0] for solution in keys)
@@ -0,0 +1,86 @@
+from classes.jssp import jssp
+from conftest import assert_feasible
+from decoder import make_fitness_function
+from selector import SolverSelector, history_from_results, instance_features, lower_bound, solve_auto
+from validator import is_feasible, validate_priority_vector
+
+
+SMALL = {"jobs": {"job_1": [([1, 2], [7], 3)], "job_2": [([1], [7], 2)]}, "machine_downtimes": {}, "timespan": 10}
+
+
+def test_features_mk01(mk01):
+    features = instance_features(jssp(mk01))
+    assert features["num_operations"] == jssp(mk01).num_operations
+    assert 0 < features["lower_bound_tightness"] <= 1
+    assert lower_bound(jssp(mk01)) <= mk01["timespan"]
+
+
+def test_solve_auto_small_instances_use_cp_sat():
+    result = solve_auto(SMALL)
+    assert result["solver"] == "cp_sat" and result["objective"] == 5
+    assert_feasible(SMALL, result["schedule"])
+
+
+def test_solve_auto_mk01(mk01):
+    selector = SolverSelector(exact_operations=0, lns_min_budget=1000.0)
+    result = solve_auto(mk01, time_budget=2.0, selector=selector)
+    assert result["solver"] == "metaheuristic"
+    instance = jssp(mk01)
+    assert result["objective"] == make_fitness_function(instance)(result["solution"])[0]
+    assert is_feasible(validate_priority_vector(instance, result["solution"]))
+
+
+def synthetic_history():
+    """Two families: small flexible instances where LNS wins, large rigid ones where the metaheuristic wins."""
+    history = []
+    for i in range(4):
+        for family, features, winner in (
+            ("flex", {"num_operations": 100 + i, "flexibility": 0.8, "load_imbalance": 1.1}, "lns"),
+            ("rigid", {"num_operations": 5000 + i, "flexibility": 0.1, "load_imbalance": 2.0}, "metaheuristic"),
+        ):
+            base = dict(features, equipment_density=1.0, downtime_density=0.0, lower_bound_tightness=0.9)
+            for solver in ("lns", "metaheuristic"):
+                objective = 100 if solver == winner else 120
+                history.append(dict(base, instance=f"{family}_{i}", solver=solver, time_budget=10.0,
+                                    objective=objective, runtime=10.0))
+            # O CP-SAT só rodou com orçamento longo, e acha o ótimo
+            history.append(dict(base, instance=f"{family}_{i}", solver="cp_sat", time_budget=100.0,
+                                objective=90, runtime=100.0))
+    return history
+
+
+def test_select_on_multi_solver_history():
+    selector = SolverSelector(synthetic_history(), k=3, exact_operations=10)
+    flex = {"num_operations": 102, "flexibility": 0.75, "equipment_density": 1.0, "downtime_density": 0.0,
+            "load_imbalance": 1.2, "lower_bound_tightness": 0.9}
+    rigid = dict(flex, num_operations=4800, flexibility=0.15, load_imbalance=1.9)
+    assert selector.select(flex, 10.0) == "lns"
+    assert selector.select(rigid, 10.0) == "metaheuristic"
+    # Com orçamento para a execução longa o CP-SAT passa a ser o melhor
+    assert selector.select(flex, 100.0) == "cp_sat"
+    assert selector.select(dict(flex, num_operations=5), None) == "cp_sat"
+
+
+def test_single_solver_history_falls_back():
+    history = [row for row in synthetic_history() if row["solver"] == "metaheuristic"]
+    selector = SolverSelector(history, exact_operations=10, lns_min_budget=20.0)
+    assert not selector.instance_features
+    features = history[0]
+    assert selector.select(features, 10.0) == "metaheuristic"
+    assert selector.select(features, 30.0) == "lns"
+
+
+def test_history_from_results_compares_solvers(tmp_path):
+    filename = tmp_path / "results.csv"
+    filename.write_text(
+        "id,execution_time,fitness,timespan,solution_vector,metaheuristic_type,test_name\n"
+        '1,0.5,6.0,10,"[0.1, 0.2]",Genetic,SMALL\n'
+        '2,1.5,5.0,10,"[0.3, 0.4]",Genetic,SMALL\n'
+        '3,1.0,9.0,10,"[0.5]",Genetic,OTHER\n'
+    )
+    history = history_from_results({"SMALL": SMALL}, str(filename), compare_with=("cp_sat",))
+    assert [row["solver"] for row in history] == ["metaheuristic", "metaheuristic", "cp_sat"]
+    assert history[-1]["time_budget"] == 1.0 and history[-1]["objective"] == 5
+    selector = SolverSelector(history, exact_operations=0)
+    assert list(selector.instance_features) == ["SMALL"]
+    assert SolverSelector(history[:2]).instance_features == {}
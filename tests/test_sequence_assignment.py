@@ -0,0 +1,65 @@
+import numpy as np
+
+from classes.jssp import jssp
+from conftest import assert_feasible
+from gantt import schedule_to_arrays
+from robustness import simulate_robustness
+from sequence_assignment import (assignment_mutation, make_two_vector_decoder, option_counts, pox_crossover,
+                                 random_population, sequence_operations, swap_mutation, uniform_crossover)
+
+
+def test_two_vector_decoder_mk01(mk01):
+    instance = jssp(mk01)
+    decode = make_two_vector_decoder(instance)
+    rng = np.random.default_rng(0)
+    sequences, machine_choices, equipment_choices = random_population(instance, 4, rng)
+    for solution in zip(sequences, machine_choices, equipment_choices):
+        schedule = decode(*solution, schedule=True)
+        assert decode(*solution) == max(entry["end"] for entry in schedule)
+        assert_feasible(mk01, schedule)
+        # Mesmo formato de decode_schedule: lista de equipamentos, aceita pelo Gantt e pela robustez
+        assert all(isinstance(entry["equipment"], list) and len(entry["equipment"]) <= 1 for entry in schedule)
+        schedule_to_arrays(schedule)
+    robustness = simulate_robustness(schedule, mk01["machine_downtimes"], scenarios=2)
+    assert robustness["nominal"] == max(entry["end"] for entry in schedule)
+
+
+def test_operators_keep_sequences_valid(mk01):
+    instance = jssp(mk01)
+    rng = np.random.default_rng(1)
+    sequences, _, _ = random_population(instance, 2, rng)
+    child = swap_mutation(pox_crossover(sequences[0], sequences[1], rng), rng)
+    assert sorted(sequence_operations(child, instance).tolist()) == list(range(instance.num_operations))
+    machine_counts, _ = option_counts(instance)
+    assert len(machine_counts) == instance.num_operations
+
+
+def test_uniform_crossover_takes_each_gene_from_a_parent():
+    rng = np.random.default_rng(2)
+    parent_a = np.zeros(1000, dtype=np.int8)
+    parent_b = np.ones(1000, dtype=np.int8)
+    child = uniform_crossover(parent_a, parent_b, rng)
+    assert child.dtype == np.int8 and child.shape == parent_a.shape
+    # Cerca de metade dos genes de cada pai
+    assert 400 < int(child.sum()) < 600
+    assert np.array_equal(uniform_crossover(parent_a, parent_a, rng), parent_a)
+
+
+def test_assignment_mutation_stays_in_range(mk01):
+    instance = jssp(mk01)
+    rng = np.random.default_rng(3)
+    machine_counts, equipment_counts = option_counts(instance)
+    _, machine_choices, equipment_choices = random_population(instance, 1, rng)
+    for choice, counts in ((machine_choices[0], machine_counts), (equipment_choices[0], equipment_counts)):
+        mutated = assignment_mutation(choice, counts, rng, rate=1.0)
+        assert mutated.dtype == choice.dtype
+        assert np.all((mutated >= 0) & (mutated < np.maximum(counts, 1)))
+        # Operações com uma única opção nunca mudam
+        assert np.array_equal(mutated[counts <= 1], choice[counts <= 1])
+        assert np.array_equal(assignment_mutation(choice, counts, rng, rate=0.0), choice)
+
+    decode = make_two_vector_decoder(instance)
+    assert_feasible(mk01, decode(np.asarray(instance.op_job, dtype=np.int16),
+                                 assignment_mutation(machine_choices[0], machine_counts, rng, rate=1.0),
+                                 assignment_mutation(equipment_choices[0], equipment_counts, rng, rate=1.0),
+                                 schedule=True))
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import time
+
+import service
+from conftest import assert_feasible
+from service import SchedulingService, request_schedule
+
+
+async def _exchange(path, lines):
+    """Send raw request lines over one connection and collect one reply line per request."""
+    reader, writer = await asyncio.open_unix_connection(path)
+    replies = []
+    for line in lines:
+        writer.write(line + b"\n")
+        await writer.drain()
+        replies.append(json.loads(await reader.readline()))
+    writer.close()
+    return replies
+
+
+def test_malformed_requests_get_error_events(tmp_path, mk01):
+    path = str(tmp_path / "service.sock")
+    instance = json.dumps(mk01)
+
+    async def scenario():
+        server = await SchedulingService(default_deadline=2.0).start(path=path)
+        async with server:
+            replies = await _exchange(path, [
+                b"not json",
+                b"[1, 2]",
+                b'{"id": 1}',
+                ('{"id": 2, "instance": %s, "deadline": "soon"}' % instance).encode(),
+            ])
+            events = [event async for event in request_schedule(mk01, request_id=3, path=path)]
+            # A null deadline falls back to the default one
+            null_deadline = ('{"id": 4, "instance": %s, "deadline": null}' % instance).encode()
+            queued = await _exchange(path, [null_deadline])
+        return replies, events, queued
+
+    replies, events, queued = asyncio.run(scenario())
+    assert [reply["event"] for reply in replies] == ["error"] * 4
+    assert "deadline" in replies[-1]["message"]
+
+    assert events[0]["event"] == "queued" and events[-1]["event"] == "result"
+    assert events[-1]["objective"] <= mk01["timespan"]
+    assert_feasible(mk01, events[-1]["schedule"])
+    assert queued[0]["event"] == "queued"
+
+
+def test_deadline_stops_search_with_feasible_result(tmp_path, cases):
+    path = str(tmp_path / "service.sock")
+    instance = cases.TC_MK10_ADAPTADO
+
+    async def scenario():
+        server = await SchedulingService(num_workers=2).start(path=path)
+        async with server:
+            started = time.monotonic()
+            events = [event async for event in request_schedule(instance, deadline=1.5, request_id=1, path=path)]
+            return events, time.monotonic() - started
+
+    events, elapsed = asyncio.run(scenario())
+    result = events[-1]
+    assert result["event"] == "result" and result["stopped"] is True
+    assert result["status"] == "FEASIBLE" and result["bound"] < result["objective"]
+    assert any(event["event"] == "incumbent" for event in events)
+    assert elapsed < 10
+    assert_feasible(instance, result["schedule"])
+
+
+def test_client_disconnect_cancels_request(tmp_path, cases, monkeypatch):
+    path = str(tmp_path / "service.sock")
+    requests = []
+
+    class RecordingRequest(service.SolveRequest):
+        def __init__(self, *args):
+            super().__init__(*args)
+            requests.append(self)
+
+    monkeypatch.setattr(service, "SolveRequest", RecordingRequest)
+
+    async def send(message):
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        await writer.drain()
+        assert json.loads(await reader.readline())["event"] == "queued"
+        return writer
+
+    async def scenario():
+        solver_service = SchedulingService(num_workers=2)
+        server = await solver_service.start(path=path)
+        async with server:
+            running = await send({"id": 1, "instance": cases.TC_MK10_ADAPTADO, "deadline": 60})
+            # The second request waits in the queue, so no event is due when its client leaves
+            queued = await send({"id": 2, "instance": cases.TC_MK10_ADAPTADO, "deadline": 60})
+            queued.close()
+            await asyncio.sleep(0.5)
+            cancelled_while_queued = requests[1].cancelled
+
+            running.close()
+            started = time.monotonic()
+            # The worker only finishes once StopSearch ends the 60 s solve; the cancelled
+            # request is then dropped without solving
+            await asyncio.wait_for(solver_service.queue.join(), timeout=10)
+            return cancelled_while_queued, time.monotonic() - started
+
+    cancelled_while_queued, elapsed = asyncio.run(scenario())
+    assert cancelled_while_queued
+    assert len(requests) == 2 and all(request.cancelled for request in requests)
+    assert requests[1].solver is None
+    assert elapsed < 10
@@ -0,0 +1,55 @@
+import get_makespan
+from solve_cache import SolveCache, instance_key
+
+
+BASE = {"jobs": {"job_1": [([1, 2], [7], 3)]}, "machine_downtimes": {1: [2]}, "timespan": 10}
+
+
+def test_key_ignores_key_types_and_order():
+    same = dict(BASE, machine_downtimes={"1": [2]}, machine_calendars={"1": {"ranges": [[5, 6], [0, 1]]}},
+                equipment_pools={"7": 2})
+    other = dict(BASE, machine_calendars={1: {"ranges": [[0, 1], [5, 6]]}}, equipment_pools={7: 2})
+    assert instance_key(same) == instance_key(other)
+
+
+def test_key_covers_calendars_and_pools():
+    keys = {
+        instance_key(BASE),
+        instance_key(dict(BASE, machine_calendars={1: {"periodic": [{"period": 8, "length": 2}]}})),
+        instance_key(dict(BASE, machine_calendars={1: {"periodic": [{"period": 8, "length": 3}]}})),
+        instance_key(dict(BASE, equipment_pools={7: 2})),
+        instance_key(dict(BASE, equipment_pools={7: 3})),
+    }
+    assert len(keys) == 5
+    # Campos vazios não mudam a chave de instâncias antigas
+    assert instance_key(dict(BASE, machine_calendars={}, equipment_pools={})) == instance_key(BASE)
+
+
+def test_optimal_results_are_keyed_on_the_instance(tmp_path, monkeypatch):
+    cache = SolveCache(str(tmp_path))
+    assert get_makespan.solve_fjsp_with_equipment(BASE, time_limit=5.0, cache=cache) == 3
+    assert cache.get(BASE)["status"] == "OPTIMAL"
+    assert cache.get(BASE, {"time_limit": 5.0, "num_workers": None}) is None
+
+    def fail(*args, **kwargs):
+        raise AssertionError("a proven optimum must not be solved again")
+
+    monkeypatch.setattr(get_makespan, "solve_instance", fail)
+    assert get_makespan.solve_fjsp_with_equipment(BASE, time_limit=60.0, num_workers=2, cache=cache) == 3
+
+
+def test_feasible_results_are_keyed_on_the_parameters(tmp_path):
+    cache = SolveCache(str(tmp_path))
+    entry = {"objective": 5, "bound": 3, "status": "FEASIBLE", "schedule": []}
+    cache.put(BASE, {"time_limit": 1.0}, entry)
+    assert cache.get(BASE, {"time_limit": 1.0}) == entry
+    assert cache.get(BASE, {"time_limit": 2.0}) is None and cache.get(BASE) is None
+
+
+def test_str_keys_are_solved_like_int_keys(tmp_path):
+    # A chave "1" vem de JSON: a indisponibilidade tem de valer no modelo e partilhar a entrada da cache
+    instance = {"jobs": {"job_1": [([1], [], 3)]}, "machine_downtimes": {"1": [1]}, "timespan": 10}
+    cache = SolveCache(str(tmp_path))
+    assert get_makespan.solve_fjsp_with_equipment(instance, time_limit=5.0, cache=cache) == 5
+    assert cache.get(dict(instance, machine_downtimes={1: [1]}))["objective"] == 5
+    assert get_makespan.solve_fjsp_with_equipment(dict(instance, machine_downtimes={1: [1]}), cache=cache) == 5
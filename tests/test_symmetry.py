@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from ortools.sat.python import cp_model
+
+from get_makespan import build_fjsp_model, find_identical_jobs, find_interchangeable_resources
+
+
+def solve_optimum(instance_json, symmetry_breaking):
+    model, _, _ = build_fjsp_model(instance_json, symmetry_breaking=symmetry_breaking)
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = 20.0
+    solver.parameters.num_workers = 4
+    status = solver.Solve(model)
+    assert status == cp_model.OPTIMAL
+    return solver.ObjectiveValue(), len(model.Proto().constraints)
+
+
+def identical_jobs_instance(rng, num_jobs=6):
+    """Jobs repetidos em pares, máquinas 1-3 intercambiáveis e equipamentos 7/8 intercambiáveis."""
+    templates = [
+        [([1, 2, 3], [7, 8], int(rng.integers(1, 5))), ([4], [], int(rng.integers(1, 4))),
+         ([1, 2, 3], [], int(rng.integers(1, 5)))]
+        for _ in range(num_jobs // 2)
+    ]
+    jobs = {f"job_{j}": list(templates[j // 2]) for j in range(num_jobs)}
+    return {"jobs": jobs, "machine_downtimes": {4: [3]}, "timespan": 100}
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_symmetry_breaking_keeps_optimum(seed):
+    instance_json = identical_jobs_instance(np.random.default_rng(seed))
+    assert len(find_identical_jobs(instance_json["jobs"])) == 3
+    machine_groups, equipment_groups = find_interchangeable_resources(instance_json["jobs"], {})
+    assert machine_groups == [[1, 2, 3]] and equipment_groups == [[7, 8]]
+
+    with_breaking, constraints_with = solve_optimum(instance_json, symmetry_breaking=True)
+    without_breaking, constraints_without = solve_optimum(instance_json, symmetry_breaking=False)
+    assert constraints_with > constraints_without
+    assert with_breaking == without_breaking
+
+
+def test_downtimes_make_machines_distinguishable():
+    instance_json = identical_jobs_instance(np.random.default_rng(0))
+    instance_json["machine_downtimes"] = {1: [0, 1, 2], 4: [3]}
+    machine_groups, _ = find_interchangeable_resources(instance_json["jobs"], instance_json["machine_downtimes"])
+    assert machine_groups == [[2, 3]]
+    assert solve_optimum(instance_json, True)[0] == solve_optimum(instance_json, False)[0]
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from classes.jssp import jssp
+from islands import BRKGA
+from selector import lower_bound
+from tuning import _eliminate, engine_cost, friedman
+
+
+def test_friedman_known_answer():
+    # Postos por bloco sem empates: R = [5, 8, 11], A = 56, C = 48, soma R^2 = 210
+    costs = np.array([[1, 2, 3], [1, 3, 2], [1, 2, 3], [2, 1, 3]], dtype=float)
+    statistic, p_value, rank_sums, a = friedman(costs)
+    assert statistic == pytest.approx(4.5)
+    assert rank_sums.tolist() == [5, 8, 11]
+    assert a == 56
+    assert p_value == pytest.approx(np.exp(-4.5 / 2))
+    assert statistic == pytest.approx(stats.friedmanchisquare(*costs.T).statistic)
+
+
+def test_friedman_with_ties_matches_scipy():
+    costs = np.array([[1, 1, 2, 3], [2, 2, 2, 1], [3, 1, 1, 4], [1, 2, 3, 3], [5, 4, 4, 1]], dtype=float)
+    statistic, _, _, _ = friedman(costs)
+    assert statistic > 0
+    assert statistic == pytest.approx(stats.friedmanchisquare(*costs.T).statistic)
+
+
+def test_friedman_all_tied():
+    statistic, p_value, _, _ = friedman(np.ones((5, 3)))
+    assert (statistic, p_value) == (0.0, 1.0)
+
+
+def test_eliminate_known_answer():
+    # R = [8, 11, 17], A = 84, T = 7.0 (p = 0.030); diferença crítica t(0.975, 10) * sqrt(6) = 5.457
+    costs = np.array([[1, 2, 3], [2, 1, 3], [1, 2, 3], [2, 1, 3], [1, 2, 3], [1, 3, 2]], dtype=float)
+    statistic, p_value, _, _ = friedman(costs)
+    assert statistic == pytest.approx(7.0)
+    assert p_value == pytest.approx(np.exp(-3.5))
+    assert _eliminate(costs, 0.05).tolist() == [True, True, False]
+    # Sem significância ninguém sai
+    assert _eliminate(costs, 0.01).tolist() == [True, True, True]
+
+
+def test_eliminate_keeps_only_dominant():
+    costs = np.tile([1.0, 2.0, 3.0], (6, 1))
+    assert _eliminate(costs, 0.05).tolist() == [True, False, False]
+
+
+def test_engine_cost_mk01(mk01):
+    cost = engine_cost(BRKGA, 2, {"pop_size": 10}, mk01, 0)
+    assert cost == engine_cost(BRKGA, 2, {"pop_size": 10}, mk01, 0)
+    assert cost * mk01["timespan"] >= lower_bound(jssp(mk01))
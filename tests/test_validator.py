@@ -0,0 +1,57 @@
+import numpy as np
+
+from classes.jssp import jssp
+from decoder import decode_schedule, make_fitness_function
+from validator import is_feasible, schedule_arrays, validate_priority_vector, validate_schedules
+
+
+POOLED = {
+    "jobs": {
+        "job_1": [([1], [7, 8], 3), ([2], [7], 2)],
+        "job_2": [([2], [7], 4), ([1], [], 1)],
+        "job_3": [([3], [7], 2)],
+    },
+    "machine_downtimes": {1: [5]},
+    "equipment_pools": {7: 2},
+    "timespan": 20,
+}
+
+
+def test_priority_vectors_decode_to_feasible_schedules(mk01):
+    instance = jssp(mk01)
+    fitness = make_fitness_function(instance)
+    rng = np.random.default_rng(0)
+    for keys in rng.random((5, instance.num_operations)):
+        violations = validate_priority_vector(instance, keys)
+        assert is_feasible(violations), violations
+        assert violations["makespan"] == fitness(keys)[0]
+
+
+def test_pool_and_multi_equipment_assignments():
+    instance = jssp(POOLED)
+    keys = np.linspace(0, 1, instance.num_operations)
+    assert is_feasible(validate_priority_vector(instance, keys))
+
+    start, end, machine, equipment = schedule_arrays(decode_schedule(instance, keys), instance)
+    assert equipment.shape == (instance.num_operations, 2)
+    # O pool admite dois usos simultâneos do 7, mas não três
+    start[:], end[:] = 0, instance.durations
+    start[1], end[1] = 10, 12
+    start[3], end[3] = 10, 11
+    machine[:] = [1, 2, 2, 1, 3]
+    violations = validate_schedules(instance, start, end, machine, equipment)
+    assert violations["equipment_overlap"] == 1
+    # Equipamento fora da lista da operação, em qualquer slot
+    equipment[0, 1] = 9
+    assert validate_schedules(instance, start, end, machine, equipment)["equipment_eligibility"] == 1
+
+
+def test_single_equipment_arrays_still_accepted(mk01):
+    instance = jssp(mk01)
+    start, end, machine, equipment = schedule_arrays(decode_schedule(instance, np.zeros(instance.num_operations)),
+                                                     instance)
+    first = np.where(equipment[:, 0] >= 0, equipment[:, 0], -1)
+    single = validate_schedules(instance, start, end, machine, first)
+    batch = validate_schedules(instance, start[None], end[None], machine[None], first[None])
+    assert single == {key: int(value[0]) for key, value in batch.items()}
+    assert is_feasible(single)